@@ -0,0 +1,323 @@
+"""
+Benchmark do processamento do dashboard com uma frota sintética.
+
+Gera planilhas com as abas Dados_Brutos e Carreiras_Vertical no mesmo formato
+da planilha real (turbinas, ciclos, DOWNWIND/UPWIND, status, carreiras) e mede
+tempo e pico de memória de cada etapa do pacote imas_eolicos. Cada
+tamanho roda num processo separado, para que o pico de memória de um não
+contamine o do outro.
+
+Uso:
+    python benchmark.py                                  # 1k, 10k e 100k linhas
+    python benchmark.py --tamanhos 1000 1000000          # tamanhos escolhidos
+    python benchmark.py --streaming                      # leitura em blocos
+    python benchmark.py --comparar benchmark_anterior.json
+"""
+from datetime import datetime
+from contextlib import redirect_stdout
+import argparse
+import io
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+
+# -----------------------------
+# CONFIGURAÇÃO
+# -----------------------------
+PASTA_BENCHMARK = ".benchmark"
+TAMANHOS_PADRAO = [1_000, 10_000, 100_000]
+LIMITE_LINHAS_EXCEL = 1_048_575  # linhas de dados por aba (fora o cabeçalho)
+
+COLUNAS_DADOS_BRUTOS = [
+    'DATA INSPECAO', 'OS', 'CLUSTER', 'TURBINA', 'QTD IMAS TROCADOS', 'DESCRICAO',
+    'CICLO INSPECAO', 'STATUS', 'DATA SUBSTITUICAO', 'K1DIAS PARADA', 'DOWNWIND',
+    'UPWIND', 'OBSERVACOES', 'PRIORIDADE'
+]
+COLUNAS_CARREIRAS = [
+    'Data inspeção', 'OS', 'Cluster', 'AEG', 'Qtd. Imas trocados', 'Carreira',
+    'Descrição', 'Ciclo de Inspeção', 'Status', 'substituição'
+]
+
+# Distribuições aproximadas da planilha real
+CLUSTERS = ['Santo Inacio III', 'Garrote', 'São Raimundo', 'Santo Inacio IV']
+CICLOS = (['Primeiro Ciclo', 'Segundo Ciclo', 'Terceiro Ciclo', 'Quarto Ciclo', 'Troca de Spindle'],
+          [0.31, 0.31, 0.31, 0.035, 0.035])
+DOWNWIND = (['Baixo', 'Médio', 'Alto', '-'], [0.77, 0.13, 0.09, 0.01])
+UPWIND = (['Baixo', 'Médio', 'Alto', '-'], [0.74, 0.09, 0.16, 0.01])
+STATUS = (['Em Operação', 'Fora de Operação'], [0.8, 0.2])
+OBSERVACOES = [
+    "Ímãs em bom estado.",
+    "Oxidação superficial nas carreiras inspecionadas.",
+    "Substituido os Imãs das carreiras indicadas.",
+    "AEG parado, devido a problema de estufamento de imãs.",
+]
+CARREIRAS_POR_GERADOR = 120
+INICIO_INSPECOES = datetime(2024, 4, 1)
+DIAS_INSPECOES = 640
+
+# -----------------------------
+# GERADOR DE FROTA SINTÉTICA
+# -----------------------------
+def turbinas_padrao(linhas):
+    """~3 inspeções por turbina em frotas pequenas, limitado a 5000 turbinas."""
+    return int(min(max(linhas // 3, 10), 5000))
+
+def gerar_frota(caminho, linhas, turbinas=None, semente=42):
+    """Grava uma planilha sintética com `linhas` inspeções em Dados_Brutos."""
+    import openpyxl
+
+    linhas = min(linhas, LIMITE_LINHAS_EXCEL)
+    turbinas = turbinas or turbinas_padrao(linhas)
+    rng = np.random.default_rng(semente)
+
+    turbina = rng.integers(1, turbinas + 1, linhas)
+    cluster = np.asarray(CLUSTERS)[turbina % len(CLUSTERS)]
+    data = np.datetime64(INICIO_INSPECOES) + rng.integers(0, DIAS_INSPECOES, linhas).astype('timedelta64[D]')
+    ciclo = rng.choice(CICLOS[0], linhas, p=CICLOS[1])
+    status = rng.choice(STATUS[0], linhas, p=STATUS[1])
+    downwind = rng.choice(DOWNWIND[0], linhas, p=DOWNWIND[1])
+    upwind = rng.choice(UPWIND[0], linhas, p=UPWIND[1])
+    # ~73% das inspeções sem troca; as demais com cauda longa (até um gerador inteiro)
+    qtd = np.where(rng.random(linhas) < 0.27, np.minimum(rng.geometric(0.03, linhas), 260), 0)
+    dias_parada = np.where(rng.random(linhas) < 0.24, rng.integers(1, 180, linhas), 0)
+    retorno = data + rng.integers(15, 200, linhas).astype('timedelta64[D]')
+    observacao = rng.choice(OBSERVACOES, linhas)
+
+    datas = data.astype('datetime64[s]').tolist()
+    retornos = retorno.astype('datetime64[s]').tolist()
+
+    livro = openpyxl.Workbook(write_only=True)
+
+    aba = livro.create_sheet("Dados_Brutos")
+    aba.append(COLUNAS_DADOS_BRUTOS)
+    for i in range(linhas):
+        parada = status[i] == 'Fora de Operação'
+        aba.append([
+            datas[i], 66000 + i, cluster[i], f"AEG-{turbina[i]:04d}", int(qtd[i]),
+            'Substituido' if qtd[i] else 'Ímãs OK', ciclo[i], status[i],
+            retornos[i] if parada else None, int(dias_parada[i]), downwind[i], upwind[i],
+            observacao[i], 'NORMAL'
+        ])
+
+    # Uma linha por carreira trocada (ímãs de 10 em 10) e uma linha '-' por
+    # inspeção sem troca, como na aba real
+    aba = livro.create_sheet("Carreiras_Vertical")
+    aba.append(COLUNAS_CARREIRAS)
+    escritas = 0
+    for i in range(linhas):
+        if escritas >= LIMITE_LINHAS_EXCEL:
+            break
+        comum = [datas[i], 66000 + i, cluster[i], f"AEG{turbina[i]}"]
+        final = [ciclo[i], status[i], retornos[i] if status[i] == 'Fora de Operação' else None]
+        if qtd[i]:
+            carreiras = rng.choice(CARREIRAS_POR_GERADOR, min(max(qtd[i] // 10, 1), 12), replace=False) + 1
+            for carreira in carreiras[:LIMITE_LINHAS_EXCEL - escritas]:
+                aba.append(comum + [10, int(carreira), 'Substituido'] + final)
+                escritas += 1
+        else:
+            aba.append(comum + [0, '-', 'Ímãs OK'] + final)
+            escritas += 1
+
+    livro.save(caminho)
+    return caminho
+
+def planilha_sintetica(pasta, linhas, turbinas=None, semente=42):
+    """Caminho da planilha do tamanho pedido, gerando-a apenas na primeira vez."""
+    turbinas = turbinas or turbinas_padrao(linhas)
+    caminho = os.path.join(pasta, f"frota_{linhas}_{turbinas}_{semente}.xlsx")
+    if not os.path.exists(caminho):
+        os.makedirs(pasta, exist_ok=True)
+        print(f"🏭 Gerando frota sintética: {linhas} inspeções, {turbinas} turbinas → {caminho}")
+        inicio = time.perf_counter()
+        gerar_frota(caminho + ".tmp.xlsx", linhas, turbinas, semente)
+        os.replace(caminho + ".tmp.xlsx", caminho)
+        print(f"   ✅ Gerada em {time.perf_counter() - inicio:.1f} s")
+    return caminho
+
+# -----------------------------
+# MEDIÇÃO DAS ETAPAS
+# -----------------------------
+def medir(resultados, etapa, funcao, *argumentos):
+    """Roda uma etapa sem o log dela e registra tempo, CPU, pico de memória e linhas."""
+    from imas_eolicos.instrumentacao import medir_etapa
+
+    with redirect_stdout(io.StringIO()):
+        retorno, medicao = medir_etapa(etapa, funcao, *argumentos, memoria=True)
+    resultados.append(medicao)
+    return retorno
+
+def gravar_json(dados, caminho):
+    with open(caminho, "w", encoding="utf-8") as f:
+        json.dump(dados, f, ensure_ascii=False, indent=2)
+
+def executar_benchmark(planilha, streaming=False, tamanho_bloco=None):
+    """Roda o pipeline etapa por etapa sobre `planilha` e devolve as medições."""
+    from imas_eolicos.agregacao import ARQUIVO_ESTADO, agregar, agregar_em_blocos
+    from imas_eolicos.analises import (
+        analisar_carreiras, analisar_clusters, analisar_criticidade, analisar_cubo_temporal, analisar_estado_turbinas, analisar_matriz_carreiras,
+        analisar_mensal, analisar_oxidacao, analisar_temporal, analisar_turbinas, analisar_ultima_inspecao,
+    )
+    from imas_eolicos.exportacao import dashboard_embutido, montar_dashboard_data, salvar_fragmentos
+    from imas_eolicos.instrumentacao import pico_processo_mb
+    from imas_eolicos.paradas import analisar_disponibilidade, analisar_maquinas_paradas
+    from imas_eolicos.planilhas import (
+        TAMANHO_BLOCO_PADRAO, adicionar_colunas_derivadas, preparar_carreiras, preparar_dados_brutos,
+    )
+    from imas_eolicos.previsao import analisar_previsao
+    from imas_eolicos.progressao import analisar_progressao
+
+    etapas = []
+    with tempfile.TemporaryDirectory() as temporario:
+        caminho_estado = os.path.join(temporario, ARQUIVO_ESTADO)
+
+        if streaming:
+            agregacao = medir(etapas, "leitura_em_blocos", agregar_em_blocos,
+                              planilha, tamanho_bloco or TAMANHO_BLOCO_PADRAO)
+            df_paradas = agregacao["linhas_paradas"]
+        else:
+            bruto = medir(etapas, "leitura", pd.read_excel, planilha, "Dados_Brutos")
+            df_clean = medir(etapas, "mapeamento", preparar_dados_brutos, bruto)
+            del bruto
+            df_clean = medir(etapas, "oxidacao", adicionar_colunas_derivadas, df_clean)
+            agregacao = medir(etapas, "agregacao", agregar, df_clean, caminho_estado, False)
+            df_paradas = df_clean
+
+        r = {"agregacao": agregacao}
+        r["oxidacao_df"] = medir(etapas, "oxidacao_ciclos", analisar_oxidacao, agregacao)
+        r["temporal"] = medir(etapas, "temporal", analisar_temporal, agregacao)
+        r["maquinas_paradas_json"] = medir(etapas, "maquinas_paradas", analisar_maquinas_paradas, df_paradas)
+        bruto_carreiras = medir(etapas, "leitura_carreiras", pd.read_excel, planilha, "Carreiras_Vertical")
+        df_carreiras = medir(etapas, "mapeamento_carreiras", preparar_carreiras, bruto_carreiras)
+        r["carreira_metrics"] = medir(etapas, "carreiras", analisar_carreiras, df_carreiras)
+        r["matriz_carreiras"] = medir(etapas, "matriz_carreiras", analisar_matriz_carreiras, df_carreiras)
+        r["ciclos_data"] = medir(etapas, "criticidade", analisar_criticidade, agregacao)
+        r["turbina_metrics"] = medir(etapas, "turbinas", analisar_turbinas, agregacao)
+        r["mensal_data"] = medir(etapas, "mensal", analisar_mensal, agregacao)
+        r["oxidacao_ultima_inspecao"] = medir(etapas, "ultima_inspecao", analisar_ultima_inspecao, agregacao)
+        r["estado_turbinas"] = medir(etapas, "estado_turbinas", analisar_estado_turbinas, agregacao)
+        r["disponibilidade"] = medir(etapas, "disponibilidade", analisar_disponibilidade, df_paradas, agregacao)
+        r["clusters"] = medir(etapas, "clusters", analisar_clusters, agregacao)
+        r["progressao"] = medir(etapas, "progressao", analisar_progressao, agregacao)
+        r["previsao"] = medir(etapas, "previsao", analisar_previsao, agregacao, df_carreiras)
+        r["cubo_temporal"] = medir(etapas, "cubo_temporal", analisar_cubo_temporal, agregacao)
+
+        dashboard_data = medir(etapas, "montagem_json", montar_dashboard_data, r)
+        medir(etapas, "gravacao_json", gravar_json, dashboard_embutido(dashboard_data), os.path.join(temporario, "dashboard_data.json"))
+        medir(etapas, "gravacao_json_paradas", gravar_json, r["maquinas_paradas_json"],
+              os.path.join(temporario, "maquinas_paradas.json"))
+        medir(etapas, "gravacao_fragmentos", salvar_fragmentos, dashboard_data, r["maquinas_paradas_json"], temporario)
+
+    return {
+        "planilha": planilha,
+        "linhas": int(agregacao["agregados"]["Registros"].sum()),
+        "turbinas": len(agregacao["turbina"]),
+        "modo": "streaming" if streaming else "completo",
+        "tempo_total_s": round(sum(etapa["tempo_s"] for etapa in etapas), 4),
+        "pico_processo_mb": pico_processo_mb(),
+        "etapas": etapas,
+    }
+
+# -----------------------------
+# RELATÓRIOS
+# -----------------------------
+def imprimir_resultado(resultado):
+    print(f"/n📏 {resultado['linhas']} linhas | {resultado['turbinas']} turbinas | modo {resultado['modo']}")
+    print(f"   {'etapa':<24}{'tempo (s)':>12}{'cpu (s)':>12}{'pico etapa (MB)':>17}")
+    for etapa in resultado["etapas"]:
+        print(f"   {etapa['etapa']:<24}{etapa['tempo_s']:>12.3f}{etapa['cpu_s']:>12.3f}{etapa['pico_etapa_mb']:>17.1f}")
+    print(f"   {'TOTAL':<24}{resultado['tempo_total_s']:>12.3f}")
+    pico = resultado["pico_processo_mb"]
+    print(f"   Pico de memória do processo: {f'{pico:.1f} MB' if pico is not None else '-'}")
+
+def comparar(atuais, anteriores, tolerancia):
+    """Compara tempos por etapa com uma execução anterior; retorna as regressões."""
+    regressoes = []
+    por_tamanho = {(r["linhas"], r["modo"]): r for r in anteriores}
+    print("/n📊 COMPARAÇÃO COM A EXECUÇÃO ANTERIOR")
+    for atual in atuais:
+        anterior = por_tamanho.get((atual["linhas"], atual["modo"]))
+        if anterior is None:
+            print(f"   ⚠️ {atual['linhas']} linhas ({atual['modo']}): sem referência")
+            continue
+        tempos_anteriores = {etapa["etapa"]: etapa["tempo_s"] for etapa in anterior["etapas"]}
+        for etapa in atual["etapas"]:
+            referencia = tempos_anteriores.get(etapa["etapa"])
+            # Etapas muito curtas oscilam demais para servir de referência
+            if not referencia or referencia < 0.05:
+                continue
+            variacao = etapa["tempo_s"] / referencia - 1
+            if variacao > tolerancia:
+                regressoes.append((atual["linhas"], etapa["etapa"], variacao))
+                print(f"   🟥 {atual['linhas']} linhas / {etapa['etapa']}: "
+                      f"{referencia:.3f}s → {etapa['tempo_s']:.3f}s (+{variacao:.0%})")
+    if not regressoes:
+        print(f"   🟩 Nenhuma etapa mais de {tolerancia:.0%} mais lenta")
+    return regressoes
+
+# -----------------------------
+# EXECUÇÃO
+# -----------------------------
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark do pacote imas_eolicos com frotas sintéticas")
+    parser.add_argument("--tamanhos", type=int, nargs="+", default=TAMANHOS_PADRAO,
+                        help="quantidades de linhas em Dados_Brutos (padrão: 1000 10000 100000)")
+    parser.add_argument("--turbinas", type=int, default=None,
+                        help="turbinas na frota (padrão: ~3 inspeções por turbina, até 5000)")
+    parser.add_argument("--semente", type=int, default=42, help="semente do gerador")
+    parser.add_argument("--pasta", default=PASTA_BENCHMARK, help="pasta das planilhas geradas")
+    parser.add_argument("--streaming", action="store_true", help="mede a leitura em blocos (--streaming)")
+    parser.add_argument("--tamanho-bloco", type=int, default=None, help="linhas por bloco no modo streaming")
+    parser.add_argument("--saida", default="benchmark_resultados.json", help="arquivo com os resultados")
+    parser.add_argument("--comparar", default=None, help="resultados anteriores para detectar regressões")
+    parser.add_argument("--tolerancia", type=float, default=0.25,
+                        help="aumento de tempo aceito por etapa antes de acusar regressão (padrão 0.25)")
+    parser.add_argument("--executar", default=None, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    # Processo filho: mede uma planilha e devolve o resultado em JSON
+    if args.executar:
+        resultado = executar_benchmark(args.executar, args.streaming, args.tamanho_bloco)
+        print(json.dumps(resultado))
+        return
+
+    print("🚀 BENCHMARK DO PROCESSAMENTO DO DASHBOARD")
+    resultados = []
+    for linhas in args.tamanhos:
+        planilha = planilha_sintetica(args.pasta, linhas, args.turbinas, args.semente)
+        comando = [sys.executable, os.path.abspath(__file__), "--executar", planilha]
+        if args.streaming:
+            comando.append("--streaming")
+        if args.tamanho_bloco:
+            comando += ["--tamanho-bloco", str(args.tamanho_bloco)]
+        processo = subprocess.run(comando, capture_output=True, text=True, encoding="utf-8",
+                                  cwd=os.path.dirname(os.path.abspath(__file__)))
+        if processo.returncode != 0:
+            print(f"❌ Falha no benchmark de {linhas} linhas:/n{processo.stderr}")
+            continue
+        resultado = json.loads(processo.stdout.strip().splitlines()[-1])
+        imprimir_resultado(resultado)
+        resultados.append(resultado)
+
+    relatorio = {
+        "data": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+        "python": sys.version.split()[0],
+        "pandas": pd.__version__,
+        "resultados": resultados,
+    }
+    gravar_json(relatorio, args.saida)
+    print(f"/n💾 Resultados salvos em: {args.saida}")
+
+    if args.comparar:
+        with open(args.comparar, encoding="utf-8") as f:
+            anteriores = json.load(f)["resultados"]
+        if comparar(resultados, anteriores, args.tolerancia):
+            sys.exit(1)
+
+if __name__ == "__main__":
+    main()
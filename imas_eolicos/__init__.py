@@ -0,0 +1,44 @@
+"""
+Processamento das inspeções de ímãs dos aerogeradores.
+
+Uso como biblioteca:
+
+    import imas_eolicos
+
+    df_clean, df_carreiras = imas_eolicos.carregar_planilha("planilha.xlsx")
+    dashboard_data, maquinas_paradas = imas_eolicos.montar_dashboard("planilha.xlsx")
+    imas_eolicos.exportar(dashboard_data, maquinas_paradas, "src/assets")
+
+Linha de comando: `python -m imas_eolicos --help`.
+"""
+
+from .exportacao import expandir_colunar, montar_dashboard_data, salvar_fragmentos, salvar_json
+from .lote import processar_lote
+from .observacao import observar
+from .oxidacao import classificar_oxidacao_vetorizada, nivel_criticidade, nivel_oxidacao
+from .planilhas import PlanilhaInvalida, carregar_carreiras, carregar_df_clean, carregar_planilha
+from .processamento import ETAPAS, ETAPAS_BLOCOS, executar_etapas, exportar, montar_dashboard, processar_planilha
+from .servidor import servir
+
+__all__ = [
+    "carregar_planilha",
+    "carregar_df_clean",
+    "carregar_carreiras",
+    "classificar_oxidacao_vetorizada",
+    "nivel_oxidacao",
+    "nivel_criticidade",
+    "montar_dashboard",
+    "montar_dashboard_data",
+    "exportar",
+    "processar_planilha",
+    "observar",
+    "processar_lote",
+    "servir",
+    "PlanilhaInvalida",
+    "salvar_json",
+    "salvar_fragmentos",
+    "expandir_colunar",
+    "executar_etapas",
+    "ETAPAS",
+    "ETAPAS_BLOCOS",
+]
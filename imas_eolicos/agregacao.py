@@ -0,0 +1,580 @@
+"""Cubo de agregados, índice de últimas inspeções e reprocessamento incremental."""
+
+import os
+import pickle
+
+import numpy as np
+import pandas as pd
+
+from .confiabilidade import datas_inspecao
+from .oxidacao import NIVEIS_CRITICIDADE, NIVEIS_OXIDACAO
+from .planilhas import (
+    VERSAO_CACHE,
+    PlanilhaInvalida,
+    adicionar_colunas_derivadas,
+    ler_aba_em_blocos,
+    mapear_dados_brutos,
+    pasta_cache_padrao,
+    preparar_dados_brutos,
+)
+
+# -----------------------------
+# Agregação única por ciclo × mês × cluster × turbina
+# -----------------------------
+# O cluster quase sempre acompanha a turbina, então ele entra na chave sem
+# multiplicar os grupos e as visões por cluster saem do mesmo cubo
+CHAVES_AGREGACAO = ['Ciclo_inspecao', 'Mes_Ano', 'Cluster', 'Turbina']
+PADRAO_STATUS_PARADA = 'fora|parada|stop'
+# Critérios do relatório de máquinas paradas (qualquer um deles marca a linha)
+CRITERIOS_MAQUINA_PARADA = ['Fora de Operação', 'down|offline|inativa']
+
+def mascara_maquinas_paradas(status):
+    """Linhas cujo status indica máquina parada para o relatório de paradas."""
+    mascara = pd.Series(False, index=status.index)
+    for criterio in CRITERIOS_MAQUINA_PARADA:
+        mascara |= status.str.contains(criterio, case=False, na=False)
+    return mascara
+
+def construir_agregados(df):
+    """
+    Agrupa o DataFrame limpo uma única vez por ciclo × mês × cluster × turbina.
+
+    Todas as colunas do resultado são aditivas (somas) ou mín./máx. de datas,
+    então as tabelas por ciclo, ciclo × mês, mês, cluster e turbina saem de
+    reagrupamentos desse resultado, sem voltar às linhas originais.
+    """
+    base = pd.DataFrame({
+        'Registros': np.ones(len(df), dtype=np.int64),
+        'Inspecoes': df['Data_inspecao'].notna().astype(np.int64),
+        'Imas_Trocados': df['Qtd_Imas_trocados'].astype(np.float64),
+        'Dias_Parada': df['Dias_parada'].astype(np.float64) if 'Dias_parada' in df.columns else 0.0,
+        'Paradas_Status': (
+            df['Status'].str.contains(PADRAO_STATUS_PARADA, case=False, na=False).astype(np.int64)
+            if 'Status' in df.columns else 0
+        ),
+        'Data_Min': df['Data_inspecao'],
+        'Data_Max': df['Data_inspecao'],
+    }, index=df.index)
+
+    if 'Oxidacao_Nivel' in df.columns:
+        for nivel in NIVEIS_OXIDACAO:
+            base[f'Oxidacao_{nivel}'] = (df['Oxidacao_Nivel'] == nivel).astype(np.int64)
+        for nivel in NIVEIS_CRITICIDADE:
+            base[f'Criticidade_{nivel}'] = (df['Criticidade'] == nivel).astype(np.int64)
+
+    for chave in CHAVES_AGREGACAO:
+        base[chave] = df[chave] if chave in df.columns else np.nan
+
+    operacoes = {col: 'sum' for col in base.columns if col not in CHAVES_AGREGACAO}
+    operacoes['Data_Min'] = 'min'
+    operacoes['Data_Max'] = 'max'
+
+    agregados = base.groupby(CHAVES_AGREGACAO, dropna=False, observed=True, sort=True).agg(operacoes)
+    
+    # Chaves categóricas agrupam pelos códigos, mas o cubo guarda os valores
+    # para poder ser combinado com cubos de outros blocos/execuções
+    agregados.index = pd.MultiIndex.from_arrays(
+        [nivel.astype(nivel.categories.dtype) if isinstance(nivel, pd.CategoricalIndex) else nivel
+         for nivel in (agregados.index.get_level_values(i) for i in range(agregados.index.nlevels))],
+        names=agregados.index.names
+    )
+    return agregados
+
+def somar_agregados(agregados, niveis):
+    """Reagrupa os agregados pelos níveis informados (NaN/NaT descartados)."""
+    return agregados.groupby(level=niveis, observed=True).agg(
+        {col: ('min' if col == 'Data_Min' else 'max' if col == 'Data_Max' else 'sum')
+         for col in agregados.columns}
+    )
+
+def contar_turbinas(agregados, niveis, coluna=None):
+    """Conta turbinas distintas por nível (opcionalmente só onde `coluna` > 0)."""
+    selecao = agregados if coluna is None else agregados[agregados[coluna] > 0]
+    turbinas = selecao.index.to_frame(index=False)
+    return turbinas.dropna(subset=['Turbina']).groupby(niveis, observed=True)['Turbina'].nunique()
+
+def filtrar_ciclos(tabela, ciclos):
+    """Mantém apenas os ciclos informados, na ordem da lista."""
+    codigos = pd.Index(ciclos).get_indexer(tabela.index.get_level_values('Ciclo_inspecao'))
+    ordem = np.argsort(codigos, kind='stable')
+    return tabela.iloc[ordem[codigos[ordem] >= 0]]
+
+def percentual(parte, total):
+    """Percentual arredondado em 2 casas, 0 quando o total é zero."""
+    return (parte / total.where(total > 0) * 100).round(2).fillna(0)
+
+# -----------------------------
+# Índice da última inspeção por turbina
+# -----------------------------
+# Uma linha por turbina com a posição (índice do df_clean), a data e o nível
+# de oxidação da última inspeção e da anterior. Construído com dois
+# groupby().idxmax() (O(n), sem ordenar a aba) e combinável: a última e a
+# anterior de um conjunto de linhas estão sempre entre as duas últimas de
+# cada parte, então blocos e turbinas alteradas são atualizados juntando
+# índices, sem voltar às linhas já processadas.
+COLUNAS_INDICE_ULTIMAS = ['Turbina', 'Linha', 'Data_inspecao', 'Oxidacao_Nivel',
+                          'Linha_Anterior', 'Data_Anterior', 'Oxidacao_Anterior']
+
+# Gravidade crescente dos níveis comparáveis ('invalido' fica de fora). A troca
+# de spindle não é um nível: é um evento que recomeça o histórico da turbina.
+GRAVIDADE_OXIDACAO = {'sem_oxidacao': 0, 'baixa': 1, 'media': 2, 'alta': 3}
+NIVEL_TROCA_SPINDLE = 'troca_spindle'
+
+def _duas_ultimas(inspecoes):
+    """
+    Recebe (Turbina, Linha, Data_inspecao, Oxidacao_Nivel) e devolve o índice
+    com a última e a penúltima inspeção de cada turbina. Empates de data ficam
+    com a linha que vem primeiro na planilha; datas vazias perdem para qualquer data.
+    """
+    if not inspecoes['Linha'].is_monotonic_increasing:
+        inspecoes = inspecoes.sort_values('Linha', kind='mergesort')
+    inspecoes = inspecoes.reset_index(drop=True)
+    # NaT vira o menor inteiro possível, então também entra no idxmax
+    chave = pd.Series(inspecoes['Data_inspecao'].to_numpy(dtype='datetime64[ns]').view(np.int64))
+    turbinas = inspecoes['Turbina']
+    
+    def maiores(posicoes):
+        return chave.iloc[posicoes].groupby(turbinas.iloc[posicoes].to_numpy(), dropna=False, sort=False).idxmax().to_numpy()
+    
+    ultimas = maiores(np.arange(len(inspecoes)))
+    restantes = np.setdiff1d(np.arange(len(inspecoes)), ultimas, assume_unique=True)
+    anteriores = maiores(restantes) if len(restantes) else np.array([], dtype=np.int64)
+    
+    indice = inspecoes.iloc[ultimas].set_index('Turbina')
+    anterior = inspecoes.iloc[anteriores].set_index('Turbina')[['Linha', 'Data_inspecao', 'Oxidacao_Nivel']]
+    anterior.columns = ['Linha_Anterior', 'Data_Anterior', 'Oxidacao_Anterior']
+    return indice.join(anterior).reset_index()[COLUNAS_INDICE_ULTIMAS]
+
+def indice_ultimas_inspecoes(df):
+    """Índice da última (e da anterior) inspeção de cada turbina do DataFrame."""
+    return _duas_ultimas(pd.DataFrame({
+        'Turbina': df['Turbina'].reset_index(drop=True),
+        'Linha': df.index.to_numpy(),
+        'Data_inspecao': df['Data_inspecao'].reset_index(drop=True),
+        'Oxidacao_Nivel': df['Oxidacao_Nivel'].reset_index(drop=True) if 'Oxidacao_Nivel' in df.columns else None,
+    }))
+
+def combinar_indices_ultimas(indices):
+    """Junta índices de partes diferentes (ex.: blocos) no índice do conjunto."""
+    partes = []
+    for indice in indices:
+        if indice is None or not len(indice):
+            continue
+        partes.append(indice[['Turbina', 'Linha', 'Data_inspecao', 'Oxidacao_Nivel']])
+        anteriores = indice[indice['Linha_Anterior'].notna()]
+        partes.append(pd.DataFrame({
+            'Turbina': anteriores['Turbina'].to_numpy(),
+            'Linha': anteriores['Linha_Anterior'].to_numpy(dtype=np.int64),
+            'Data_inspecao': anteriores['Data_Anterior'].to_numpy(),
+            'Oxidacao_Nivel': anteriores['Oxidacao_Anterior'].reset_index(drop=True),
+        }))
+    return _duas_ultimas(pd.concat(partes, ignore_index=True))
+
+def estado_turbinas(indice):
+    """
+    Último estado de cada turbina e a mudança desde a inspeção anterior:
+    'piorou', 'melhorou', 'estavel', 'primeira_inspecao', 'troca_spindle'
+    (a última ou a anterior é uma troca de spindle, que não se compara com
+    nível nenhum) ou 'indefinido' (algum dos níveis é inválido ou não há classificação).
+    """
+    atual = indice['Oxidacao_Nivel'].astype(object).map(GRAVIDADE_OXIDACAO)
+    anterior = indice['Oxidacao_Anterior'].astype(object).map(GRAVIDADE_OXIDACAO)
+    troca = indice['Oxidacao_Nivel'].astype(object).eq(NIVEL_TROCA_SPINDLE) | indice['Oxidacao_Anterior'].astype(object).eq(NIVEL_TROCA_SPINDLE)
+    mudanca = np.select(
+        [indice['Linha_Anterior'].isna(), troca, atual.isna() | anterior.isna(), atual > anterior, atual < anterior],
+        ['primeira_inspecao', 'troca_spindle', 'indefinido', 'piorou', 'melhorou'],
+        default='estavel'
+    )
+    estado = indice[['Turbina', 'Data_inspecao', 'Oxidacao_Nivel', 'Data_Anterior', 'Oxidacao_Anterior']].copy()
+    estado['Mudanca'] = mudanca
+    return estado.dropna(subset=['Turbina']).sort_values('Turbina', kind='mergesort').reset_index(drop=True)
+
+# -----------------------------
+# Histórico de oxidação por turbina
+# -----------------------------
+# Só as colunas que a progressão entre ciclos e a previsão de inspeções
+# precisam, uma linha por inspeção com turbina e data. Pequeno o bastante para
+# ser guardado também no modo em blocos, onde a aba inteira nunca fica em memória.
+COLUNAS_HISTORICO = ['Turbina', 'Linha', 'Data_inspecao', 'Ciclo_inspecao', 'Oxidacao_Nivel', 'Qtd_Imas_trocados']
+
+def historico_oxidacao(df):
+    """Inspeções com turbina e data, só com as colunas de COLUNAS_HISTORICO."""
+    historico = df.reindex(columns=COLUNAS_HISTORICO)
+    historico['Linha'] = df.index.to_numpy()
+    return historico.dropna(subset=['Turbina', 'Data_inspecao']).reset_index(drop=True)
+
+# -----------------------------
+# Reprocessamento incremental
+# -----------------------------
+# O estado guarda, para cada linha da aba, um hash do conteúdo (impressão
+# digital), o hash do grupo do cubo, o hash da turbina e a posição da linha. Na
+# execução seguinte, só os grupos e turbinas que têm linhas novas, removidas
+# ou alteradas são recalculados; o restante do cubo é reaproveitado. As
+# posições guardadas nas últimas inspeções são renumeradas pela aba atual,
+# já que linhas inseridas ou removidas acima deslocam as que não mudaram.
+ARQUIVO_ESTADO = "estado_incremental.pkl"
+VERSAO_ESTADO = 4  # incrementar sempre que o formato do estado mudar
+COLUNAS_DERIVADAS = ['Ano', 'Mes', 'Mes_Ano', 'Oxidacao_Nivel', 'Criticidade']
+
+def hash_linhas(df):
+    """Hash por linha (mesmos valores → mesmo hash, independente do índice)."""
+    return pd.util.hash_pandas_object(df, index=False).to_numpy()
+
+def impressoes_linhas(df):
+    """Hashes de conteúdo, de grupo do cubo e de turbina de cada linha, com a posição dela."""
+    colunas_base = [col for col in df.columns if col not in COLUNAS_DERIVADAS]
+    return pd.DataFrame({
+        'Impressao': hash_linhas(df[colunas_base]),
+        'Grupo': hash_linhas(df.reindex(columns=CHAVES_AGREGACAO)),
+        'Turbina': hash_linhas(df['Turbina']),
+        'Linha': df.index.to_numpy(),
+    })
+
+def posicoes_atuais(antigas, atuais):
+    """
+    Mapa posição antiga → posição atual das linhas sem alteração: a k-ésima
+    ocorrência de cada impressão na execução anterior é a k-ésima na atual.
+    None quando a ordem relativa dessas linhas mudou (o desempate das últimas
+    inspeções pela ordem da planilha deixa de valer).
+    """
+    antigas = antigas.sort_values(['Impressao', 'Linha'], kind='mergesort')
+    atuais = atuais.sort_values(['Impressao', 'Linha'], kind='mergesort')
+    mapa = pd.Series(atuais['Linha'].to_numpy(), index=antigas['Linha'].to_numpy()).sort_index()
+    return mapa if mapa.is_monotonic_increasing else None
+
+def _substituir(antigo, remover, novo):
+    """Remove as linhas marcadas de `antigo` e acrescenta `novo`."""
+    partes = [parte for parte in (antigo[~remover], novo) if len(parte)]
+    return pd.concat(partes) if partes else novo
+
+def atualizar_agregados(df, estado=None):
+    """
+    Retorna (agregados, ultimas_inspecoes, novo_estado).
+
+    Sem estado anterior compatível, tudo é calculado do zero. Com estado, o
+    cubo e as últimas inspeções são recalculados apenas para os grupos e
+    turbinas afetados; o resultado é idêntico ao de uma reconstrução completa.
+    """
+    impressoes = impressoes_linhas(df)
+    assinatura = (VERSAO_CACHE, VERSAO_ESTADO, tuple(df.columns))
+
+    if estado is None or estado.get('assinatura') != assinatura:
+        agregados = construir_agregados(df)
+        ultimas = indice_ultimas_inspecoes(df)
+        print("🔁 Agregados recalculados do zero")
+    else:
+        antigas = estado['impressoes']
+        diferenca = impressoes['Impressao'].value_counts().sub(antigas['Impressao'].value_counts(), fill_value=0)
+        alteradas = diferenca.index[diferenca != 0]
+
+        linhas_novas = impressoes['Impressao'].isin(alteradas).to_numpy()
+        linhas_antigas = antigas['Impressao'].isin(alteradas).to_numpy()
+        grupos = np.union1d(impressoes['Grupo'][linhas_novas], antigas['Grupo'][linhas_antigas])
+        turbinas = np.union1d(impressoes['Turbina'][linhas_novas], antigas['Turbina'][linhas_antigas])
+
+        agregados = estado['agregados']
+        if len(grupos):
+            remover = np.isin(hash_linhas(agregados.index.to_frame(index=False)), grupos)
+            recalculados = construir_agregados(df[np.isin(impressoes['Grupo'], grupos)])
+            agregados = _substituir(agregados, remover, recalculados).sort_index()
+
+        mapa = posicoes_atuais(antigas[~linhas_antigas], impressoes[~linhas_novas])
+        if mapa is None:
+            ultimas = indice_ultimas_inspecoes(df)
+            print("🔁 Linhas reordenadas: últimas inspeções recalculadas do zero")
+        else:
+            ultimas = estado['ultimas']
+            ultimas = ultimas[~np.isin(hash_linhas(ultimas['Turbina']), turbinas)]
+            ultimas = ultimas.assign(Linha=ultimas['Linha'].map(mapa),
+                                     Linha_Anterior=ultimas['Linha_Anterior'].map(mapa))
+            if len(turbinas):
+                recalculadas = indice_ultimas_inspecoes(df[np.isin(impressoes['Turbina'], turbinas)])
+                partes = [parte for parte in (ultimas, recalculadas) if len(parte)]
+                ultimas = pd.concat(partes) if partes else recalculadas
+
+        print(f"🔁 Incremental: {int(linhas_novas.sum())} linhas novas/alteradas, "
+              f"{int(linhas_antigas.sum())} removidas/substituídas, {len(grupos)} grupos e {len(turbinas)} turbinas recalculados")
+
+    novo_estado = {
+        'assinatura': assinatura,
+        'impressoes': impressoes,
+        'agregados': agregados,
+        'ultimas': ultimas,
+    }
+    return agregados, ultimas, novo_estado
+
+# Último estado gravado em cada caminho, para processos de longa duração (modo
+# observação) não relerem o pickle a cada atualização
+_ESTADOS_EM_MEMORIA = {}
+
+def carregar_estado(caminho):
+    """Lê o estado salvo da execução anterior (None se ausente ou ilegível)."""
+    if caminho in _ESTADOS_EM_MEMORIA:
+        return _ESTADOS_EM_MEMORIA[caminho]
+    if not os.path.exists(caminho):
+        return None
+    try:
+        with open(caminho, "rb") as f:
+            return pickle.load(f)
+    except Exception as e:
+        print(f"⚠️ Estado incremental ilegível, recalculando tudo: {e}")
+        return None
+
+def salvar_estado(caminho, estado):
+    """Grava o estado para a próxima execução incremental."""
+    _ESTADOS_EM_MEMORIA[caminho] = estado
+    try:
+        os.makedirs(os.path.dirname(caminho), exist_ok=True)
+        with open(caminho, "wb") as f:
+            pickle.dump(estado, f, protocol=pickle.HIGHEST_PROTOCOL)
+    except Exception as e:
+        print(f"⚠️ Não foi possível salvar o estado incremental: {e}")
+
+# -----------------------------
+# Cubo temporal (somas prefixadas por dia)
+# -----------------------------
+# Para totais de qualquer período (semana, trimestre, intervalo livre) sem
+# reagrupar as linhas: as inspeções são somadas por dia × ciclo × nível de
+# oxidação × cluster e, para cada célula, acumuladas ao longo dos dias com
+# inspeção. O total de um período é então a diferença entre dois acumulados,
+# uma subtração por célula qualquer que seja o tamanho do período.
+DIMENSOES_CUBO_TEMPORAL = {"ciclo": "Ciclo_inspecao", "oxidacao": "Oxidacao_Nivel", "cluster": "Cluster"}
+METRICAS_CUBO_TEMPORAL = ["Registros", "Imas_Trocados"]
+VALOR_NAO_INFORMADO = "Não Informado"
+
+def somas_diarias(df):
+    """Registros e ímãs trocados por dia × ciclo × oxidação × cluster (base do cubo temporal)."""
+    colunas = list(DIMENSOES_CUBO_TEMPORAL.values())
+    tabela = pd.DataFrame({
+        "Data": df["Data_inspecao"].dt.normalize(),
+        **{coluna: df[coluna] if coluna in df.columns else VALOR_NAO_INFORMADO for coluna in colunas},
+        "Registros": 1,
+        "Imas_Trocados": df["Qtd_Imas_trocados"],
+    }, index=df.index)
+    diario = (
+        tabela.dropna(subset=["Data"])
+        .groupby(["Data", *colunas], observed=True, dropna=False)[METRICAS_CUBO_TEMPORAL].sum()
+        .reset_index()
+    )
+    for coluna in colunas:
+        diario[coluna] = diario[coluna].astype(object).fillna(VALOR_NAO_INFORMADO)
+    return diario
+
+def combinar_somas_diarias(partes):
+    """Soma as somas diárias de vários blocos (ou parques)."""
+    partes = [parte for parte in partes if len(parte)]
+    if len(partes) == 1:
+        return partes[0]
+    colunas = ["Data", *DIMENSOES_CUBO_TEMPORAL.values()]
+    if not partes:
+        return pd.DataFrame(columns=[*colunas, *METRICAS_CUBO_TEMPORAL])
+    return pd.concat(partes).groupby(colunas)[METRICAS_CUBO_TEMPORAL].sum().reset_index()
+
+def construir_cubo_temporal(diario):
+    """
+    Cubo em memória: para cada célula (índices de ciclo, oxidação e cluster em
+    `dimensoes`) e métrica, o acumulado até cada dia com inspeção (coluna 0 = 0).
+    `posicao_dia[d]` é quantos dias com inspeção existem até o dia d (contado a
+    partir de `inicio`), então o total de [a, b] é
+    acumulado[posicao_dia[b]] - acumulado[posicao_dia[a - 1]].
+    """
+    dimensoes = {}
+    codigos = []
+    for nome, coluna in DIMENSOES_CUBO_TEMPORAL.items():
+        codigo, valores = pd.factorize(diario[coluna], sort=True)
+        dimensoes[nome] = [str(valor) for valor in valores]
+        codigos.append(codigo)
+
+    if diario.empty:
+        return {
+            "inicio": None,
+            "eventos": np.array([], dtype=np.int64),
+            "posicao_dia": np.array([], dtype=np.int64),
+            "dimensoes": dimensoes,
+            "celulas": np.empty((0, len(dimensoes)), dtype=np.int64),
+            "acumulados": {metrica: np.zeros((0, 1)) for metrica in METRICAS_CUBO_TEMPORAL},
+        }
+
+    datas = diario["Data"].to_numpy(dtype="datetime64[D]")
+    inicio = datas.min()
+    eventos, evento = np.unique((datas - inicio).astype(np.int64), return_inverse=True)
+    posicao_dia = np.searchsorted(eventos, np.arange(eventos[-1] + 1), side="right")
+
+    tamanhos = [len(valores) for valores in dimensoes.values()]
+    celulas_unicas, celula = np.unique(np.ravel_multi_index(codigos, tamanhos), return_inverse=True)
+
+    acumulados = {}
+    for metrica in METRICAS_CUBO_TEMPORAL:
+        valores = diario[metrica].to_numpy()
+        tipo = np.int64 if np.issubdtype(valores.dtype, np.integer) else np.float64
+        matriz = np.zeros((len(celulas_unicas), len(eventos) + 1), dtype=tipo)
+        np.add.at(matriz, (celula, evento + 1), valores)
+        acumulados[metrica] = matriz.cumsum(axis=1)
+
+    return {
+        "inicio": pd.Timestamp(inicio),
+        "eventos": eventos,
+        "posicao_dia": posicao_dia,
+        "dimensoes": dimensoes,
+        "celulas": np.stack(np.unravel_index(celulas_unicas, tamanhos), axis=1),
+        "acumulados": acumulados,
+    }
+
+def somar_periodo(cubo, inicio=None, fim=None, agrupar=None, **filtros):
+    """
+    Totais de cada métrica entre `inicio` e `fim` (datas inclusivas; None = sem
+    limite), só nas células cujos valores estão em `filtros` (ex.:
+    cluster=["Garrote"]). Com `agrupar` (nome de dimensão), devolve
+    {valor: {métrica: total}}.
+    """
+    celulas = cubo["celulas"]
+    selecao = np.ones(len(celulas), dtype=bool)
+    for nome, valores in filtros.items():
+        if valores is None:
+            continue
+        valores = {str(valor) for valor in valores}
+        posicoes = [i for i, valor in enumerate(cubo["dimensoes"][nome]) if valor in valores]
+        selecao &= np.isin(celulas[:, list(cubo["dimensoes"]).index(nome)], posicoes)
+
+    total_dias = len(cubo["posicao_dia"])
+    primeiro = 0 if inicio is None or cubo["inicio"] is None else (pd.Timestamp(inicio).normalize() - cubo["inicio"]).days
+    ultimo = total_dias - 1 if fim is None or cubo["inicio"] is None else (pd.Timestamp(fim).normalize() - cubo["inicio"]).days
+    primeiro, ultimo = max(primeiro, 0), min(ultimo, total_dias - 1)
+
+    somas = {}
+    for metrica, acumulado in cubo["acumulados"].items():
+        if primeiro > ultimo:
+            somas[metrica] = np.zeros(int(selecao.sum()), dtype=acumulado.dtype)
+            continue
+        antes = cubo["posicao_dia"][primeiro - 1] if primeiro > 0 else 0
+        somas[metrica] = acumulado[selecao, cubo["posicao_dia"][ultimo]] - acumulado[selecao, antes]
+
+    if agrupar is None:
+        return {metrica: valores.sum().item() for metrica, valores in somas.items()}
+    eixo = list(cubo["dimensoes"]).index(agrupar)
+    grupos = celulas[selecao, eixo]
+    return {
+        valor: {metrica: valores[grupos == i].sum().item() for metrica, valores in somas.items()}
+        for i, valor in enumerate(cubo["dimensoes"][agrupar]) if (grupos == i).any()
+    }
+
+def cubo_temporal_json(cubo):
+    """
+    Forma compacta do cubo para o frontend: os dias com inspeção e, por célula,
+    só os eventos em que ela tem valor. Os acumulados são refeitos uma vez na
+    carga (src/lib/cuboTemporal.js).
+    """
+    diarios = {metrica: np.diff(acumulado, axis=1) for metrica, acumulado in cubo["acumulados"].items()}
+    series = []
+    for i, celula in enumerate(cubo["celulas"]):
+        eventos = np.flatnonzero(diarios["Registros"][i])
+        series.append({
+            "celula": celula.tolist(),
+            "eventos": eventos.tolist(),
+            **{metrica: diario[i, eventos].tolist() for metrica, diario in diarios.items()},
+        })
+    return {
+        "inicio": cubo["inicio"].strftime("%Y-%m-%d") if cubo["inicio"] is not None else None,
+        "dias": len(cubo["posicao_dia"]),
+        "eventos": cubo["eventos"].tolist(),
+        "dimensoes": cubo["dimensoes"],
+        "metricas": list(cubo["acumulados"]),
+        "series": series,
+    }
+
+# -----------------------------
+# Agregação em blocos (modo streaming)
+# -----------------------------
+def combinar_agregados(partes):
+    """Junta cubos parciais (mesmas chaves) somando contagens e tomando mín./máx. das datas."""
+    partes = [parte for parte in partes if parte is not None and len(parte)]
+    if len(partes) == 1:
+        return partes[0]
+    cubo = pd.concat(partes)
+    return cubo.groupby(level=CHAVES_AGREGACAO, dropna=False, observed=True, sort=True).agg(
+        {col: ('min' if col == 'Data_Min' else 'max' if col == 'Data_Max' else 'sum')
+         for col in cubo.columns}
+    )
+
+def agregar_em_blocos(arquivo_excel, tamanho_bloco):
+    """
+    Versão em blocos de carregar_df_clean + agregar: devolve o mesmo dicionário
+    de agregação, com as linhas de máquinas paradas em 'linhas_paradas'.
+    """
+    print(f"/n🧮 LENDO 'Dados_Brutos' EM BLOCOS DE {tamanho_bloco} LINHAS...")
+    
+    mapeamento = None
+    agregados = None
+    ultimas_inspecoes = None
+    datas = []
+    historicos = []
+    diarios = []
+    paradas = []
+    total_linhas = 0
+    
+    for numero, bloco in enumerate(ler_aba_em_blocos(arquivo_excel, "Dados_Brutos", tamanho_bloco), 1):
+        if mapeamento is None:
+            mapeamento = mapear_dados_brutos(bloco, pasta_cache_padrao(arquivo_excel))
+        df_bloco = adicionar_colunas_derivadas(preparar_dados_brutos(bloco, mapeamento))
+        
+        agregados = combinar_agregados([agregados, construir_agregados(df_bloco)])
+        ultimas_inspecoes = combinar_indices_ultimas([ultimas_inspecoes, indice_ultimas_inspecoes(df_bloco)])
+        datas.append(datas_inspecao(df_bloco))
+        historicos.append(historico_oxidacao(df_bloco))
+        diarios.append(somas_diarias(df_bloco))
+        if 'Status' in df_bloco.columns:
+            paradas.append(df_bloco[mascara_maquinas_paradas(df_bloco["Status"])])
+        
+        total_linhas += len(df_bloco)
+        print(f"   📦 Bloco {numero}: {len(df_bloco)} linhas ({total_linhas} acumuladas, {len(agregados)} grupos)")
+    
+    if agregados is None:
+        raise PlanilhaInvalida("A aba 'Dados_Brutos' está vazia.")
+    
+    print(f"✅ {len(agregados)} grupos gerados a partir de {total_linhas} registros")
+    
+    return {
+        "agregados": agregados,
+        "ciclo": somar_agregados(agregados, 'Ciclo_inspecao'),
+        "ciclo_mes": somar_agregados(agregados, ['Ciclo_inspecao', 'Mes_Ano']),
+        "mes": somar_agregados(agregados, 'Mes_Ano'),
+        "turbina": somar_agregados(agregados, 'Turbina'),
+        "ultimas_inspecoes": ultimas_inspecoes,
+        "datas_inspecao": pd.concat(datas).drop_duplicates().reset_index(drop=True),
+        "historico_oxidacao": pd.concat(historicos, ignore_index=True),
+        "diario": combinar_somas_diarias(diarios),
+        "linhas_paradas": pd.concat(paradas) if paradas else pd.DataFrame(columns=df_bloco.columns)
+    }
+
+def separar_linhas_paradas(agregacao):
+    """Linhas de máquinas paradas guardadas pela leitura em blocos."""
+    return agregacao["linhas_paradas"]
+
+# -----------------------------
+# ETAPA: Agregação única ciclo × mês × cluster × turbina
+# -----------------------------
+def agregar(df_clean, caminho_estado, incremental):
+    """
+    Gera o cubo de agregados (incremental se solicitado) e as tabelas derivadas.
+    Com `caminho_estado` None o estado incremental não é lido nem gravado.
+    """
+    print("/n🧮 AGRUPANDO DADOS POR CICLO × MÊS × CLUSTER × TURBINA...")
+    
+    estado_anterior = carregar_estado(caminho_estado) if incremental and caminho_estado else None
+    agregados, ultimas_inspecoes, estado = atualizar_agregados(df_clean, estado_anterior)
+    if caminho_estado:
+        salvar_estado(caminho_estado, estado)
+    
+    print(f"✅ {len(agregados)} grupos gerados a partir de {len(df_clean)} registros")
+    
+    return {
+        "agregados": agregados,
+        "ciclo": somar_agregados(agregados, 'Ciclo_inspecao'),
+        "ciclo_mes": somar_agregados(agregados, ['Ciclo_inspecao', 'Mes_Ano']),
+        "mes": somar_agregados(agregados, 'Mes_Ano'),
+        "turbina": somar_agregados(agregados, 'Turbina'),
+        "ultimas_inspecoes": ultimas_inspecoes,
+        "datas_inspecao": datas_inspecao(df_clean),
+        "historico_oxidacao": historico_oxidacao(df_clean),
+        "diario": somas_diarias(df_clean)
+    }
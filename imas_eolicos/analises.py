@@ -0,0 +1,465 @@
+"""Análises de oxidação, carreiras, criticidade, turbinas e clusters."""
+
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+from .agregacao import VALOR_NAO_INFORMADO, construir_cubo_temporal, contar_turbinas, estado_turbinas, filtrar_ciclos, percentual
+from .configuracao import CICLOS_ANALISE, CICLOS_TEMPORAIS
+from .confiabilidade import NIVEIS_RISCO, classificar_risco, estatisticas_intervalos, mtbf_dias, mttr_dias
+from .oxidacao import NIVEIS_OXIDACAO
+
+# -----------------------------
+# ETAPA: ANÁLISE DE OXIDAÇÃO - Dados por Ciclo (aba Dados_Brutos - DOWNWIND/UPWIND)
+# -----------------------------
+def analisar_oxidacao(agregacao):
+    print("/n🔬 INICIANDO ANÁLISE DE OXIDAÇÃO - DOWNWIND/UPWIND...")
+    
+    if 'Oxidacao_baixa' not in agregacao["ciclo"].columns:
+        print("❌ Colunas DOWNWIND/UPWIND não encontradas para análise de oxidação")
+        return pd.DataFrame({
+            "Ciclo_Inspecao": CICLOS_ANALISE,
+            "Oxidacao_Baixa": [0, 0, 0, 0, 0],
+            "Oxidacao_Media": [0, 0, 0, 0, 0],
+            "Oxidacao_Alta": [0, 0, 0, 0, 0],
+            "Total_Registros": [0, 0, 0, 0, 0],
+            "Total_Oxidacao": [0, 0, 0, 0, 0],
+            "Percentual_Com_Oxidacao": [0, 0, 0, 0, 0]
+        })
+    
+    print("✅ Colunas DOWNWIND/UPWIND encontradas para análise de oxidação")
+    
+    por_ciclo = agregacao["ciclo"].reindex(CICLOS_ANALISE, fill_value=0)
+    
+    # Criar DataFrame de oxidação
+    oxidacao_df = pd.DataFrame({
+        "Ciclo_Inspecao": CICLOS_ANALISE,
+        "Oxidacao_Baixa": por_ciclo["Oxidacao_baixa"].to_numpy(),
+        "Oxidacao_Media": por_ciclo["Oxidacao_media"].to_numpy(),
+        "Oxidacao_Alta": por_ciclo["Oxidacao_alta"].to_numpy(),
+        "Total_Registros": por_ciclo["Registros"].to_numpy()
+    })
+    
+    # Calcular totais e percentuais
+    oxidacao_df["Total_Oxidacao"] = oxidacao_df["Oxidacao_Baixa"] + oxidacao_df["Oxidacao_Media"] + oxidacao_df["Oxidacao_Alta"]
+    oxidacao_df["Percentual_Com_Oxidacao"] = (oxidacao_df["Total_Oxidacao"] / oxidacao_df["Total_Registros"] * 100).round(2)
+    
+    print(f"/n✅ Análise de oxidação concluída - {len(oxidacao_df)} ciclos processados")
+    print("/n📋 RESUMO DE OXIDAÇÃO POR CICLO:")
+    for _, row in oxidacao_df.iterrows():
+        print(f"   {row['Ciclo_Inspecao']}:")
+        print(f"      Baixa: {row['Oxidacao_Baixa']}")
+        print(f"      Média: {row['Oxidacao_Media']}") 
+        print(f"      Alta: {row['Oxidacao_Alta']}")
+        print(f"      Total com oxidação: {row['Total_Oxidacao']} ({row['Percentual_Com_Oxidacao']}%)")
+    
+    return oxidacao_df
+
+# -----------------------------
+# ETAPA: ANÁLISE TEMPORAL DE OXIDAÇÕES POR CICLO + VARIAÇÃO ENTRE CICLOS
+# -----------------------------
+def analisar_temporal(agregacao):
+    print("/n📅 INICIANDO ANÁLISE TEMPORAL DE OXIDAÇÕES...")
+    
+    if 'Oxidacao_baixa' not in agregacao["ciclo"].columns:
+        print("❌ Colunas necessárias não encontradas")
+        return {"temporal_por_mes": pd.DataFrame(), "variacao_entre_ciclos": pd.DataFrame()}
+    
+    print("✅ Colunas encontradas para análise temporal de oxidações")
+    
+    # Uma linha por ciclo × mês, já na ordem dos ciclos e dos meses
+    temporal = filtrar_ciclos(agregacao["ciclo_mes"], CICLOS_TEMPORAIS)
+    total_oxidacao_mes = temporal["Oxidacao_baixa"] + temporal["Oxidacao_media"] + temporal["Oxidacao_alta"]
+    
+    # Criar DataFrame temporal
+    oxidacao_temporal_df = pd.DataFrame({
+        "Ciclo": temporal.index.get_level_values('Ciclo_inspecao'),
+        "Mes_Ano": temporal.index.get_level_values('Mes_Ano').astype(str),
+        "Oxidacao_Baixa": temporal["Oxidacao_baixa"].to_numpy(),
+        "Oxidacao_Media": temporal["Oxidacao_media"].to_numpy(),
+        "Oxidacao_Alta": temporal["Oxidacao_alta"].to_numpy(),
+        "Total_Registros": temporal["Registros"].to_numpy(),
+        "Total_Oxidacao": total_oxidacao_mes.to_numpy(),
+        "Percentual_Oxidacao": percentual(total_oxidacao_mes, temporal["Registros"]).to_numpy()
+    })
+    
+    print(f"/n✅ Análise temporal concluída - {len(oxidacao_temporal_df)} registros processados")
+    
+    # Mostrar resumo por ciclo
+    resumo_temporal = oxidacao_temporal_df.groupby("Ciclo", sort=False)[["Oxidacao_Baixa", "Oxidacao_Media", "Oxidacao_Alta"]].sum()
+    for ciclo, totais in resumo_temporal.iterrows():
+        print(f"/n📊 {ciclo}:")
+        print(f"   Baixa: {totais['Oxidacao_Baixa']} | Média: {totais['Oxidacao_Media']} | Alta: {totais['Oxidacao_Alta']}")
+    
+    print("/n📈 ANALISANDO VARIAÇÃO ENTRE CICLOS (CORRIGIDA)...")
+    
+    # Totais por ciclo para comparação (apenas ciclos com registros)
+    variacao = agregacao["ciclo"].reindex(CICLOS_TEMPORAIS, fill_value=0)
+    variacao = variacao[variacao["Registros"] > 0]
+    total_oxidacao_ciclo = (variacao["Oxidacao_baixa"] + variacao["Oxidacao_media"]
+                            + variacao["Oxidacao_alta"] + variacao["Oxidacao_troca_spindle"])
+    
+    variacao_ciclos_df = pd.DataFrame({
+        "Ciclo": variacao.index,
+        "Oxidacao_Baixa": variacao["Oxidacao_baixa"].to_numpy(),
+        "Oxidacao_Media": variacao["Oxidacao_media"].to_numpy(),
+        "Oxidacao_Alta": variacao["Oxidacao_alta"].to_numpy(),
+        "Troca_Spindle": variacao["Oxidacao_troca_spindle"].to_numpy(),
+        "Sem_Oxidacao": variacao["Oxidacao_sem_oxidacao"].to_numpy(),
+        "Valores_Invalidos": variacao["Oxidacao_invalido"].to_numpy(),
+        "Total_Registros": variacao["Registros"].to_numpy(),
+        "Total_Oxidacao": total_oxidacao_ciclo.to_numpy(),
+        "Percentual_Oxidacao": percentual(total_oxidacao_ciclo, variacao["Registros"]).to_numpy(),
+        "Percentual_Baixa": percentual(variacao["Oxidacao_baixa"], variacao["Registros"]).to_numpy(),
+        "Percentual_Media": percentual(variacao["Oxidacao_media"], variacao["Registros"]).to_numpy(),
+        "Percentual_Alta": percentual(variacao["Oxidacao_alta"], variacao["Registros"]).to_numpy(),
+        "Percentual_Troca_Spindle": percentual(variacao["Oxidacao_troca_spindle"], variacao["Registros"]).to_numpy(),
+        "Percentual_Sem_Oxidacao": percentual(variacao["Oxidacao_sem_oxidacao"], variacao["Registros"]).to_numpy()
+    })
+    
+    print("/n📊 VARIAÇÃO ENTRE CICLOS (CORRIGIDA):")
+    for _, row in variacao_ciclos_df.iterrows():
+        print(f"   {row['Ciclo']}:")
+        print(f"      Registros: {row['Total_Registros']}")
+        print(f"      Oxidações: {row['Total_Oxidacao']} ({row['Percentual_Oxidacao']}%)")
+        print(f"      Distribuição: B{row['Oxidacao_Baixa']}({row['Percentual_Baixa']}%) / M{row['Oxidacao_Media']}({row['Percentual_Media']}%) / A{row['Oxidacao_Alta']}({row['Percentual_Alta']}%)")
+        print(f"      Troca Spindle: {row['Troca_Spindle']} ({row['Percentual_Troca_Spindle']}%)")
+        print(f"      Sem oxidação: {row['Sem_Oxidacao']} ({row['Percentual_Sem_Oxidacao']}%)")
+        print(f"      Inválidos: {row['Valores_Invalidos']}")
+    
+    return {"temporal_por_mes": oxidacao_temporal_df, "variacao_entre_ciclos": variacao_ciclos_df}
+
+# -----------------------------
+# ETAPA: ANÁLISE MICRO - Dados por Carreiras (aba Carreiras_Vertical)
+# -----------------------------
+def registros_carreiras(df_carreiras):
+    """
+    Linhas válidas da aba Carreiras_Vertical (turbina e carreira preenchidas,
+    carreira diferente de '-' e ímãs trocados > 0), com a carreira no formato C-XX
+    e a data da inspeção (NaT quando a aba não tem a coluna).
+    """
+    if not all(col in df_carreiras.columns for col in ['Turbina', 'Carreira', 'Qtd_Imas']):
+        return pd.DataFrame(columns=["Turbina", "Carreira", "Imas_Trocados", "Data_inspecao"])
+    
+    turbina = df_carreiras['Turbina'].astype(str).str.strip()
+    carreira = df_carreiras['Carreira'].astype(str).str.strip()
+    qtd_imas = df_carreiras['Qtd_Imas'].fillna(0)
+    
+    validos = (
+        df_carreiras['Turbina'].notna() & df_carreiras['Carreira'].notna()
+        & (turbina != '') & ~carreira.isin(['', '-', 'nan']) & (qtd_imas > 0)
+    ).to_numpy()
+    carreira = carreira[validos]
+    if 'Data_inspecao' in df_carreiras.columns:
+        datas = pd.to_datetime(df_carreiras['Data_inspecao'], errors='coerce')
+    else:
+        datas = pd.Series(pd.NaT, index=df_carreiras.index, dtype='datetime64[ns]')
+    
+    return pd.DataFrame({
+        "Turbina": turbina[validos].to_numpy(dtype=object),
+        # Formatar carreira para C-XX
+        "Carreira": np.where(carreira.str.isdigit(), "C-" + carreira.str.zfill(2), carreira).astype(object),
+        "Imas_Trocados": qtd_imas[validos].to_numpy(),
+        "Data_inspecao": datas[validos].to_numpy(),
+    })
+
+def analisar_carreiras(df_carreiras):
+    print("/n🔍 INICIANDO ANÁLISE MICRO - CARREIRAS...")
+    
+    carreiras_df = registros_carreiras(df_carreiras)
+    
+    print(f"📊 Carreiras processadas: {len(carreiras_df)} registros")
+    
+    if carreiras_df.empty:
+        return pd.DataFrame(columns=[
+            "Carreira", "Total_Imas_Trocados", "Turbinas_Afetadas", 
+            "Total_Intervencoes", "Media_Imas_Por_Turbina"
+        ])
+    
+    # Agregar dados por carreira
+    carreira_metrics = carreiras_df.groupby("Carreira").agg({
+        "Imas_Trocados": ["sum", "count"],
+        "Turbina": "nunique"
+    }).reset_index()
+
+    carreira_metrics.columns = ["Carreira", "Total_Imas_Trocados", "Total_Intervencoes", "Turbinas_Afetadas"]
+    
+    # Calcular média de ímãs por turbina
+    turbinas_afetadas = carreira_metrics["Turbinas_Afetadas"]
+    carreira_metrics["Media_Imas_Por_Turbina"] = (
+        carreira_metrics["Total_Imas_Trocados"] / turbinas_afetadas.where(turbinas_afetadas > 0)
+    ).fillna(0)
+    
+    # Ordenar por total de ímãs trocados
+    carreira_metrics = carreira_metrics.sort_values("Total_Imas_Trocados", ascending=False)
+    
+    print(f"✅ Análise micro concluída - {len(carreira_metrics)} carreiras identificadas")
+    
+    return carreira_metrics
+
+def analisar_matriz_carreiras(df_carreiras):
+    """
+    Matriz esparsa carreira × turbina (formato coordenado) para o mapa de calor:
+    só as células com troca, com os ímãs trocados e o número de intervenções.
+    Carreiras em ordem decrescente de ímãs trocados; turbinas em ordem alfabética.
+    """
+    print("/n🗺️ MONTANDO MATRIZ CARREIRA × TURBINA...")
+    
+    carreiras_df = registros_carreiras(df_carreiras)
+    celulas = carreiras_df.groupby(["Carreira", "Turbina"])["Imas_Trocados"].agg(["sum", "count"]).reset_index()
+    
+    carreiras = celulas.groupby("Carreira")["sum"].sum().sort_values(ascending=False, kind="mergesort").index
+    turbinas = pd.Index(sorted(celulas["Turbina"].unique()))
+    linhas = carreiras.get_indexer(celulas["Carreira"])
+    colunas = turbinas.get_indexer(celulas["Turbina"])
+    ordem = np.lexsort((colunas, linhas))
+    
+    print(f"✅ {len(celulas)} células preenchidas de {len(carreiras)} × {len(turbinas)}")
+    
+    return {
+        "carreiras": carreiras.tolist(),
+        "turbinas": turbinas.tolist(),
+        "linhas": linhas[ordem].tolist(),
+        "colunas": colunas[ordem].tolist(),
+        "imas": celulas["sum"].to_numpy(dtype=float)[ordem].tolist(),
+        "intervencoes": celulas["count"].to_numpy(dtype='int64')[ordem].tolist()
+    }
+
+# -----------------------------
+# ETAPA: ANÁLISE DE CRITICIDADE - Dados por Ciclo (aba Dados_Brutos - DOWNWIND/UPWIND)
+# -----------------------------
+def analisar_criticidade(agregacao):
+    print("/n🚨 INICIANDO ANÁLISE DE CRITICIDADE - DOWNWIND/UPWIND...")
+    
+    if 'Criticidade_baixa' not in agregacao["ciclo"].columns:
+        print("❌ Colunas DOWNWIND/UPWIND não encontradas para análise de criticidade")
+        return [{
+            "Ciclo": "Dados Indisponíveis",
+            "Maquinas_Paradas": 0,
+            "Imas_Trocados": 0,
+            "Criticidade_Baixa": 0,
+            "Criticidade_Media": 0,
+            "Criticidade_Alta": 0,
+            "Dias_Parada_Medio": 0
+        }]
+    
+    print("✅ Colunas DOWNWIND/UPWIND encontradas para análise de criticidade")
+    
+    por_ciclo = agregacao["ciclo"].reindex(CICLOS_ANALISE, fill_value=0)
+    
+    # Métricas principais: turbinas distintas com status de parada no ciclo
+    maquinas_paradas_unicas = contar_turbinas(agregacao["agregados"], 'Ciclo_inspecao', 'Paradas_Status').reindex(CICLOS_ANALISE, fill_value=0)
+    
+    # Dias de parada (média por registro do ciclo)
+    dias_parada_medio = (por_ciclo["Dias_Parada"] / por_ciclo["Registros"].where(por_ciclo["Registros"] > 0)).fillna(0)
+    
+    ciclos_data = [
+        {
+            "Ciclo": str(ciclo),
+            "Maquinas_Paradas": int(maquinas_paradas_unicas[ciclo]),
+            "Imas_Trocados": float(por_ciclo.at[ciclo, "Imas_Trocados"]),
+            "Criticidade_Baixa": int(por_ciclo.at[ciclo, "Criticidade_baixa"]),
+            "Criticidade_Media": int(por_ciclo.at[ciclo, "Criticidade_media"]),
+            "Criticidade_Alta": int(por_ciclo.at[ciclo, "Criticidade_alta"]),
+            "Dias_Parada_Medio": round(float(dias_parada_medio[ciclo]), 2)
+        }
+        for ciclo in CICLOS_ANALISE
+    ]
+    
+    for ciclo in ciclos_data:
+        print(f"   🚨 {ciclo['Ciclo']} - Baixo: {ciclo['Criticidade_Baixa']}, Médio: {ciclo['Criticidade_Media']}, Alto: {ciclo['Criticidade_Alta']}")
+    
+    print(f"✅ Análise de criticidade concluída - {len(ciclos_data)} ciclos processados")
+    
+    return ciclos_data
+
+# -----------------------------
+# ETAPA: ANÁLISE MÉSIO - Dados por Turbina
+# -----------------------------
+def analisar_turbinas(agregacao):
+    print("/n📊 INICIANDO ANÁLISE MÉSIO...")
+    
+    agregados_turbina = agregacao["turbina"]
+    
+    # Dados por turbina a partir dos agregados
+    turbina_metrics = pd.DataFrame({
+        "Turbina": agregados_turbina.index,
+        "Total_Imas_Trocados": agregados_turbina["Imas_Trocados"].to_numpy(),
+        "Primeira_Inspecao": agregados_turbina["Data_Min"].to_numpy(),
+        "Ultima_Inspecao": agregados_turbina["Data_Max"].to_numpy(),
+        "Total_Inspecoes": agregados_turbina["Inspecoes"].to_numpy(),
+        "Dias_Parada_Acumulados": agregados_turbina["Dias_Parada"].to_numpy()
+    })
+    
+    # Calcular métricas de confiabilidade
+    hoje = datetime.now()
+    turbina_metrics["MTBF_Dias"] = mtbf_dias(turbina_metrics["Primeira_Inspecao"], turbina_metrics["Total_Imas_Trocados"], hoje)
+    turbina_metrics["MTTR_Dias"] = mttr_dias(turbina_metrics["Dias_Parada_Acumulados"], turbina_metrics["Total_Imas_Trocados"])
+    
+    # Classificar risco
+    turbina_metrics["Nivel_Risco"] = classificar_risco(turbina_metrics["Total_Imas_Trocados"], turbina_metrics["Total_Inspecoes"])
+    
+    # Intervalos entre inspeções (0 quando a turbina tem menos de duas datas)
+    intervalos = estatisticas_intervalos(agregacao["datas_inspecao"]).reindex(agregados_turbina.index.astype(object))
+    turbina_metrics["Intervalos_Inspecao"] = intervalos["count"].fillna(0).to_numpy(dtype='int64')
+    for coluna, estatistica in [("Intervalo_Medio_Dias", "mean"), ("Intervalo_Mediano_Dias", "median"),
+                                ("Intervalo_Min_Dias", "min"), ("Intervalo_Max_Dias", "max"),
+                                ("Intervalo_Desvio_Dias", "std")]:
+        turbina_metrics[coluna] = intervalos[estatistica].fillna(0).round(2).to_numpy()
+    
+    print("✅ Análise mésio concluída")
+    
+    return turbina_metrics
+
+# -----------------------------
+# ETAPA: ANÁLISE TEMPORAL - Evolução Mensal
+# -----------------------------
+def analisar_mensal(agregacao):
+    print("/n📅 INICIANDO ANÁLISE TEMPORAL...")
+    
+    agregados_mes = agregacao["mes"]
+    turbinas_por_mes = contar_turbinas(agregacao["agregados"], 'Mes_Ano').reindex(agregados_mes.index, fill_value=0)
+    
+    mensal_data = pd.DataFrame({
+        "Mes_Ano": agregados_mes.index.astype(str),
+        "Imas_Trocados": agregados_mes["Imas_Trocados"].to_numpy(),
+        "Turbinas_Unicas": turbinas_por_mes.to_numpy(),
+        "Dias_Parada_Total": agregados_mes["Dias_Parada"].to_numpy()
+    })
+    
+    print("✅ Análise temporal concluída")
+    
+    return mensal_data
+
+# -----------------------------
+# ETAPA: CÁLCULO DE OXIDAÇÃO APENAS DA ÚLTIMA INSPEÇÃO
+# -----------------------------
+def analisar_ultima_inspecao(agregacao):
+    print("/n🔬 CALCULANDO OXIDAÇÃO DA ÚLTIMA INSPEÇÃO...")
+    
+    # Última inspeção de cada turbina (calculada junto com os agregados)
+    ultimas_inspecoes = agregacao["ultimas_inspecoes"]
+    print(f"📊 Últimas inspeções de {len(ultimas_inspecoes)} turbinas processadas")
+    
+    # Calcular oxidação apenas das últimas inspeções
+    contagem_ultimas = ultimas_inspecoes['Oxidacao_Nivel'].value_counts().reindex(NIVEIS_OXIDACAO, fill_value=0)
+    oxidacao_ultima_inspecao = {
+        'baixa': int(contagem_ultimas['baixa']),
+        'media': int(contagem_ultimas['media']),
+        'alta': int(contagem_ultimas['alta'])
+    }
+    
+    total_oxidacao_ultima_inspecao = (
+        oxidacao_ultima_inspecao['baixa'] + 
+        oxidacao_ultima_inspecao['media'] + 
+        oxidacao_ultima_inspecao['alta']
+    )
+    
+    print(f"🧲 Oxidação última inspeção - Baixa: {oxidacao_ultima_inspecao['baixa']}, " +
+          f"Média: {oxidacao_ultima_inspecao['media']}, Alta: {oxidacao_ultima_inspecao['alta']}")
+    print(f"📈 Total de oxidação (última inspeção): {total_oxidacao_ultima_inspecao}")
+    
+    return oxidacao_ultima_inspecao
+
+# -----------------------------
+# ETAPA: ÚLTIMO ESTADO E MUDANÇA DESDE A INSPEÇÃO ANTERIOR
+# -----------------------------
+def analisar_estado_turbinas(agregacao):
+    print("/n🔄 CALCULANDO MUDANÇA DE ESTADO DESDE A INSPEÇÃO ANTERIOR...")
+    
+    estado = estado_turbinas(agregacao["ultimas_inspecoes"])
+    
+    for mudanca, quantidade in estado["Mudanca"].value_counts().items():
+        print(f"   {mudanca}: {quantidade} turbinas")
+    
+    return estado
+
+# -----------------------------
+# ETAPA: CUBO TEMPORAL (totais de qualquer período)
+# -----------------------------
+def analisar_cubo_temporal(agregacao):
+    print("/n📆 MONTANDO CUBO TEMPORAL (DIA × CICLO × OXIDAÇÃO × CLUSTER)...")
+    
+    cubo = construir_cubo_temporal(agregacao["diario"])
+    
+    print(f"✅ {len(cubo['celulas'])} células com {len(cubo['eventos'])} dias de inspeção em {len(cubo['posicao_dia'])} dias")
+    
+    return cubo
+
+# -----------------------------
+# ETAPA: ANÁLISE POR CLUSTER + MATRIZ CLUSTER × CICLO
+# -----------------------------
+def analisar_clusters(agregacao):
+    """
+    Oxidação, ímãs trocados, paradas e mix de risco das turbinas de cada
+    cluster, reagrupando o cubo de agregados (registros sem cluster ficam em
+    "Não Informado"), e a matriz cluster × ciclo.
+    """
+    print("/n🏘️ INICIANDO ANÁLISE POR CLUSTER...")
+    
+    agregados = agregacao["agregados"]
+    base = agregados.reset_index()
+    base["Cluster"] = base["Cluster"].astype(object).fillna(VALOR_NAO_INFORMADO)
+    base["Parada"] = base["Paradas_Status"] > 0
+    metricas = [col for col in agregados.columns if col not in ("Data_Min", "Data_Max")]
+    por_cluster = base.groupby("Cluster")[metricas].sum()
+    
+    # Turbinas distintas (com e sem parada) e nível de risco pelo histórico total da turbina
+    pares = base.dropna(subset=["Turbina"])
+    turbinas = pares.groupby("Cluster")["Turbina"].nunique()
+    maquinas_paradas = pares[pares["Parada"]].groupby("Cluster")["Turbina"].nunique()
+    totais_turbina = agregacao["turbina"]
+    risco = pd.Series(classificar_risco(totais_turbina["Imas_Trocados"], totais_turbina["Inspecoes"]), index=totais_turbina.index.astype(object))
+    pares_unicos = pares.drop_duplicates(["Cluster", "Turbina"])
+    mix_risco = pd.crosstab(pares_unicos["Cluster"], pares_unicos["Turbina"].astype(object).map(risco)).reindex(columns=NIVEIS_RISCO, fill_value=0)
+    
+    indice = por_cluster.index
+    cluster_metrics = pd.DataFrame({
+        "Cluster": indice,
+        "Total_Registros": por_cluster["Registros"].to_numpy(),
+        "Turbinas": turbinas.reindex(indice, fill_value=0).to_numpy(),
+        "Total_Imas_Trocados": por_cluster["Imas_Trocados"].to_numpy(),
+        "Dias_Parada_Total": por_cluster["Dias_Parada"].to_numpy(),
+        "Maquinas_Paradas": maquinas_paradas.reindex(indice, fill_value=0).to_numpy()
+    })
+    cluster_metrics["Media_Imas_Por_Turbina"] = (cluster_metrics["Total_Imas_Trocados"] / cluster_metrics["Turbinas"].where(cluster_metrics["Turbinas"] > 0)).fillna(0).round(2)
+    cluster_metrics["Dias_Parada_Medio"] = (cluster_metrics["Dias_Parada_Total"] / cluster_metrics["Total_Registros"].where(cluster_metrics["Total_Registros"] > 0)).fillna(0).round(2)
+    
+    # Distribuição de oxidação (zeros quando não há colunas DOWNWIND/UPWIND)
+    for nivel in NIVEIS_OXIDACAO:
+        coluna = f"Oxidacao_{nivel}"
+        cluster_metrics[coluna] = por_cluster[coluna].to_numpy() if coluna in por_cluster.columns else 0
+    com_oxidacao = cluster_metrics[["Oxidacao_baixa", "Oxidacao_media", "Oxidacao_alta"]].sum(axis=1)
+    cluster_metrics["Percentual_Com_Oxidacao"] = percentual(com_oxidacao, cluster_metrics["Total_Registros"])
+    
+    for nivel, coluna in zip(NIVEIS_RISCO, ["Risco_Alto", "Risco_Medio", "Risco_Baixo"]):
+        cluster_metrics[coluna] = mix_risco[nivel].reindex(indice, fill_value=0).to_numpy()
+    
+    # Matriz densa cluster × ciclo (poucos clusters e ciclos fixos)
+    base["Com_Oxidacao"] = base.reindex(columns=["Oxidacao_baixa", "Oxidacao_media", "Oxidacao_alta"], fill_value=0).sum(axis=1)
+    celulas = base.groupby(["Cluster", "Ciclo_inspecao"], observed=True)[["Registros", "Imas_Trocados", "Com_Oxidacao", "Dias_Parada"]].sum()
+    turbinas_celula = pares.groupby(["Cluster", "Ciclo_inspecao"], observed=True)["Turbina"].nunique()
+    grade = pd.MultiIndex.from_product([indice, CICLOS_ANALISE], names=["Cluster", "Ciclo_inspecao"])
+    celulas = celulas.reindex(grade, fill_value=0)
+    
+    def matriz(valores, tipo):
+        return valores.to_numpy(dtype=tipo).reshape(len(indice), len(CICLOS_ANALISE)).tolist()
+    
+    matriz_ciclos = {
+        "clusters": indice.tolist(),
+        "ciclos": list(CICLOS_ANALISE),
+        "registros": matriz(celulas["Registros"], "int64"),
+        "turbinas": matriz(turbinas_celula.reindex(grade, fill_value=0), "int64"),
+        "imas": matriz(celulas["Imas_Trocados"], float),
+        "com_oxidacao": matriz(celulas["Com_Oxidacao"], "int64"),
+        "dias_parada": matriz(celulas["Dias_Parada"], float)
+    }
+    
+    for _, row in cluster_metrics.iterrows():
+        print(f"   🏘️ {row['Cluster']}: {row['Turbinas']} turbinas, {row['Total_Imas_Trocados']:.0f} ímãs, "
+              f"{row['Percentual_Com_Oxidacao']}% com oxidação, {row['Risco_Alto']} em alto risco")
+    
+    print(f"✅ Análise por cluster concluída - {len(cluster_metrics)} clusters processados")
+    
+    return {"clusters": cluster_metrics, "matriz_ciclos": matriz_ciclos}
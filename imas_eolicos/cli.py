@@ -0,0 +1,191 @@
+"""Linha de comando: gera os JSONs do dashboard a partir da planilha de inspeções."""
+
+import argparse
+import os
+import sys
+
+from .configuracao import ASSETS_PATH, CAMINHO_EXCEL, CAMINHO_EXCEL_LOCAL
+from .exportacao import COMPRESSORES
+from .lote import PASTA_PARQUES, processar_lote
+from .observacao import observar
+from .planilhas import TAMANHO_BLOCO_PADRAO, PlanilhaInvalida
+from .processamento import processar_planilha
+from .servidor import servir
+
+# -----------------------------
+# EXECUÇÃO
+# -----------------------------
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Gera os JSONs do dashboard de ímãs a partir da planilha de inspeções")
+    parser.add_argument(
+        "--planilha", metavar="CAMINHO",
+        help="planilha a processar (padrão: CAMINHO_EXCEL, ou CAMINHO_EXCEL_LOCAL se ela não existir)"
+    )
+    parser.add_argument(
+        "--saida", metavar="PASTA",
+        help="pasta onde os JSONs são gravados (padrão: ASSETS_PATH)"
+    )
+    parser.add_argument(
+        "--lote", metavar="PASTA_OU_GLOB",
+        help="processa uma planilha por parque (pasta com .xlsx ou padrão glob), com saídas por parque e consolidada"
+    )
+    parser.add_argument(
+        "--incremental", action="store_true",
+        help="recalcula apenas os grupos/turbinas com linhas novas ou alteradas desde a última execução"
+    )
+    parser.add_argument(
+        "--workers", type=int, default=1,
+        help="processos para rodar em paralelo as abas e etapas independentes (0 = número de CPUs; padrão 1)"
+    )
+    parser.add_argument(
+        "--streaming", action="store_true",
+        help="lê a aba Dados_Brutos em blocos, sem carregá-la inteira na memória (aceita também .csv)"
+    )
+    parser.add_argument(
+        "--tamanho-bloco", type=int, default=TAMANHO_BLOCO_PADRAO,
+        help=f"linhas por bloco no modo --streaming (padrão {TAMANHO_BLOCO_PADRAO})"
+    )
+    parser.add_argument(
+        "--colunar", action="store_true",
+        help="grava os fragmentos de assets/dados por coluna, com dicionário para textos repetidos"
+    )
+    parser.add_argument(
+        "--comprimir", nargs="+", choices=sorted(COMPRESSORES), default=[],
+        help="grava também versões pré-comprimidas (.json.gz / .json.br) de cada JSON"
+    )
+    parser.add_argument(
+        "--observar", action="store_true",
+        help="continua em execução e regenera os JSONs sempre que a planilha for salva"
+    )
+    parser.add_argument(
+        "--intervalo", type=float, default=0.5,
+        help="segundos entre verificações da planilha no modo --observar (padrão 0.5)"
+    )
+    parser.add_argument(
+        "--espera", type=float, default=0.5,
+        help="segundos sem novas gravações antes de reprocessar no modo --observar (padrão 0.5)"
+    )
+    parser.add_argument(
+        "--servir", action="store_true",
+        help="em vez de gravar os JSONs, atende consultas filtradas numa API HTTP local (/api/...)"
+    )
+    parser.add_argument(
+        "--porta", type=int, default=8765,
+        help="porta da API do modo --servir (padrão 8765)"
+    )
+    parser.add_argument(
+        "--memoria", action="store_true",
+        help="mede também o pico de memória de cada etapa (tracemalloc; deixa a execução bem mais lenta)"
+    )
+    parser.add_argument(
+        "--perfil", metavar="ARQUIVO",
+        help="grava um perfil cProfile da execução (com --workers > 1, só o processo principal)"
+    )
+    args = parser.parse_args(argv)
+    
+    try:
+        if not args.perfil:
+            processar(args)
+            return
+        
+        import cProfile
+        import pstats
+        perfil = cProfile.Profile()
+        try:
+            perfil.runcall(processar, args)
+        finally:
+            perfil.dump_stats(args.perfil)
+        print(f"/n🔎 Perfil salvo em: {args.perfil} (python -m pstats {args.perfil})")
+        pstats.Stats(perfil).sort_stats("cumulative").print_stats(15)
+    except (FileNotFoundError, PlanilhaInvalida) as e:
+        print(f"❌ {e}")
+        sys.exit(1)
+
+def resolver_planilha(caminho=None):
+    """Planilha informada ou, sem ela, CAMINHO_EXCEL com fallback para CAMINHO_EXCEL_LOCAL."""
+    if caminho:
+        if not os.path.exists(caminho):
+            raise FileNotFoundError(f"Planilha não encontrada: {caminho}")
+        return caminho
+    if os.path.exists(CAMINHO_EXCEL):
+        return CAMINHO_EXCEL
+    if os.path.exists(CAMINHO_EXCEL_LOCAL):
+        print("✅ Arquivo carregado do diretório local!")
+        return CAMINHO_EXCEL_LOCAL
+    raise FileNotFoundError("Não foi possível carregar o arquivo. Verifique o caminho.")
+
+def processar(args):
+    """Executa o processamento completo com as opções da linha de comando."""
+    workers = args.workers if args.workers > 0 else (os.cpu_count() or 1)
+    pasta_saida = args.saida or ASSETS_PATH
+    compressao = [formato for formato in dict.fromkeys(args.comprimir) if COMPRESSORES[formato]]
+    
+    print("🚀 INICIANDO PROCESSAMENTO DE DADOS...")
+    if len(compressao) < len(set(args.comprimir)):
+        print("⚠️ Pacote 'brotli' não instalado: arquivos .br não serão gerados (pip install brotli)")
+    
+    if workers > 1:
+        print(f"⚙️ Executando etapas em paralelo com {workers} processos")
+    
+    if args.lote:
+        if args.observar or args.streaming or args.incremental:
+            print("⚠️ --observar, --streaming e --incremental são ignorados no modo --lote")
+        relatorio = processar_lote(args.lote, pasta_saida, workers, args.colunar, compressao)
+        print("/n" + "="*60)
+        print(f"🏭 LOTE CONCLUÍDO: {relatorio['parques_ok']} parques processados, {relatorio['parques_com_erro']} com erro")
+        print(f"📁 Por parque: {os.path.join(pasta_saida, PASTA_PARQUES)}")
+        if relatorio["consolidado"]:
+            print(f"🌐 Consolidado: {pasta_saida}")
+        print("="*60)
+        if relatorio["parques_com_erro"]:
+            sys.exit(1)
+        return
+    
+    arquivo_excel = resolver_planilha(args.planilha)
+    
+    if args.servir:
+        servir(arquivo_excel, args.porta)
+        return
+    
+    if args.observar:
+        if args.streaming:
+            print("⚠️ --streaming é ignorado no modo --observar (as abas ficam em memória entre as atualizações)")
+        observar(arquivo_excel, pasta_saida, args.intervalo, args.espera, workers, args.colunar, compressao)
+        return
+    
+    if args.streaming and args.incremental:
+        print("⚠️ --incremental é ignorado no modo --streaming (o estado exige a aba inteira)")
+    
+    resultado = processar_planilha(
+        arquivo_excel, pasta_saida,
+        workers=workers,
+        incremental=args.incremental,
+        streaming=args.streaming,
+        tamanho_bloco=args.tamanho_bloco,
+        colunar=args.colunar,
+        compressao=args.comprimir,
+        memoria=args.memoria,
+    )
+    dashboard_data = resultado["dashboard_data"]
+    
+    # VERIFICAÇÃO FINAL
+    print(f"/n📋 ESTRUTURA FINAL DO JSON:")
+    print(f"   - oxidacao_temporal: ✅ PRESENTE")
+    print(f"   - ciclos: {len(dashboard_data['ciclos'])} ciclos")
+    print(f"   - turbinas: {len(dashboard_data['turbinas'])} turbinas")
+    print(f"   - carreiras: {len(dashboard_data['carreiras'])} carreiras")
+    
+    # -----------------------------
+    # RELATÓRIO FINAL
+    # -----------------------------
+    resumo = dashboard_data["resumo"]
+    print("/n" + "="*60)
+    print("🎉 ANÁLISE CONCLUÍDA COM SUCESSO!")
+    print("="*60)
+    print(f"📊 Total de registros processados: {resumo['total_registros']}")
+    print(f"🌀 Total de turbinas analisadas: {resumo['total_turbinas']}")
+    print(f"🧲 Total de ímãs trocados: {resumo['total_imas_trocados']:.0f}")
+    print(f"🔬 Dados para gráficos de oxidação:")
+    print(f"   - Evolução Temporal: {len(dashboard_data['oxidacao_temporal']['temporal_por_mes'])} registros mensais")
+    print(f"   - Comparação entre Ciclos: {len(dashboard_data['oxidacao_temporal']['variacao_entre_ciclos'])} ciclos")
+    print("="*60)
@@ -0,0 +1,134 @@
+"""Resolução automática de colunas das planilhas de inspeção."""
+
+import hashlib
+import json
+import os
+import re
+import unicodedata
+from functools import lru_cache
+
+import pandas as pd
+
+# -----------------------------
+# Resolução automática de colunas
+# -----------------------------
+# Cada campo lógico tem uma lista de padrões em ordem de preferência. Os
+# cabeçalhos são normalizados uma vez (minúsculas, sem acento, pontuação
+# virando espaço), e cada par campo × coluna recebe a nota: igual > começa com
+# o padrão > contém o padrão. Na mesma nota vence o padrão mais longo (mais
+# específico), depois a ordem dos padrões e a das colunas. Os campos são
+# resolvidos juntos e cada coluna atende a um só campo.
+ESQUEMA_DADOS_BRUTOS = {
+    'data_inspecao': ['data', 'data_inspeção', 'data inspeção', 'DATA INSPECAO', 'data'],
+    'turbina': ['turbina', 'aeg', 'TURBINA', 'AEG'],
+    'qtd_imas_trocados': ['qtd', 'quantidade', 'imas', 'trocados', 'QTD IMAS TROCADOS'],
+    'ciclo_inspecao': ['ciclo', 'CICLO INSPECAO', 'ciclo inspeção'],
+    'status': ['status', 'STATUS'],
+    'os': ['os', 'OS'],
+    'cluster': ['cluster', 'CLUSTER'],
+    'observacao': ['observação', 'observacao', 'OBSERVACOES', 'obs'],
+    'dias_parada': ['dias', 'parada', 'K1DIAS PARADA', 'dias_parada'],
+    'downwind': ['downwind', 'DOWNWIND'],
+    'upwind': ['upwind', 'UPWIND']
+}
+
+ESQUEMA_CARREIRAS = {
+    'turbina': ['aeg', 'turbina'],
+    'carreira': ['carreira'],
+    'qtd_imas': ['qtd', 'quantidade', 'imas'],
+    'data_inspecao': ['data', 'data_inspeção'],
+    'os': ['os'],
+    'ciclo': ['ciclo'],
+    'status': ['status']
+}
+
+ARQUIVO_MAPEAMENTOS = "mapeamento_colunas.json"
+VERSAO_RESOLUCAO = 1  # incrementar sempre que as regras de resolver_colunas mudarem
+
+@lru_cache(maxsize=None)
+def normalizar_cabecalho(nome):
+    """Minúsculas, sem acentos, com qualquer sequência de pontuação/espaços virando um espaço."""
+    texto = unicodedata.normalize('NFKD', str(nome)).encode('ascii', 'ignore').decode('ascii')
+    return re.sub(r'[^a-z0-9]+', ' ', texto.lower()).strip()
+
+@lru_cache(maxsize=None)
+def _compilar_esquema(esquema):
+    """Padrões normalizados e sem repetição, na ordem de preferência de cada campo."""
+    return tuple(
+        (campo, tuple(dict.fromkeys(normalizar_cabecalho(padrao) for padrao in padroes)))
+        for campo, padroes in esquema
+    )
+
+def resolver_colunas(colunas, esquema):
+    """Resolve todos os campos do esquema de uma vez; devolve {campo: coluna ou None}."""
+    esquema = _compilar_esquema(tuple((campo, tuple(padroes)) for campo, padroes in esquema.items()))
+    cabecalhos = [(posicao, normalizar_cabecalho(coluna)) for posicao, coluna in enumerate(colunas) if not pd.isna(coluna)]
+    
+    exatos = {}
+    for posicao, cabecalho in cabecalhos:
+        exatos.setdefault(cabecalho, posicao)
+    
+    candidatos = []
+    for ordem, (campo, padroes) in enumerate(esquema):
+        for indice, padrao in enumerate(padroes):
+            if padrao in exatos:
+                candidatos.append((0, -len(padrao), indice, exatos[padrao], ordem))
+            for posicao, cabecalho in cabecalhos:
+                if cabecalho != padrao and padrao in cabecalho:
+                    candidatos.append((1 if cabecalho.startswith(padrao) else 2, -len(padrao), indice, posicao, ordem))
+    
+    resolvidos = {}
+    usadas = set()
+    for *_, posicao, ordem in sorted(candidatos):
+        if ordem not in resolvidos and posicao not in usadas:
+            resolvidos[ordem] = posicao
+            usadas.add(posicao)
+    
+    return {campo: colunas[resolvidos[ordem]] if ordem in resolvidos else None for ordem, (campo, _) in enumerate(esquema)}
+
+def _assinatura_cabecalhos(colunas, esquema):
+    """Hash dos cabeçalhos, dos padrões do esquema e da versão das regras de resolução."""
+    # Os campos entram na ordem do esquema, que também desempata a resolução
+    conteudo = json.dumps([VERSAO_RESOLUCAO, [str(coluna) for coluna in colunas], list(esquema.items())],
+                          ensure_ascii=False)
+    return hashlib.sha256(conteudo.encode('utf-8')).hexdigest()[:16]
+
+def mapear_colunas(colunas, esquema, pasta_cache=None):
+    """
+    resolver_colunas com cache por assinatura dos cabeçalhos: enquanto os
+    cabeçalhos da aba, os padrões do esquema e VERSAO_RESOLUCAO não mudarem,
+    a resolução é reaproveitada.
+    """
+    colunas = list(colunas)
+    if pasta_cache is None:
+        return resolver_colunas(colunas, esquema)
+    
+    caminho = os.path.join(pasta_cache, ARQUIVO_MAPEAMENTOS)
+    assinatura = _assinatura_cabecalhos(colunas, esquema)
+    try:
+        with open(caminho, encoding='utf-8') as f:
+            mapeamentos = json.load(f)
+    except (OSError, ValueError):
+        mapeamentos = {}
+    
+    if assinatura in mapeamentos:
+        print("⚡ Mapeamento de colunas reaproveitado do cache")
+        return {campo: None if posicao is None else colunas[posicao] for campo, posicao in mapeamentos[assinatura].items()}
+    
+    mapeamento = resolver_colunas(colunas, esquema)
+    posicoes = {coluna: posicao for posicao, coluna in reversed(list(enumerate(colunas)))}
+    mapeamentos[assinatura] = {campo: None if coluna is None else posicoes[coluna] for campo, coluna in mapeamento.items()}
+    try:
+        # Gravação atômica: as duas abas podem ser mapeadas em processos paralelos
+        os.makedirs(pasta_cache, exist_ok=True)
+        temporario = f"{caminho}.{os.getpid()}.tmp"
+        with open(temporario, 'w', encoding='utf-8') as f:
+            json.dump(mapeamentos, f, ensure_ascii=False, indent=2)
+        os.replace(temporario, caminho)
+    except OSError as e:
+        print(f"⚠️ Não foi possível gravar o cache de mapeamento de colunas: {e}")
+    return mapeamento
+
+def encontrar_coluna(df, padroes):
+    """Coluna de `df` que melhor atende aos padrões (None se nenhuma)."""
+    return resolver_colunas(list(df.columns), {'coluna': padroes})['coluna']
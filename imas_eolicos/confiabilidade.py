@@ -0,0 +1,53 @@
+"""Métricas de confiabilidade por turbina (risco, MTBF, MTTR e intervalos)."""
+
+import numpy as np
+import pandas as pd
+
+# -----------------------------
+# Confiabilidade por turbina
+# -----------------------------
+# Expressões vetorizadas sobre colunas inteiras (uma linha por turbina)
+NIVEIS_RISCO = ["🟥 ALTO RISCO", "🟨 MÉDIO RISCO", "🟩 BAIXO RISCO"]
+
+def classificar_risco(total_imas, total_inspecoes):
+    """Nível de risco pelo histórico de ímãs trocados e de inspeções."""
+    total_imas = np.asarray(total_imas, dtype=float)
+    total_inspecoes = np.asarray(total_inspecoes, dtype=float)
+    return np.select(
+        [
+            (total_imas > 20) | ((total_imas > 10) & (total_inspecoes > 5)),
+            (total_imas > 10) | ((total_imas > 5) & (total_inspecoes > 3)),
+        ],
+        NIVEIS_RISCO[:2],
+        default=NIVEIS_RISCO[2],
+    )
+
+def mtbf_dias(primeira_inspecao, total_imas, hoje):
+    """Dias desde a primeira inspeção por ímã trocado (0 sem trocas ou sem data)."""
+    dias = (pd.Timestamp(hoje) - pd.to_datetime(pd.Series(primeira_inspecao))).dt.days.to_numpy(dtype=float)
+    total_imas = np.asarray(total_imas, dtype=float)
+    validos = (total_imas > 0) & ~np.isnan(dias)
+    return np.where(validos, dias / np.where(validos, total_imas, 1), 0.0)
+
+def mttr_dias(dias_parada, total_imas):
+    """Dias de parada por ímã trocado (0 sem trocas)."""
+    dias_parada = np.asarray(dias_parada, dtype=float)
+    total_imas = np.asarray(total_imas, dtype=float)
+    return np.where(total_imas > 0, dias_parada / np.where(total_imas > 0, total_imas, 1), 0.0)
+
+def datas_inspecao(df):
+    """Pares distintos (Turbina, Data_inspecao), base das estatísticas de intervalo."""
+    return df[['Turbina', 'Data_inspecao']].dropna().drop_duplicates().reset_index(drop=True)
+
+def estatisticas_intervalos(datas):
+    """
+    Intervalo em dias entre datas de inspeção consecutivas (distintas) de cada
+    turbina: quantidade, média, mediana, mínimo, máximo e desvio padrão.
+    """
+    datas = datas.drop_duplicates().sort_values(['Turbina', 'Data_inspecao'], kind='mergesort')
+    intervalos = datas.groupby('Turbina', observed=True)['Data_inspecao'].diff().dt.days
+    estatisticas = intervalos.groupby(datas['Turbina'], observed=True).agg(
+        ['count', 'mean', 'median', 'min', 'max', 'std']
+    )
+    estatisticas.index = estatisticas.index.astype(object)
+    return estatisticas
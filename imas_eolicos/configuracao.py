@@ -0,0 +1,13 @@
+"""Caminhos padrão e ciclos analisados."""
+
+# -----------------------------
+# Caminhos de entrada e saída
+# -----------------------------
+CAMINHO_EXCEL = "C:/Users/de.ferreira/Desktop/dashboard_substituicao_imas_Eolico/Analise de Imas trocados.xlsx"
+CAMINHO_EXCEL_LOCAL = "Analise de Troca de Imãs.xlsx"
+ASSETS_PATH = r"C:/Users/de.ferreira/Desktop/dashboard_substituicao_imas_Eolico/src/assets"
+
+# Ciclos para análise
+CICLOS_ANALISE = ['Primeiro Ciclo', 'Segundo Ciclo', 'Terceiro Ciclo', 'Quarto Ciclo', 'Troca de Spindle']
+# Ciclos para análise temporal e variação entre ciclos
+CICLOS_TEMPORAIS = ['Primeiro Ciclo', 'Segundo Ciclo', 'Terceiro Ciclo', 'Quarto Ciclo']
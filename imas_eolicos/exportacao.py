@@ -0,0 +1,540 @@
+"""Montagem do dashboard_data e exportação dos JSONs/fragmentos."""
+
+import glob
+import gzip
+import hashlib
+import json
+import os
+from datetime import datetime
+
+import pandas as pd
+
+from .agregacao import cubo_temporal_json
+from .instrumentacao import contar_linhas
+from .oxidacao import NIVEIS_OXIDACAO
+from .paradas import CHAVES_CICLO_PARADAS
+
+# -----------------------------
+# MONTAR DASHBOARD_DATA
+# -----------------------------
+def montar_dashboard_data(r):
+    """Monta o dicionário do dashboard a partir dos resultados das etapas."""
+    agregados = r["agregacao"]["agregados"]
+    ciclos_data = r["ciclos_data"]
+    oxidacao_df = r["oxidacao_df"]
+    oxidacao_temporal_df = r["temporal"]["temporal_por_mes"]
+    variacao_ciclos_df = r["temporal"]["variacao_entre_ciclos"]
+    turbina_metrics = r["turbina_metrics"]
+    carreira_metrics = r["carreira_metrics"]
+    mensal_data = r["mensal_data"]
+    oxidacao_ultima_inspecao = r["oxidacao_ultima_inspecao"]
+    estado = r["estado_turbinas"]
+    
+    # -----------------------------
+    # CÁLCULO DE TOTAIS PARA DASHBOARD
+    # -----------------------------
+    total_imas_trocados = agregados["Imas_Trocados"].sum()
+    total_turbinas = len(r["agregacao"]["turbina"])
+    total_carreiras = len(carreira_metrics)
+    
+    # Calcular totais de criticidade
+    total_criticidade = sum([ciclo["Criticidade_Baixa"] + ciclo["Criticidade_Media"] + ciclo["Criticidade_Alta"] for ciclo in ciclos_data])
+    total_maquinas_paradas = sum([ciclo["Maquinas_Paradas"] for ciclo in ciclos_data])
+    
+    # >>> USAR OXIDAÇÃO DA ÚLTIMA INSPEÇÃO <<<
+    total_oxidacao_baixa = oxidacao_ultima_inspecao['baixa']
+    total_oxidacao_media = oxidacao_ultima_inspecao['media'] 
+    total_oxidacao_alta = oxidacao_ultima_inspecao['alta']
+    total_oxidacao = total_oxidacao_baixa + total_oxidacao_media + total_oxidacao_alta
+    
+    print(f"/n🎯 TOTAIS ATUALIZADOS:")
+    print(f"   Ímãs Trocados: {total_imas_trocados}")
+    print(f"   Turbinas: {total_turbinas}")
+    print(f"   Oxidação (última inspeção): {total_oxidacao}")
+    print(f"   Carreiras: {total_carreiras}")
+    
+    print("/n💾 PREPARANDO DADOS PARA DASHBOARD...")
+    
+    # PRIMEIRO: Preparar a estrutura oxidacao_temporal separadamente
+    oxidacao_temporal_json = {
+        "temporal_por_mes": [
+            {
+                "Ciclo": row["Ciclo"],
+                "Mes_Ano": row["Mes_Ano"],
+                "Oxidacao_Baixa": int(row["Oxidacao_Baixa"]),
+                "Oxidacao_Media": int(row["Oxidacao_Media"]),
+                "Oxidacao_Alta": int(row["Oxidacao_Alta"]),
+                "Total_Registros": int(row["Total_Registros"]),
+                "Total_Oxidacao": int(row["Total_Oxidacao"]),
+                "Percentual_Oxidacao": float(row["Percentual_Oxidacao"])
+            }
+            for _, row in oxidacao_temporal_df.iterrows()
+        ],
+        "variacao_entre_ciclos": [
+            {
+                "Ciclo": row["Ciclo"],
+                "Oxidacao_Baixa": int(row["Oxidacao_Baixa"]),
+                "Oxidacao_Media": int(row["Oxidacao_Media"]),
+                "Oxidacao_Alta": int(row["Oxidacao_Alta"]),
+                "Troca_Spindle": int(row.get("Troca_Spindle", 0)),
+                "Total_Registros": int(row["Total_Registros"]),
+                "Total_Oxidacao": int(row["Total_Oxidacao"]),
+                "Percentual_Oxidacao": float(row["Percentual_Oxidacao"]),
+                "Percentual_Baixa": float(row["Percentual_Baixa"]),
+                "Percentual_Media": float(row["Percentual_Media"]),
+                "Percentual_Alta": float(row["Percentual_Alta"])
+            }
+            for _, row in variacao_ciclos_df.iterrows()
+        ]
+    }
+    
+    # AGORA: Incluir oxidacao_temporal no dashboard_data
+    dashboard_data = {
+        # >>> ESTRUTURA NOVA PARA OS GRÁFICOS <<<
+        "oxidacao_temporal": oxidacao_temporal_json,
+        
+        # Dados Macro: Ciclos (agora com criticidade)
+        "ciclos": [
+            {
+                "Ciclo": ciclo["Ciclo"],
+                "Maquinas_Paradas": ciclo["Maquinas_Paradas"],
+                "Imas_Trocados": ciclo["Imas_Trocados"],
+                "Criticidade_Baixa": ciclo["Criticidade_Baixa"],
+                "Criticidade_Media": ciclo["Criticidade_Media"],
+                "Criticidade_Alta": ciclo["Criticidade_Alta"],
+                "Dias_Parada_Medio": ciclo["Dias_Parada_Medio"]
+            }
+            for ciclo in ciclos_data
+        ],
+        
+        # Dados de Oxidação: Por Ciclo (mantenha esta também se precisar)
+        "oxidacao": [
+            {
+                "Ciclo_Inspecao": row["Ciclo_Inspecao"],
+                "Oxidacao_Baixa": row["Oxidacao_Baixa"],
+                "Oxidacao_Media": row["Oxidacao_Media"],
+                "Oxidacao_Alta": row["Oxidacao_Alta"],
+                "Total_Registros": row["Total_Registros"],
+                "Total_Oxidacao": int(row["Total_Oxidacao"]),
+                "Percentual_Com_Oxidacao": float(row["Percentual_Com_Oxidacao"])
+            }
+            for _, row in oxidacao_df.iterrows()
+        ],
+        
+        # Dados Mésio: Turbinas
+        "turbinas": [
+            {
+                "Turbina": row["Turbina"],
+                "Total_Imas_Trocados": float(row["Total_Imas_Trocados"]),
+                "Primeira_Inspecao": row["Primeira_Inspecao"].strftime("%Y-%m-%d") if pd.notna(row["Primeira_Inspecao"]) else "N/A",
+                "Ultima_Inspecao": row["Ultima_Inspecao"].strftime("%Y-%m-%d") if pd.notna(row["Ultima_Inspecao"]) else "N/A",
+                "Total_Inspecoes": int(row["Total_Inspecoes"]),
+                "Dias_Parada_Acumulados": float(row["Dias_Parada_Acumulados"]),
+                "MTBF_Dias": float(row["MTBF_Dias"]),
+                "MTTR_Dias": float(row["MTTR_Dias"]),
+                "Nivel_Risco": row["Nivel_Risco"],
+                "Intervalos_Inspecao": int(row["Intervalos_Inspecao"]),
+                "Intervalo_Medio_Dias": float(row["Intervalo_Medio_Dias"]),
+                "Intervalo_Mediano_Dias": float(row["Intervalo_Mediano_Dias"]),
+                "Intervalo_Min_Dias": float(row["Intervalo_Min_Dias"]),
+                "Intervalo_Max_Dias": float(row["Intervalo_Max_Dias"]),
+                "Intervalo_Desvio_Dias": float(row["Intervalo_Desvio_Dias"])
+            }
+            for _, row in turbina_metrics.iterrows()
+        ],
+        
+        # Dados Micro: Carreiras
+        "carreiras": [
+            {
+                "Carreira": row["Carreira"],
+                "Total_Imas_Trocados": float(row["Total_Imas_Trocados"]),
+                "Turbinas_Afetadas": int(row["Turbinas_Afetadas"]),
+                "Total_Intervencoes": int(row["Total_Intervencoes"]),
+                "Media_Imas_Por_Turbina": float(row["Media_Imas_Por_Turbina"])
+            }
+            for _, row in carreira_metrics.iterrows()
+        ],
+        
+        # Matriz esparsa carreira × turbina (mapa de calor)
+        "matriz_carreiras": r["matriz_carreiras"],
+        
+        # Dados Temporais: Mensal
+        "mensal": [
+            {
+                "Mes_Ano": row["Mes_Ano"],
+                "Imas_Trocados": float(row["Imas_Trocados"]),
+                "Turbinas_Unicas": int(row["Turbinas_Unicas"]),
+                "Dias_Parada_Total": float(row["Dias_Parada_Total"])
+            }
+            for _, row in mensal_data.iterrows()
+        ],
+        
+        # Último estado de cada turbina e mudança desde a inspeção anterior
+        "ultima_inspecao": {
+            "turbinas": [
+                {
+                    "Turbina": row["Turbina"],
+                    "Ultima_Inspecao": row["Data_inspecao"].strftime("%Y-%m-%d") if pd.notna(row["Data_inspecao"]) else "N/A",
+                    "Nivel_Atual": row["Oxidacao_Nivel"] if pd.notna(row["Oxidacao_Nivel"]) else None,
+                    "Inspecao_Anterior": row["Data_Anterior"].strftime("%Y-%m-%d") if pd.notna(row["Data_Anterior"]) else "N/A",
+                    "Nivel_Anterior": row["Oxidacao_Anterior"] if pd.notna(row["Oxidacao_Anterior"]) else None,
+                    "Mudanca": row["Mudanca"]
+                }
+                for _, row in estado.iterrows()
+            ],
+            "mudancas": {mudanca: int(quantidade) for mudanca, quantidade in estado["Mudanca"].value_counts().items()}
+        },
+        
+        # Métricas por cluster e matriz cluster × ciclo
+        "clusters": {
+            "clusters": [
+                {
+                    "Cluster": row["Cluster"],
+                    "Total_Registros": int(row["Total_Registros"]),
+                    "Turbinas": int(row["Turbinas"]),
+                    "Total_Imas_Trocados": float(row["Total_Imas_Trocados"]),
+                    "Media_Imas_Por_Turbina": float(row["Media_Imas_Por_Turbina"]),
+                    "Dias_Parada_Total": float(row["Dias_Parada_Total"]),
+                    "Dias_Parada_Medio": float(row["Dias_Parada_Medio"]),
+                    "Maquinas_Paradas": int(row["Maquinas_Paradas"]),
+                    **{f"Oxidacao_{nivel}": int(row[f"Oxidacao_{nivel}"]) for nivel in NIVEIS_OXIDACAO},
+                    "Percentual_Com_Oxidacao": float(row["Percentual_Com_Oxidacao"]),
+                    "Risco_Alto": int(row["Risco_Alto"]),
+                    "Risco_Medio": int(row["Risco_Medio"]),
+                    "Risco_Baixo": int(row["Risco_Baixo"])
+                }
+                for _, row in r["clusters"]["clusters"].iterrows()
+            ],
+            "matriz_ciclos": r["clusters"]["matriz_ciclos"]
+        },
+        
+        # Transições de oxidação entre inspeções/ciclos, tempo até agravar e degradação por turbina
+        "progressao": {
+            "niveis": r["progressao"]["niveis"],
+            "entre_inspecoes": r["progressao"]["entre_inspecoes"],
+            "entre_ciclos": r["progressao"]["entre_ciclos"],
+            "tempo_ate_agravar": r["progressao"]["tempo_ate_agravar"],
+            "turbinas": [
+                {
+                    "Turbina": row["Turbina"],
+                    "Inspecoes": int(row["Inspecoes"]),
+                    "Primeira_Inspecao": row["Primeira_Inspecao"].strftime("%Y-%m-%d"),
+                    "Ultima_Inspecao": row["Ultima_Inspecao"].strftime("%Y-%m-%d"),
+                    "Nivel_Inicial": row["Nivel_Inicial"],
+                    "Nivel_Atual": row["Nivel_Atual"],
+                    "Pior_Nivel": row["Pior_Nivel"],
+                    "Variacao_Niveis": int(row["Variacao_Niveis"]),
+                    "Agravamentos": int(row["Agravamentos"]),
+                    "Taxa_Degradacao_Ano": float(row["Taxa_Degradacao_Ano"]),
+                    "Trocas_Spindle": int(row["Trocas_Spindle"])
+                }
+                for _, row in r["progressao"]["turbinas"].iterrows()
+            ]
+        },
+        
+        # Modelo de piora da frota e turbinas em ordem de prioridade de inspeção
+        "proxima_inspecao": {
+            "referencia": r["previsao"]["referencia"].strftime("%Y-%m-%d"),
+            "modelo": r["previsao"]["modelo"],
+            "turbinas": [
+                {
+                    "Posicao": int(row["Posicao"]),
+                    "Turbina": row["Turbina"],
+                    "Probabilidade_Piora": float(row["Probabilidade_Piora"]),
+                    "Prioridade": row["Prioridade"],
+                    "Nivel_Atual": row["Nivel_Atual"],
+                    "Ciclo_Atual": row["Ciclo_Atual"] if pd.notna(row["Ciclo_Atual"]) else None,
+                    "Ultima_Inspecao": row["Ultima_Inspecao"].strftime("%Y-%m-%d"),
+                    "Dias_Desde_Ultima": int(row["Dias_Desde_Ultima"]),
+                    "Imas_Trocados": float(row["Imas_Trocados"]),
+                    "Carreiras_Afetadas": int(row["Carreiras_Afetadas"]),
+                    "Proxima_Inspecao": row["Proxima_Inspecao"].strftime("%Y-%m-%d"),
+                    "Dias_Ate_Proxima": int(row["Dias_Ate_Proxima"])
+                }
+                for _, row in r["previsao"]["turbinas"].iterrows()
+            ]
+        },
+        
+        # Paradas simultâneas e disponibilidade diária da frota (pontos de mudança)
+        "disponibilidade": r["disponibilidade"],
+        
+        # Somas por dia × ciclo × oxidação × cluster para totais de qualquer período
+        "cubo_temporal": cubo_temporal_json(r["cubo_temporal"]),
+        
+        # Resumo Geral
+        "resumo": {
+            "total_imas_trocados": float(total_imas_trocados),
+            "total_turbinas": int(total_turbinas),
+            "total_criticidade": int(total_criticidade),
+            "total_maquinas_paradas": int(total_maquinas_paradas),
+            "total_carreiras": int(total_carreiras),
+            "total_oxidacao_baixa": int(total_oxidacao_baixa),
+            "total_oxidacao_media": int(total_oxidacao_media),
+            "total_oxidacao_alta": int(total_oxidacao_alta),
+            "total_oxidacao": int(total_oxidacao),
+            "periodo_analise": f"{agregados['Data_Min'].min().strftime('%Y-%m')} a {agregados['Data_Max'].max().strftime('%Y-%m')}",
+            "data_ultima_atualizacao": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+            "total_registros": int(agregados["Registros"].sum()),
+            "observacao_oxidacao": "Baseado na última inspeção de cada turbina"
+        }
+    }
+    
+    # VERIFICAÇÃO ANTES DE SALVAR
+    print(f"/n🔍 VERIFICAÇÃO DA ESTRUTURA oxidacao_temporal:")
+    print(f"   - temporal_por_mes: {len(oxidacao_temporal_json['temporal_por_mes'])} registros")
+    print(f"   - variacao_entre_ciclos: {len(oxidacao_temporal_json['variacao_entre_ciclos'])} ciclos")
+    
+    return dashboard_data
+
+# -----------------------------
+# SALVAR ARQUIVOS
+# -----------------------------
+def salvar_json(dados, nome_arquivo, assets_path, compressao=()):
+    """
+    Grava um JSON em assets_path (ou no diretório atual, como fallback), com
+    irmãos pré-comprimidos para cada formato em `compressao`. Retorna o caminho final.
+    """
+    conteudo = json.dumps(dados, ensure_ascii=False, indent=2).encode("utf-8")
+    try:
+        if not os.path.exists(assets_path):
+            os.makedirs(assets_path)
+            print(f"📁 Diretório criado: {assets_path}")
+        
+        json_path = os.path.join(assets_path, nome_arquivo)
+        if gravar_atomico(json_path, conteudo):
+            print(f"✅ {nome_arquivo} salvo com sucesso em: {json_path}")
+        else:
+            print(f"⏭️ {nome_arquivo} sem alterações: {json_path}")
+        
+    except Exception as e:
+        print(f"❌ Erro ao salvar {nome_arquivo}: {e}")
+        current_dir = os.getcwd()
+        json_path = os.path.join(current_dir, nome_arquivo)
+        gravar_atomico(json_path, conteudo)
+        print(f"✅ Arquivo salvo em backup: {json_path}")
+    
+    if compressao:
+        comprimir_arquivo(json_path, conteudo, compressao)
+    return json_path
+
+def gravar_atomico(caminho, conteudo):
+    """
+    Grava `conteudo` (bytes) num arquivo temporário e o move para `caminho`,
+    para que quem lê a pasta (ex.: o servidor do Vite) nunca veja um JSON pela
+    metade. Arquivos com o mesmo conteúdo não são reescritos. Retorna True se gravou.
+    O temporário leva o pid, então processos gravando o mesmo arquivo não se atropelam.
+    """
+    try:
+        with open(caminho, "rb") as f:
+            if f.read() == conteudo:
+                return False
+    except OSError:
+        pass
+    temporario = f"{caminho}.{os.getpid()}.tmp"
+    try:
+        with open(temporario, "wb") as f:
+            f.write(conteudo)
+        os.replace(temporario, caminho)
+    except OSError:
+        if os.path.exists(temporario):
+            os.remove(temporario)
+        raise
+    return True
+
+# -----------------------------
+# FORMATO COLUNAR E COMPRESSÃO
+# -----------------------------
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+COMPRESSORES = {
+    "gz": lambda conteudo: gzip.compress(conteudo, compresslevel=9, mtime=0),
+    "br": brotli.compress if brotli else None,
+}
+
+def comprimir_arquivo(caminho, conteudo, compressao):
+    """Grava `caminho`.gz / `caminho`.br com `conteudo` comprimido; devolve {formato: bytes}."""
+    tamanhos = {}
+    for formato in compressao:
+        comprimido = COMPRESSORES[formato](conteudo)
+        gravar_atomico(f"{caminho}.{formato}", comprimido)
+        tamanhos[formato] = len(comprimido)
+    return tamanhos
+
+def _codificar_coluna(valores):
+    """Coluna de texto com valores repetidos vira {dicionario, codigos}; as demais ficam como lista."""
+    presentes = [valor for valor in valores if valor is not None]
+    # Só textos entram no dicionário (colunas de listas, como as células do cubo, não são hasheáveis)
+    if not presentes or not all(isinstance(valor, str) for valor in presentes):
+        return valores
+    distintos = list(dict.fromkeys(presentes))
+    if len(distintos) <= len(valores) // 2:
+        codigos = {valor: i for i, valor in enumerate(distintos)}
+        return {"dicionario": distintos, "codigos": [None if valor is None else codigos[valor] for valor in valores]}
+    return valores
+
+def codificar_colunar(valor):
+    """
+    Converte, recursivamente, listas de registros (dicts com as mesmas chaves)
+    em {"$colunar": n, "colunas": {campo: [valores]}}. Desfeito por expandir_colunar
+    (e por src/lib/colunar.js no frontend).
+    """
+    if isinstance(valor, dict):
+        return {chave: codificar_colunar(item) for chave, item in valor.items()}
+    if not isinstance(valor, list):
+        return valor
+    if len(valor) > 1 and all(isinstance(registro, dict) and registro.keys() == valor[0].keys() for registro in valor):
+        return {
+            "$colunar": len(valor),
+            "colunas": {
+                campo: _codificar_coluna([codificar_colunar(registro[campo]) for registro in valor])
+                for campo in valor[0]
+            },
+        }
+    return [codificar_colunar(item) for item in valor]
+
+def expandir_colunar(valor):
+    """Inverso de codificar_colunar."""
+    if isinstance(valor, list):
+        return [expandir_colunar(item) for item in valor]
+    if not isinstance(valor, dict):
+        return valor
+    if "$colunar" not in valor:
+        return {chave: expandir_colunar(item) for chave, item in valor.items()}
+    colunas = {}
+    for campo, coluna in valor["colunas"].items():
+        if isinstance(coluna, dict):
+            coluna = [None if codigo is None else coluna["dicionario"][codigo] for codigo in coluna["codigos"]]
+        colunas[campo] = [expandir_colunar(item) for item in coluna]
+    return [{campo: colunas[campo][i] for campo in colunas} for i in range(valor["$colunar"])]
+
+# -----------------------------
+# FRAGMENTOS DO DASHBOARD (carregamento sob demanda)
+# -----------------------------
+PASTA_FRAGMENTOS = "dados"
+VERSAO_MANIFESTO = 1
+
+# fragmento -> chaves de dashboard_data.json. Chaves novas que não estiverem aqui
+# ganham um fragmento próprio com o nome da chave.
+FRAGMENTOS_DASHBOARD = {
+    "resumo": ["resumo", "ciclos"],
+    "oxidacao": ["oxidacao", "ultima_inspecao"],
+    "temporal": ["oxidacao_temporal", "mensal"],
+    "turbinas": ["turbinas"],
+    "carreiras": ["carreiras", "matriz_carreiras"],
+    "disponibilidade": ["disponibilidade"],
+    "clusters": ["clusters"],
+    "progressao": ["progressao"],
+    "proxima_inspecao": ["proxima_inspecao"],
+    "cubo_temporal": ["cubo_temporal"],
+}
+
+# Só estas seções vão para dashboard_data.json, que o frontend importa no
+# bundle; as demais existem apenas nos fragmentos e são buscadas por aba.
+SECOES_EMBUTIDAS = FRAGMENTOS_DASHBOARD["resumo"]
+
+def manter_data_atualizacao(dashboard_data, caminho_anterior):
+    """
+    Reaproveita o resumo.data_ultima_atualizacao do dashboard_data.json anterior
+    quando o resto do conteúdo não mudou: reprocessar os mesmos dados não
+    regrava o JSON, o fragmento "resumo" nem o manifesto (e o Vite não recarrega).
+    """
+    try:
+        with open(caminho_anterior, "rb") as f:
+            anterior = json.loads(f.read())
+        data_anterior = anterior["resumo"]["data_ultima_atualizacao"]
+    except (OSError, ValueError, KeyError, TypeError):
+        return dashboard_data
+    resumo = dashboard_data["resumo"]
+    atual = json.loads(json.dumps({**dashboard_embutido(dashboard_data),
+                                   "resumo": {**resumo, "data_ultima_atualizacao": data_anterior}}))
+    if atual == anterior:
+        resumo["data_ultima_atualizacao"] = data_anterior
+    return dashboard_data
+
+def dashboard_embutido(dashboard_data):
+    """As seções de SECOES_EMBUTIDAS (resumo e ciclos), gravadas em dashboard_data.json."""
+    return {chave: dashboard_data[chave] for chave in SECOES_EMBUTIDAS if chave in dashboard_data}
+
+def gravar_fragmento(pasta, nome, dados, colunar=False, compressao=()):
+    """Grava um fragmento JSON compacto (opcionalmente colunar e comprimido) e devolve sua entrada no manifesto."""
+    registros = contar_linhas(dados)
+    if colunar:
+        dados = codificar_colunar(dados)
+    conteudo = json.dumps(dados, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+    arquivo = f"{nome}.json"
+    caminho = os.path.join(pasta, arquivo)
+    gravar_atomico(caminho, conteudo)
+    entrada = {
+        "arquivo": arquivo,
+        "chaves": list(dados),
+        "bytes": len(conteudo),
+        "sha256": hashlib.sha256(conteudo).hexdigest(),
+        "registros": registros,
+    }
+    if compressao:
+        entrada["comprimidos"] = comprimir_arquivo(caminho, conteudo, compressao)
+    return entrada
+
+def salvar_fragmentos(dashboard_data, maquinas_paradas_json, pasta_saida, colunar=False, compressao=()):
+    """
+    Divide os dois JSONs do dashboard em fragmentos por seção, mais um
+    manifest.json com tamanho e hash de cada um. O frontend renderiza com o
+    dashboard_data.json do bundle (o fragmento "resumo") e busca as seções
+    pesadas sob demanda; fora do "resumo", elas só existem aqui.
+    Com `colunar`, as listas de registros são gravadas por coluna.
+    Devolve o caminho do manifesto.
+    """
+    pasta = os.path.join(pasta_saida, PASTA_FRAGMENTOS)
+    os.makedirs(pasta, exist_ok=True)
+    
+    fragmentos = dict(FRAGMENTOS_DASHBOARD)
+    cobertas = {chave for chaves in fragmentos.values() for chave in chaves}
+    fragmentos.update({chave: [chave] for chave in dashboard_data if chave not in cobertas})
+    
+    secoes = {}
+    for nome, chaves in fragmentos.items():
+        presentes = {chave: dashboard_data[chave] for chave in chaves if chave in dashboard_data}
+        if presentes:
+            secoes[nome] = {"origem": "dashboard_data.json", **gravar_fragmento(pasta, nome, presentes, colunar, compressao)}
+    
+    # Máquinas paradas: resumo por ciclo com a lista completa (inclusive paradas
+    # sem ciclo reconhecido) e um fragmento por ciclo, na ordem de maquinas_paradas
+    paradas = {chave: maquinas_paradas_json[chave] for chave in ["resumo_por_ciclo", "maquinas_paradas"]}
+    secoes["paradas"] = {
+        "origem": "maquinas_paradas.json",
+        **gravar_fragmento(pasta, "paradas", paradas, colunar, compressao),
+    }
+    for ciclo, chave in CHAVES_CICLO_PARADAS.items():
+        registros = maquinas_paradas_json["detalhes_por_ciclo"].get(chave, [])
+        secoes[f"paradas_{chave.lower()}"] = {
+            "origem": "maquinas_paradas.json",
+            "ciclo": ciclo,
+            "chave_ciclo": chave,
+            **gravar_fragmento(pasta, f"paradas_{chave.lower()}", {"maquinas_paradas": registros}, colunar, compressao),
+        }
+    
+    # Remover fragmentos de execuções anteriores que não existem mais
+    atuais = {secao["arquivo"] for secao in secoes.values()}
+    atuais |= {f"{arquivo}.{formato}" for arquivo in atuais for formato in compressao}
+    for antigo in glob.glob(os.path.join(pasta, "*.json*")):
+        # Temporários (.tmp) podem ser de outro processo gravando agora
+        if antigo.endswith(".tmp"):
+            continue
+        if os.path.basename(antigo) not in atuais | {"manifest.json"}:
+            os.remove(antigo)
+    
+    manifesto = {
+        "versao": VERSAO_MANIFESTO,
+        "formato": "colunar" if colunar else "registros",
+        "compressao": list(compressao),
+        "bytes_total": sum(secao["bytes"] for secao in secoes.values()),
+        "secoes": secoes,
+    }
+    caminho_manifesto = os.path.join(pasta, "manifest.json")
+    gravar_atomico(caminho_manifesto, json.dumps(manifesto, ensure_ascii=False, indent=2).encode("utf-8"))
+    
+    print(f"✅ {len(secoes)} fragmentos ({manifesto['bytes_total'] / 1024:.1f} KB) salvos em: {pasta}")
+    return caminho_manifesto
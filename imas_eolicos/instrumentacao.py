@@ -0,0 +1,81 @@
+"""Medição de tempo, CPU e memória das etapas."""
+
+import os
+import sys
+import time
+import tracemalloc
+
+import pandas as pd
+
+# -----------------------------
+# INSTRUMENTAÇÃO DAS ETAPAS
+# -----------------------------
+# Duas medidas de memória: o pico residente do processo (ru_maxrss), que só
+# cresce e serve para a execução como um todo, e, com `memoria=True`, o pico da
+# própria etapa (tracemalloc, só o que foi alocado durante ela, incluindo os
+# arrays do NumPy/pandas). O tracemalloc deixa a leitura da planilha mais de
+# duas vezes mais lenta, por isso fica desligado nas execuções normais.
+def pico_processo_mb():
+    """Pico de memória residente do processo desde o início (MB), ou None se indisponível."""
+    try:
+        import resource
+    except ImportError:  # Windows
+        try:
+            import psutil
+            return psutil.Process().memory_info().peak_wset / 1024 ** 2
+        except Exception:
+            return None
+    pico = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return pico / 1024 ** 2 if sys.platform == "darwin" else pico / 1024
+
+def contar_linhas(valor):
+    """Linhas de um resultado (DataFrame/lista; em dicionários, o maior conjunto). None se não se aplica."""
+    if isinstance(valor, (pd.DataFrame, pd.Series, list)):
+        return len(valor)
+    if isinstance(valor, dict):
+        contagens = [n for n in map(contar_linhas, valor.values()) if n is not None]
+        return max(contagens) if contagens else None
+    return None
+
+def medir_etapa(nome, funcao, *argumentos, memoria=False):
+    """
+    Roda uma etapa e devolve (resultado, medição) com tempo, CPU, memória e
+    linhas. O pico da etapa (pico_etapa_mb) só é medido com `memoria=True`.
+    """
+    ja_rastreando = tracemalloc.is_tracing()
+    if memoria and ja_rastreando:
+        tracemalloc.reset_peak()
+    elif memoria:
+        tracemalloc.start()
+    memoria_inicial = tracemalloc.get_traced_memory()[0] if memoria else 0
+    inicio, inicio_cpu = time.perf_counter(), time.process_time()
+    try:
+        resultado = funcao(*argumentos)
+        tempo, cpu = time.perf_counter() - inicio, time.process_time() - inicio_cpu
+        pico_etapa = tracemalloc.get_traced_memory()[1] - memoria_inicial if memoria else None
+    finally:
+        if memoria and not ja_rastreando:
+            tracemalloc.stop()
+    entradas = [n for n in map(contar_linhas, argumentos) if n is not None]
+    return resultado, {
+        "etapa": nome,
+        "funcao": funcao.__name__,
+        "tempo_s": round(tempo, 4),
+        "cpu_s": round(cpu, 4),
+        "pico_etapa_mb": None if pico_etapa is None else round(pico_etapa / 1024 ** 2, 1),
+        "pico_processo_mb": None if (pico := pico_processo_mb()) is None else round(pico, 1),
+        "linhas_entrada": sum(entradas) if entradas else None,
+        "linhas_saida": contar_linhas(resultado),
+        "processo": os.getpid(),
+    }
+
+def imprimir_medicoes(medicoes):
+    print("/n⏱️ TEMPO POR ETAPA:")
+    print(f"   {'etapa':<28}{'tempo (s)':>11}{'cpu (s)':>10}{'pico etapa (MB)':>17}{'entrada':>10}{'saída':>10}")
+    for m in medicoes:
+        colunas = [m["linhas_entrada"], m["linhas_saida"]]
+        pico, entrada, saida = ("-" if valor is None else valor for valor in [m["pico_etapa_mb"], *colunas])
+        print(f"   {m['etapa']:<28}{m['tempo_s']:>11.3f}{m['cpu_s']:>10.3f}{pico:>17}{entrada:>10}{saida:>10}")
+    picos = [m["pico_processo_mb"] for m in medicoes if m["pico_processo_mb"] is not None]
+    if picos:
+        print(f"   Pico de memória do processo: {max(picos)} MB")
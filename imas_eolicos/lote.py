@@ -0,0 +1,172 @@
+"""Processamento em lote: uma planilha por parque, com saídas por parque e consolidada."""
+
+import glob
+import io
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import redirect_stdout
+from datetime import datetime
+
+import pandas as pd
+
+from .exportacao import montar_dashboard_data, salvar_json
+from .planilhas import COLUNAS_CONTAGEM, PlanilhaInvalida, carregar_carreiras, carregar_df_clean, compactar_tipos, pasta_cache_padrao
+from .processamento import ETAPAS, executar_etapas, exportar
+
+# -----------------------------
+# LOTE DE PARQUES
+# -----------------------------
+# Cada planilha é um parque, identificado pelo nome do arquivo. Os parques são
+# carregados e analisados em processos separados; um erro numa planilha só
+# marca aquele parque como falho. Na visão consolidada as turbinas ganham o
+# prefixo do parque ("Parque/AEG01"), já que os nomes se repetem entre parques.
+PASTA_PARQUES = "parques"
+ARQUIVO_LOTE = "lote.json"
+
+def listar_planilhas(padrao):
+    """Planilhas de uma pasta (*.xlsx) ou de um padrão glob, sem os temporários do Excel (~$)."""
+    if os.path.isdir(padrao):
+        padrao = os.path.join(padrao, "*.xlsx")
+    return sorted(caminho for caminho in glob.glob(padrao) if not os.path.basename(caminho).startswith("~$"))
+
+def identificar_parques(planilhas):
+    """{parque: planilha}; o parque é o nome do arquivo, com sufixo numérico se repetido."""
+    parques = {}
+    for planilha in planilhas:
+        base = os.path.splitext(os.path.basename(planilha))[0]
+        parque, numero = base, 2
+        while parque in parques:
+            parque, numero = f"{base}_{numero}", numero + 1
+        parques[parque] = planilha
+    return parques
+
+def _analisar(df_clean, df_carreiras):
+    """Roda as etapas de análise sobre abas já carregadas e monta o dashboard."""
+    entradas = {
+        "df_clean": df_clean,
+        "df_carreiras": df_carreiras,
+        "caminho_estado": None,
+        "incremental": False,
+    }
+    resultados = executar_etapas(ETAPAS, entradas)
+    return montar_dashboard_data(resultados), resultados["maquinas_paradas_json"]
+
+def processar_parque(parque, planilha, pasta_saida, colunar=False, compressao=()):
+    """
+    Carrega e analisa a planilha de um parque e grava as saídas em
+    pasta_saida/parques/<parque>. Retorna (situacao, df_clean, df_carreiras, log);
+    em caso de erro as abas vêm como None e o erro fica em situacao.
+    """
+    inicio = time.perf_counter()
+    situacao = {"parque": parque, "planilha": os.path.abspath(planilha)}
+    saida = io.StringIO()
+    try:
+        with redirect_stdout(saida):
+            # Cache próprio por parque: planilhas na mesma pasta não disputam as entradas
+            pasta_cache = os.path.join(pasta_cache_padrao(planilha), parque)
+            df_clean = carregar_df_clean(planilha, pasta_cache)
+            df_carreiras = carregar_carreiras(planilha, pasta_cache)
+            df_clean["Parque"] = pd.Series(parque, index=df_clean.index, dtype="category")
+            df_carreiras["Parque"] = parque
+
+            dashboard_data, maquinas_paradas_json = _analisar(df_clean, df_carreiras)
+            exportar(dashboard_data, maquinas_paradas_json, os.path.join(pasta_saida, PASTA_PARQUES, parque), colunar, compressao)
+    except Exception as e:
+        situacao.update(status="erro", erro=f"{type(e).__name__}: {e}", tempo_s=round(time.perf_counter() - inicio, 3))
+        return situacao, None, None, saida.getvalue()
+
+    resumo = dashboard_data["resumo"]
+    situacao.update(
+        status="ok",
+        registros=int(resumo["total_registros"]),
+        turbinas=int(resumo["total_turbinas"]),
+        imas_trocados=float(resumo["total_imas_trocados"]),
+        tempo_s=round(time.perf_counter() - inicio, 3),
+    )
+    return situacao, df_clean, df_carreiras, saida.getvalue()
+
+def _prefixar_turbinas(df, parque):
+    """Cópia de `df` com Turbina no formato 'Parque/Turbina' (vazios continuam vazios)."""
+    df = df.copy()
+    if "Turbina" in df.columns:
+        turbina = df["Turbina"].astype(object)
+        df["Turbina"] = turbina.where(turbina.isna(), parque + "/" + turbina.astype(str).str.strip())
+    return df
+
+def consolidar_abas(partes):
+    """
+    Junta as abas de vários parques ({parque: DataFrame}) num só DataFrame,
+    com turbinas prefixadas pelo parque e os tipos compactos restaurados.
+    """
+    partes = [_prefixar_turbinas(df, parque) for parque, df in partes.items() if len(df)]
+    if not partes:
+        return pd.DataFrame()
+    df = pd.concat(partes, ignore_index=True)
+    for col in COLUNAS_CONTAGEM:
+        if col in df.columns:
+            df[col] = df[col].fillna(0)
+    return compactar_tipos(df)
+
+def processar_lote(padrao, pasta_saida, workers=1, colunar=False, compressao=()):
+    """
+    Processa todas as planilhas de `padrao` (pasta ou glob): grava as saídas de
+    cada parque em pasta_saida/parques/<parque>, o dashboard consolidado em
+    pasta_saida e o relatório do lote (lote.json). Retorna o relatório.
+    """
+    inicio = datetime.now()
+    parques = identificar_parques(listar_planilhas(padrao))
+    if not parques:
+        raise PlanilhaInvalida(f"Nenhuma planilha encontrada em: {padrao}")
+
+    print(f"🏭 LOTE COM {len(parques)} PARQUES: {', '.join(parques)}")
+    argumentos = [(parque, planilha, pasta_saida, colunar, compressao) for parque, planilha in parques.items()]
+    if workers <= 1:
+        retornos = [processar_parque(*args) for args in argumentos]
+    else:
+        with ProcessPoolExecutor(max_workers=min(workers, len(parques))) as pool:
+            futuros = [pool.submit(processar_parque, *args) for args in argumentos]
+            retornos = [futuro.result() for futuro in futuros]
+
+    situacoes = []
+    abas_clean = {}
+    abas_carreiras = {}
+    for situacao, df_clean, df_carreiras, log in retornos:
+        print(log, end="")
+        situacoes.append(situacao)
+        if situacao["status"] == "ok":
+            abas_clean[situacao["parque"]] = df_clean
+            abas_carreiras[situacao["parque"]] = df_carreiras
+            print(f"✅ Parque {situacao['parque']}: {situacao['registros']} registros, {situacao['turbinas']} turbinas ({situacao['tempo_s']:.2f} s)")
+        else:
+            print(f"❌ Parque {situacao['parque']}: {situacao['erro']}")
+
+    # -----------------------------
+    # VISÃO CONSOLIDADA
+    # -----------------------------
+    if abas_clean:
+        print(f"/n🌐 CONSOLIDANDO {len(abas_clean)} PARQUES...")
+        dashboard_data, maquinas_paradas_json = _analisar(consolidar_abas(abas_clean), consolidar_abas(abas_carreiras))
+        dashboard_data["parques"] = [
+            {
+                "Parque": situacao["parque"],
+                "Registros": situacao["registros"],
+                "Turbinas": situacao["turbinas"],
+                "Imas_Trocados": situacao["imas_trocados"],
+            }
+            for situacao in situacoes if situacao["status"] == "ok"
+        ]
+        exportar(dashboard_data, maquinas_paradas_json, pasta_saida, colunar, compressao)
+
+    relatorio = {
+        "inicio": inicio.strftime("%Y-%m-%d %H:%M:%S"),
+        "fim": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+        "origem": padrao,
+        "tempo_total_s": round((datetime.now() - inicio).total_seconds(), 3),
+        "parques_ok": len(abas_clean),
+        "parques_com_erro": len(situacoes) - len(abas_clean),
+        "consolidado": bool(abas_clean),
+        "parques": situacoes,
+    }
+    salvar_json(relatorio, ARQUIVO_LOTE, pasta_saida)
+    return relatorio
@@ -0,0 +1,104 @@
+"""Modo observação: regenera os JSONs do dashboard quando a planilha muda."""
+
+import os
+import time
+
+import numpy as np
+
+from .agregacao import ARQUIVO_ESTADO, hash_linhas
+from .exportacao import montar_dashboard_data
+from .planilhas import pasta_cache_padrao
+from .processamento import ETAPAS, executar_etapas, exportar
+
+# -----------------------------
+# OBSERVAÇÃO DA PLANILHA
+# -----------------------------
+# A planilha é verificada por polling (tamanho + data de modificação), sem
+# dependências extras. Como o Excel grava em várias etapas, o processamento só
+# começa depois de `espera` segundos sem novas mudanças. Entre uma atualização
+# e outra ficam em memória as abas tratadas, o resultado de cada etapa e o
+# estado incremental: só as etapas afetadas pela alteração rodam de novo.
+ETAPAS_LEITURA = ("df_clean", "df_carreiras")
+
+def assinatura_arquivo(caminho):
+    """(tamanho, mtime) do arquivo, ou None se ele não existir no momento."""
+    try:
+        info = os.stat(caminho)
+    except OSError:
+        return None
+    return info.st_size, info.st_mtime_ns
+
+def mesmo_conteudo(df, anterior):
+    """
+    Mesmas colunas e mesmas linhas. Compara hashes de linha, e não `equals`,
+    porque a aba lida do cache pode vir com dtypes de texto diferentes.
+    """
+    return (
+        anterior is not None
+        and list(df.columns) == list(anterior.columns)
+        and np.array_equal(hash_linhas(df), hash_linhas(anterior))
+    )
+
+def etapas_inalteradas(etapas, entradas, anteriores):
+    """
+    Resultados da atualização anterior que podem ser reaproveitados: os das
+    etapas cujas dependências são exatamente os mesmos objetos de antes.
+    """
+    disponiveis = dict(entradas)
+    reaproveitados = {}
+    for nome, (_, dependencias) in etapas.items():
+        if nome in disponiveis or nome not in anteriores:
+            continue
+        if all(d in disponiveis and disponiveis[d] is anteriores.get(d) for d in dependencias):
+            reaproveitados[nome] = disponiveis[nome] = anteriores[nome]
+    return reaproveitados
+
+def atualizar(entradas, anteriores, pasta_saida, workers=1, colunar=False, compressao=()):
+    """Relê a planilha, recalcula as etapas afetadas e grava os JSONs. Retorna os resultados de todas as etapas."""
+    inicio = time.perf_counter()
+
+    leitura = executar_etapas({nome: ETAPAS[nome] for nome in ETAPAS_LEITURA}, entradas, workers)
+    atuais = dict(entradas)
+    for nome in ETAPAS_LEITURA:
+        # Aba sem alterações: manter o objeto anterior libera as etapas que dependem dela
+        atuais[nome] = anteriores[nome] if mesmo_conteudo(leitura[nome], anteriores.get(nome)) else leitura[nome]
+
+    reaproveitados = etapas_inalteradas(ETAPAS, atuais, anteriores)
+    atuais.update(reaproveitados)
+    resultados = executar_etapas(ETAPAS, atuais, workers)
+
+    exportar(montar_dashboard_data(resultados), resultados["maquinas_paradas_json"], pasta_saida, colunar, compressao)
+    print(f"🔄 Dashboard atualizado em {time.perf_counter() - inicio:.2f} s "
+          f"({len(reaproveitados)} de {len(ETAPAS) - len(ETAPAS_LEITURA)} etapas reaproveitadas)")
+    return resultados
+
+def observar(arquivo_excel, pasta_saida, intervalo=0.5, espera=0.5, workers=1, colunar=False, compressao=()):
+    """
+    Processa a planilha e continua observando: a cada gravação (depois de
+    `espera` segundos sem mudanças) os JSONs são regenerados. Encerra com Ctrl+C.
+    """
+    entradas = {
+        "arquivo_excel": arquivo_excel,
+        "caminho_estado": os.path.join(pasta_cache_padrao(arquivo_excel), ARQUIVO_ESTADO),
+        "incremental": True,
+    }
+    anteriores = {}
+    processada = None
+    vista, desde = assinatura_arquivo(arquivo_excel), time.monotonic() - espera
+
+    print(f"👀 Observando {arquivo_excel} (Ctrl+C para encerrar)")
+    try:
+        while True:
+            atual = assinatura_arquivo(arquivo_excel)
+            if atual != vista:
+                vista, desde = atual, time.monotonic()
+            elif atual is not None and atual != processada and time.monotonic() - desde >= espera:
+                try:
+                    anteriores = atualizar(entradas, anteriores, pasta_saida, workers, colunar, compressao)
+                except Exception as e:
+                    # Planilha ainda sendo gravada ou inválida: tentar de novo na próxima gravação
+                    print(f"❌ Erro ao processar a planilha: {e}")
+                processada = atual
+            time.sleep(intervalo)
+    except KeyboardInterrupt:
+        print("/n👋 Observação encerrada")
@@ -0,0 +1,89 @@
+"""Classificação vetorizada de oxidação e criticidade."""
+
+import numpy as np
+import pandas as pd
+
+# -----------------------------
+# Classificação vetorizada de oxidação (DOWNWIND/UPWIND)
+# -----------------------------
+NIVEIS_OXIDACAO = ['sem_oxidacao', 'baixa', 'media', 'alta', 'troca_spindle', 'invalido']
+NIVEIS_CRITICIDADE = ['baixa', 'media', 'alta']
+
+# Ordem de precedência: primeiro os termos oficiais da planilha, depois sinônimos
+REGRAS_OXIDACAO = [
+    (('ALTO',), 'alta'),
+    (('MÉDIO', 'MEDIO'), 'media'),
+    (('BAIXO',), 'baixa'),
+    (('ALTA', 'HIGH'), 'alta'),
+    (('MÉDIA', 'MEDIA', 'MEDIUM'), 'media'),
+    (('BAIXA', 'LOW'), 'baixa'),
+]
+
+def nivel_oxidacao(downwind, upwind):
+    """
+    Classifica o nível de oxidação de um par DOWNWIND/UPWIND já normalizado
+    (strip + upper), considerando o pior cenário entre os dois lados.
+    Retorna: 'baixa', 'media', 'alta', 'troca_spindle', 'sem_oxidacao' ou 'invalido'
+    """
+    texto_completo = f"{downwind} {upwind}".strip()
+    texto_limpo = texto_completo.replace('-', '').replace(' ', '').replace('.', '')
+
+    if not texto_limpo:
+        return 'sem_oxidacao'
+    if 'TROCADESPINDLE' in texto_limpo:
+        return 'troca_spindle'
+    for palavras, nivel in REGRAS_OXIDACAO:
+        if any(palavra in texto_completo for palavra in palavras):
+            return nivel
+    return 'invalido'
+
+def nivel_criticidade(downwind, upwind):
+    """
+    Classifica a criticidade de um par DOWNWIND/UPWIND já normalizado.
+    Retorna: 'baixa', 'media', 'alta' ou None quando os dois lados estão vazios
+    """
+    if downwind == 'ALTO' and upwind == 'ALTO':
+        return 'alta'
+    if downwind == 'ALTO' or upwind == 'ALTO':
+        return 'media'
+    if downwind == 'BAIXO' or upwind == 'BAIXO':
+        return 'baixa'
+    # Se não classificado, considerar médio por padrão
+    if downwind or upwind:
+        return 'media'
+    return None
+
+def _codificar_lado(serie):
+    """Fatoriza uma coluna DOWNWIND/UPWIND e normaliza apenas os valores distintos."""
+    codigos, valores = pd.factorize(serie)
+    textos = [str(valor).strip().upper() for valor in valores]
+    textos.append('')  # posição usada pelos valores nulos (código -1)
+    codigos = np.where(codigos < 0, len(textos) - 1, codigos)
+    return codigos, textos
+
+def classificar_oxidacao_vetorizada(df):
+    """
+    Adiciona as colunas categóricas 'Oxidacao_Nivel' e 'Criticidade' ao DataFrame.
+
+    A classificação é feita uma única vez por combinação distinta de
+    DOWNWIND/UPWIND e depois propagada para todas as linhas pelos códigos.
+    """
+    codigos_dw, textos_dw = _codificar_lado(df['DOWNWIND'])
+    codigos_up, textos_up = _codificar_lado(df['UPWIND'])
+
+    pares = codigos_dw * len(textos_up) + codigos_up
+    pares_unicos, inverso = np.unique(pares, return_inverse=True)
+
+    codigos_nivel = np.empty(len(pares_unicos), dtype=np.int8)
+    codigos_crit = np.empty(len(pares_unicos), dtype=np.int8)
+    for i, par in enumerate(pares_unicos):
+        downwind = textos_dw[par // len(textos_up)]
+        upwind = textos_up[par % len(textos_up)]
+        codigos_nivel[i] = NIVEIS_OXIDACAO.index(nivel_oxidacao(downwind, upwind))
+        criticidade = nivel_criticidade(downwind, upwind)
+        codigos_crit[i] = NIVEIS_CRITICIDADE.index(criticidade) if criticidade else -1
+
+    inverso = inverso.reshape(-1)
+    df['Oxidacao_Nivel'] = pd.Categorical.from_codes(codigos_nivel[inverso], categories=NIVEIS_OXIDACAO)
+    df['Criticidade'] = pd.Categorical.from_codes(codigos_crit[inverso], categories=NIVEIS_CRITICIDADE)
+    return df
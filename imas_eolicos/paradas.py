@@ -0,0 +1,259 @@
+"""Máquinas paradas por ciclo e disponibilidade da frota."""
+
+import numpy as np
+import pandas as pd
+
+from .agregacao import mascara_maquinas_paradas
+from .configuracao import CICLOS_ANALISE
+
+# -----------------------------
+# ETAPA: ANÁLISE DE MÁQUINAS PARADAS POR CICLO
+# -----------------------------
+# Dias de parada estimados por ciclo quando não há data de retorno (padrões históricos)
+DIAS_PARADA_ESTIMADOS = {
+    'Primeiro Ciclo': 120,
+    'Segundo Ciclo': 90,
+    'Terceiro Ciclo': 75,
+    'Troca de Spindle': 60
+}
+DIAS_PARADA_PADRAO = 30
+
+# Chave de cada ciclo em resumo_por_ciclo / detalhes_por_ciclo (usadas pelo frontend)
+CHAVES_CICLO_PARADAS = {
+    'Primeiro Ciclo': 'primeiro_ciclo',
+    'Segundo Ciclo': 'segundo_ciclo',
+    'Terceiro Ciclo': 'terceiro_ciclo',
+    'Quarto Ciclo': 'Quarto_ciclo',
+    'Troca de Spindle': 'troca_spindle'
+}
+
+POSSIVEIS_NOMES_SUBSTITUICAO = ['datasubstituicao', 'data_retorno', 'data_fim_parada', 'data_substituição']
+
+# De onde vieram os dias de cada parada (Fonte_dias)
+FONTE_PLANILHA = 'planilha'
+FONTE_SUBSTITUICAO = 'data_substituicao'
+FONTE_ESTIMADO = 'estimado'
+FONTE_SEM_DATA = 'sem_data'
+FONTES_DIAS = [FONTE_PLANILHA, FONTE_SUBSTITUICAO, FONTE_ESTIMADO, FONTE_SEM_DATA]
+
+def intervalos_parada(df_clean, coluna_substituicao=None, coluna_dias=None):
+    """
+    Intervalos de parada (Data_parada → Data_retorno) das máquinas paradas
+    dos CICLOS_ANALISE, em ordem de ciclo e, dentro do ciclo, na ordem da planilha.
+    
+    Com coluna_dias, os dias informados na planilha (> 0) definem o retorno;
+    senão vale a data de substituição e, sem ela, DIAS_PARADA_ESTIMADOS.
+    Fonte_dias diz qual dos três foi usado ('sem_data' sem data de parada).
+    Dias_parada tem mínimo de 1 dia, e 0 quando alguma das datas é desconhecida.
+    """
+    ciclos = df_clean["Ciclo_inspecao"]
+    paradas = df_clean.loc[ciclos.isin(CICLOS_ANALISE) & mascara_maquinas_paradas(df_clean["Status"])]
+    ordem_ciclo = paradas["Ciclo_inspecao"].astype(object).map({c: i for i, c in enumerate(CICLOS_ANALISE)})
+    paradas = paradas.iloc[np.argsort(ordem_ciclo.to_numpy(), kind="stable")]
+    
+    ciclo = paradas["Ciclo_inspecao"].astype(object)
+    data_parada = pd.to_datetime(paradas["Data_inspecao"], errors='coerce')
+    dias_estimados = ciclo.map(DIAS_PARADA_ESTIMADOS).fillna(DIAS_PARADA_PADRAO)
+    data_retorno = data_parada + pd.to_timedelta(dias_estimados, unit='D')
+    fonte = pd.Series(FONTE_ESTIMADO, index=paradas.index, dtype=object)
+    if coluna_substituicao:
+        substituicao = pd.to_datetime(paradas[coluna_substituicao], errors='coerce')
+        data_retorno = substituicao.fillna(data_retorno)
+        fonte = fonte.mask(substituicao.notna(), FONTE_SUBSTITUICAO)
+    if coluna_dias:
+        dias_planilha = pd.to_numeric(paradas[coluna_dias], errors='coerce')
+        informados = dias_planilha > 0
+        data_retorno = data_retorno.mask(informados, data_parada + pd.to_timedelta(dias_planilha.where(informados), unit='D'))
+        fonte = fonte.mask(informados, FONTE_PLANILHA)
+    fonte = fonte.mask(data_parada.isna(), FONTE_SEM_DATA)
+    
+    conhecidas = data_parada.notna() & data_retorno.notna()
+    dias_parada = (data_retorno - data_parada).dt.days.clip(lower=1).where(conhecidas, 0).astype('int64')
+    
+    return pd.DataFrame({
+        "Ciclo": ciclo,
+        "Turbina": paradas["Turbina"].astype(object),
+        "Status": paradas["Status"].astype(object),
+        "Data_parada": data_parada,
+        "Data_retorno": data_retorno,
+        "Dias_parada": dias_parada,
+        "Fonte_dias": fonte,
+    }).reset_index(drop=True)
+
+def analisar_maquinas_paradas(df_clean):
+    print("/n📊 INICIANDO ANÁLISE DE MÁQUINAS PARADAS POR CICLO...")
+    
+    # Verificar qual coluna de data de substituição existe
+    coluna_substituicao_encontrada = next((nome for nome in POSSIVEIS_NOMES_SUBSTITUICAO if nome in df_clean.columns), None)
+    
+    if coluna_substituicao_encontrada:
+        print(f"✅ Coluna de data de substituição encontrada: {coluna_substituicao_encontrada}")
+    else:
+        print("⚠️ Coluna de data de substituição não encontrada, usando data de inspeção como fallback")
+    
+    colunas_formatadas = ["Data da Parada", "Tag da Turbina", "Data de Retorno", "Dias Parada", "Ciclo", "Status"]
+    
+    # Verificar se temos as colunas mínimas necessárias
+    if all(col in df_clean.columns for col in ['Data_inspecao', 'Turbina', 'Ciclo_inspecao', 'Status']):
+        print("✅ Colunas necessárias encontradas para análise de máquinas paradas")
+        
+        coluna_dias = "Dias_parada" if "Dias_parada" in df_clean.columns else None
+        intervalos = intervalos_parada(df_clean, coluna_substituicao_encontrada, coluna_dias)
+        por_ciclo = intervalos["Ciclo"].value_counts()
+        for ciclo in CICLOS_ANALISE:
+            print(f"/n🔍 Processando ciclo: {ciclo}")
+            print(f"   📋 Máquinas paradas identificadas: {por_ciclo.get(ciclo, 0)}")
+        
+        print(f"/n✅ Análise concluída - {len(intervalos)} registros de máquinas paradas processados")
+        
+        # Formatar datas para o padrão brasileiro, coluna inteira de uma vez
+        formatadas = pd.DataFrame({
+            "Data da Parada": intervalos["Data_parada"].dt.strftime("%d/%m/%Y").fillna("N/A"),
+            "Tag da Turbina": intervalos["Turbina"],
+            "Data de Retorno": intervalos["Data_retorno"].dt.strftime("%d/%m/%Y").fillna("N/A"),
+            "Dias Parada": intervalos["Dias_parada"],
+            "Ciclo": intervalos["Ciclo"],
+            "Status": intervalos["Status"],
+        }, columns=colunas_formatadas)
+    else:
+        print("❌ Colunas necessárias não encontradas para análise de máquinas paradas")
+        formatadas = pd.DataFrame(columns=colunas_formatadas)
+    
+    # -----------------------------
+    # FORMATAR DADOS NO PADRÃO SOLICITADO
+    # -----------------------------
+    print("/n💾 PREPARANDO DADOS PARA JSON...")
+    
+    maquinas_paradas_formatadas = formatadas.to_dict("records")
+    
+    # Agrupar por ciclo para organização (um único groupby)
+    maquinas_por_ciclo = {chave: [] for chave in CHAVES_CICLO_PARADAS.values()}
+    for ciclo, grupo in formatadas.groupby("Ciclo", sort=False):
+        if ciclo in CHAVES_CICLO_PARADAS:
+            maquinas_por_ciclo[CHAVES_CICLO_PARADAS[ciclo]] = grupo.to_dict("records")
+    
+    # Criar estrutura final do JSON
+    maquinas_paradas_json = {
+        "maquinas_paradas": maquinas_paradas_formatadas,
+        "resumo_por_ciclo": {
+            **{chave: len(registros) for chave, registros in maquinas_por_ciclo.items()},
+            "total_geral": len(maquinas_paradas_formatadas)
+        },
+        "detalhes_por_ciclo": maquinas_por_ciclo
+    }
+    
+    # -----------------------------
+    # RELATÓRIO DE MÁQUINAS PARADAS
+    # -----------------------------
+    print("/n" + "="*60)
+    print("📋 RELATÓRIO DE MÁQUINAS PARADAS POR CICLO")
+    print("="*60)
+    
+    por_ciclo = formatadas["Ciclo"].value_counts()
+    for ciclo in CICLOS_ANALISE:
+        print(f"📊 {ciclo}: {por_ciclo.get(ciclo, 0)} máquinas paradas")
+    
+    print(f"/n📈 Total Geral: {len(maquinas_paradas_formatadas)} máquinas paradas")
+    
+    # Mostrar exemplos
+    if maquinas_paradas_formatadas:
+        print("/n🔍 EXEMPLOS DE REGISTROS:")
+        for i, exemplo in enumerate(maquinas_paradas_formatadas[:3], 1):
+            print(f"  {i}. {exemplo['Data da Parada']} | {exemplo['Tag da Turbina']} | {exemplo['Data de Retorno']} | {exemplo['Dias Parada']} dias")
+    
+    print("="*60)
+    
+    return maquinas_paradas_json
+
+# -----------------------------
+# ETAPA: INTERVALOS DE PARADA E DISPONIBILIDADE DA FROTA
+# -----------------------------
+def mesclar_intervalos(intervalos):
+    """
+    Une, por turbina, paradas sobrepostas, repetidas ou encostadas.
+    
+    Cada parada cobre os dias [Inicio, Fim), com Fim = Inicio + Dias_parada.
+    Paradas sem turbina ou com datas desconhecidas (Dias_parada 0) ficam de fora.
+    """
+    validos = intervalos[(intervalos["Dias_parada"] > 0) & intervalos["Turbina"].notna()]
+    inicio = validos["Data_parada"].dt.normalize()
+    paradas = pd.DataFrame({
+        "Turbina": validos["Turbina"],
+        "Inicio": inicio,
+        "Fim": inicio + pd.to_timedelta(validos["Dias_parada"], unit='D'),
+    }).sort_values(["Turbina", "Inicio"], kind="stable")
+    
+    # Uma parada abre um novo intervalo quando começa depois do maior fim anterior da mesma turbina
+    fim_anterior = paradas.groupby("Turbina")["Fim"].cummax().groupby(paradas["Turbina"]).shift()
+    grupo = (~(paradas["Inicio"] <= fim_anterior)).cumsum()
+    
+    mescladas = paradas.groupby(grupo).agg(Turbina=("Turbina", "first"), Inicio=("Inicio", "min"), Fim=("Fim", "max"))
+    return mescladas.reset_index(drop=True)
+
+def paradas_simultaneas(mescladas):
+    """
+    Máquinas paradas ao mesmo tempo, por varredura dos extremos ordenados
+    (+1 no início, -1 no fim). Devolve só os dias em que a contagem muda;
+    cada valor vale até a data seguinte.
+    """
+    eventos = pd.concat([
+        pd.Series(1, index=mescladas["Inicio"].to_numpy()),
+        pd.Series(-1, index=mescladas["Fim"].to_numpy()),
+    ])
+    variacao = eventos.groupby(level=0).sum()
+    simultaneas = variacao.cumsum()
+    return simultaneas[variacao != 0].astype('int64')
+
+def analisar_disponibilidade(df_paradas, agregacao):
+    print("/n📉 CALCULANDO DISPONIBILIDADE DA FROTA...")
+    
+    total_turbinas = len(agregacao["turbina"])
+    coluna_substituicao = next((nome for nome in POSSIVEIS_NOMES_SUBSTITUICAO if nome in df_paradas.columns), None)
+    # Mesmos intervalos da tabela de paradas: dias da planilha quando preenchidos
+    coluna_dias = "Dias_parada" if "Dias_parada" in df_paradas.columns else None
+    intervalos = intervalos_parada(df_paradas, coluna_substituicao, coluna_dias)
+    mescladas = mesclar_intervalos(intervalos)
+    simultaneas = paradas_simultaneas(mescladas)
+    
+    def disponibilidade(paradas):
+        return round(100 * (1 - paradas / total_turbinas), 2) if total_turbinas else 0.0
+    
+    por_fonte = intervalos["Fonte_dias"].value_counts()
+    dias_mesclados = int((mescladas["Fim"] - mescladas["Inicio"]).dt.days.sum())
+    resumo = {
+        "Total_Turbinas": total_turbinas,
+        "Paradas_Registradas": len(intervalos),
+        "Paradas_Mescladas": len(mescladas),
+        "Dias_Parada_Registrados": int(intervalos["Dias_parada"].sum()),
+        "Dias_Parada_Mesclados": dias_mesclados,
+        "Paradas_Por_Fonte_Dias": {fonte: int(por_fonte.get(fonte, 0)) for fonte in FONTES_DIAS},
+        "Pico_Maquinas_Paradas": 0,
+        "Inicio_Pico": None,
+        "Fim_Pico": None,
+        "Disponibilidade_Media": 100.0 if total_turbinas else 0.0,
+    }
+    
+    if len(simultaneas):
+        pico = simultaneas.idxmax()
+        posterior = simultaneas.index[simultaneas.index > pico]
+        dias_janela = (simultaneas.index[-1] - simultaneas.index[0]).days
+        resumo.update({
+            "Pico_Maquinas_Paradas": int(simultaneas[pico]),
+            "Inicio_Pico": pico.strftime("%Y-%m-%d"),
+            "Fim_Pico": posterior[0].strftime("%Y-%m-%d") if len(posterior) else None,
+            "Disponibilidade_Media": disponibilidade(dias_mesclados / dias_janela) if dias_janela else resumo["Disponibilidade_Media"],
+        })
+    
+    print(f"   🔗 {resumo['Paradas_Registradas']} paradas → {resumo['Paradas_Mescladas']} após mesclar sobreposições")
+    print(f"   📆 Dias de parada: {resumo['Dias_Parada_Registrados']} registrados, {resumo['Dias_Parada_Mesclados']} efetivos")
+    print(f"   🗂️ Origem dos dias de parada: {resumo['Paradas_Por_Fonte_Dias']}")
+    print(f"   🔺 Pico: {resumo['Pico_Maquinas_Paradas']} máquinas paradas ao mesmo tempo a partir de {resumo['Inicio_Pico']}")
+    print(f"   ✅ Disponibilidade média no período: {resumo['Disponibilidade_Media']}%")
+    
+    return {
+        "resumo": resumo,
+        "serie_diaria": [
+            {"Data": data.strftime("%Y-%m-%d"), "Maquinas_Paradas": int(paradas), "Disponibilidade": disponibilidade(paradas)}
+            for data, paradas in simultaneas.items()
+        ],
+    }
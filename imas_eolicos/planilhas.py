@@ -0,0 +1,346 @@
+"""Leitura, preparação e cache das abas Dados_Brutos e Carreiras_Vertical."""
+
+import glob
+import hashlib
+import os
+from functools import lru_cache
+
+import numpy as np
+import pandas as pd
+
+from .colunas import ESQUEMA_CARREIRAS, ESQUEMA_DADOS_BRUTOS, mapear_colunas
+from .oxidacao import classificar_oxidacao_vetorizada
+
+class PlanilhaInvalida(ValueError):
+    """Planilha sem as colunas essenciais ou sem dados para processar."""
+
+# -----------------------------
+# Preparação das abas (mapeamento de colunas + conversão de tipos)
+# -----------------------------
+def normalizar_textos(df):
+    """Converte colunas de texto com tipos mistos (ex.: '-' e números) para str."""
+    for col in df.columns:
+        if df[col].dtype == object:
+            df[col] = df[col].where(df[col].isna(), df[col].astype(str))
+    return df
+
+# Colunas de texto com poucos valores distintos (viram 'category') e contagens
+# que cabem em inteiros pequenos
+COLUNAS_CATEGORICAS = ['Turbina', 'Ciclo_inspecao', 'Status', 'Cluster', 'DOWNWIND', 'UPWIND', 'Parque']
+COLUNAS_CONTAGEM = ['Qtd_Imas_trocados', 'Dias_parada']
+
+def memoria_mb(df):
+    """Memória ocupada pelo DataFrame em MB (incluindo strings)."""
+    return df.memory_usage(deep=True).sum() / 1024 ** 2
+
+def compactar_tipos(df):
+    """
+    Converte as colunas de texto de baixa cardinalidade para 'category' e as
+    contagens para o menor tipo inteiro que as comporta (contagens com casas
+    decimais continuam float64).
+    """
+    for col in COLUNAS_CATEGORICAS:
+        if col in df.columns and not isinstance(df[col].dtype, pd.CategoricalDtype):
+            df[col] = df[col].astype('category')
+    for col in COLUNAS_CONTAGEM:
+        if col in df.columns:
+            df[col] = pd.to_numeric(df[col], downcast='integer')
+    return df
+
+def mapear_dados_brutos(df, pasta_cache=None):
+    """Identifica as colunas da aba Dados_Brutos (PlanilhaInvalida se faltar alguma essencial)."""
+    mapeamento_colunas = mapear_colunas(df.columns, ESQUEMA_DADOS_BRUTOS, pasta_cache)
+
+    print("/n🔍 MAPEAMENTO DE COLUNAS IDENTIFICADAS:")
+    for chave, valor in mapeamento_colunas.items():
+        print(f"  {chave}: {valor}")
+
+    # Verificar colunas essenciais
+    colunas_essenciais = ['data_inspecao', 'turbina', 'qtd_imas_trocados']
+    colunas_faltantes = [chave for chave in colunas_essenciais if mapeamento_colunas[chave] is None]
+
+    if colunas_faltantes:
+        print(f"/n❌ COLUNAS ESSENCIAIS FALTANTES: {colunas_faltantes}")
+        print("📋 Colunas disponíveis:")
+        for col in df.columns:
+            print(f"  - {col}")
+        raise PlanilhaInvalida(f"Colunas essenciais faltantes na aba Dados_Brutos: {colunas_faltantes}")
+
+    return mapeamento_colunas
+
+def preparar_dados_brutos(df, mapeamento_colunas=None, pasta_cache=None):
+    """
+    Mapeia, padroniza e converte os tipos da aba Dados_Brutos.
+
+    Na leitura em blocos, o mapeamento do primeiro bloco é reaproveitado
+    nos seguintes.
+    """
+    primeiro_bloco = mapeamento_colunas is None
+    if primeiro_bloco:
+        mapeamento_colunas = mapear_dados_brutos(df, pasta_cache)
+
+    # -----------------------------
+    # Padronizar nomes de colunas no DataFrame
+    # -----------------------------
+    df_clean = df.rename(columns={
+        mapeamento_colunas['data_inspecao']: 'Data_inspecao',
+        mapeamento_colunas['turbina']: 'Turbina',
+        mapeamento_colunas['qtd_imas_trocados']: 'Qtd_Imas_trocados',
+        mapeamento_colunas['ciclo_inspecao']: 'Ciclo_inspecao',
+        mapeamento_colunas['status']: 'Status',
+        mapeamento_colunas['os']: 'OS',
+        mapeamento_colunas['cluster']: 'Cluster',
+        mapeamento_colunas['observacao']: 'Observacao',
+        mapeamento_colunas['dias_parada']: 'Dias_parada',
+        mapeamento_colunas['downwind']: 'DOWNWIND',
+        mapeamento_colunas['upwind']: 'UPWIND'
+    })
+
+    # Manter apenas colunas que existem
+    colunas_finais = []
+    for col in ['Data_inspecao', 'Turbina', 'Qtd_Imas_trocados', 'Ciclo_inspecao', 'Status', 'OS', 'Cluster', 'Observacao', 'Dias_parada', 'DOWNWIND', 'UPWIND']:
+        if col in df_clean.columns:
+            colunas_finais.append(col)
+
+    df_clean = df_clean[colunas_finais].copy()
+
+    if primeiro_bloco:
+        print(f"/n✅ DataFrame limpo: {df_clean.shape[1]} colunas")
+
+    # -----------------------------
+    # Limpeza e preparação dos dados
+    # -----------------------------
+    df_clean["Data_inspecao"] = pd.to_datetime(df_clean["Data_inspecao"], errors='coerce')
+    df_clean["Qtd_Imas_trocados"] = pd.to_numeric(df_clean["Qtd_Imas_trocados"], errors='coerce').fillna(0)
+
+    if 'Dias_parada' in df_clean.columns:
+        df_clean["Dias_parada"] = pd.to_numeric(df_clean["Dias_parada"], errors='coerce').fillna(0)
+
+    if 'Ciclo_inspecao' in df_clean.columns:
+        df_clean["Ciclo_inspecao"] = df_clean["Ciclo_inspecao"].fillna("Não Especificado")
+    if 'Status' in df_clean.columns:
+        df_clean["Status"] = df_clean["Status"].fillna("Não Informado")
+    if 'Observacao' in df_clean.columns:
+        df_clean["Observacao"] = df_clean["Observacao"].fillna("")
+
+    df_clean = normalizar_textos(df_clean)
+    
+    # -----------------------------
+    # Tipos compactos (category + inteiros pequenos)
+    # -----------------------------
+    memoria_antes = memoria_mb(df_clean)
+    df_clean = compactar_tipos(df_clean)
+    if primeiro_bloco:
+        print(f"🗜️ Memória do DataFrame: {memoria_antes:.2f} MB → {memoria_mb(df_clean):.2f} MB")
+
+    return df_clean
+
+def preparar_carreiras(df_carreiras, pasta_cache=None):
+    """Mapeia e padroniza as colunas da aba Carreiras_Vertical."""
+    # Identificar colunas automaticamente na aba Carreiras_Vertical
+    mapeamento_carreiras = mapear_colunas(df_carreiras.columns, ESQUEMA_CARREIRAS, pasta_cache)
+
+    print(f"📍 Mapeamento Carreiras_Vertical:")
+    for chave, valor in mapeamento_carreiras.items():
+        print(f"  {chave}: {valor}")
+
+    nomes_padrao = {
+        'turbina': 'Turbina',
+        'carreira': 'Carreira',
+        'qtd_imas': 'Qtd_Imas',
+        'data_inspecao': 'Data_inspecao',
+        'os': 'OS',
+        'ciclo': 'Ciclo',
+        'status': 'Status'
+    }
+    colunas = {coluna: nomes_padrao[chave] for chave, coluna in mapeamento_carreiras.items() if coluna is not None}
+    df_carreiras = df_carreiras[list(colunas)].rename(columns=colunas)
+
+    if 'Qtd_Imas' in df_carreiras.columns:
+        df_carreiras['Qtd_Imas'] = pd.to_numeric(df_carreiras['Qtd_Imas'], errors='coerce')
+    if 'Data_inspecao' in df_carreiras.columns:
+        df_carreiras['Data_inspecao'] = pd.to_datetime(df_carreiras['Data_inspecao'], errors='coerce')
+
+    return normalizar_textos(df_carreiras)
+
+# -----------------------------
+# Cache colunar das abas preparadas
+# -----------------------------
+# A chave do cache é o hash do conteúdo da planilha + nome da aba; qualquer
+# alteração no arquivo invalida as entradas anteriores daquela aba.
+PASTA_CACHE = ".cache_planilhas"
+VERSAO_CACHE = 3  # incrementar sempre que a preparação das abas mudar
+
+try:
+    import pyarrow  # noqa: F401
+    FORMATO_CACHE = "parquet"
+except ImportError:
+    FORMATO_CACHE = "pkl"
+
+@lru_cache(maxsize=None)
+def _hash_conteudo(caminho, tamanho, modificado_ns):
+    hash_arquivo = hashlib.sha256()
+    with open(caminho, "rb") as f:
+        for bloco in iter(lambda: f.read(1 << 20), b""):
+            hash_arquivo.update(bloco)
+    return hash_arquivo.hexdigest()
+
+def hash_planilha(caminho):
+    """Hash do conteúdo da planilha (recalculado só se tamanho/mtime mudarem)."""
+    info = os.stat(caminho)
+    return _hash_conteudo(os.path.abspath(caminho), info.st_size, info.st_mtime_ns)
+
+def pasta_cache_padrao(caminho):
+    """Pasta de cache ao lado da planilha."""
+    return os.path.join(os.path.dirname(os.path.abspath(caminho)), PASTA_CACHE)
+
+def carregar_aba(caminho, aba, preparar, pasta_cache=None):
+    """
+    Retorna a aba `aba` já tratada por `preparar`, usando o cache colunar
+    (Parquet, ou pickle sem pyarrow) quando a planilha não mudou. `preparar`
+    recebe a pasta de cache para guardar o mapeamento de colunas.
+    """
+    if pasta_cache is None:
+        pasta_cache = pasta_cache_padrao(caminho)
+
+    prefixo = f"{aba}_v{VERSAO_CACHE}_"
+    caminho_cache = os.path.join(pasta_cache, f"{prefixo}{hash_planilha(caminho)[:16]}.{FORMATO_CACHE}")
+
+    if os.path.exists(caminho_cache):
+        try:
+            df = pd.read_parquet(caminho_cache) if FORMATO_CACHE == "parquet" else pd.read_pickle(caminho_cache)
+            print(f"⚡ Aba '{aba}' carregada do cache: {caminho_cache}")
+            return df
+        except Exception as e:
+            print(f"⚠️ Cache da aba '{aba}' ilegível, relendo a planilha: {e}")
+
+    df = preparar(pd.read_excel(caminho, sheet_name=aba), pasta_cache=pasta_cache)
+
+    try:
+        os.makedirs(pasta_cache, exist_ok=True)
+        for antigo in glob.glob(os.path.join(pasta_cache, f"{prefixo}*")):
+            os.remove(antigo)
+        if FORMATO_CACHE == "parquet":
+            df.to_parquet(caminho_cache)
+        else:
+            df.to_pickle(caminho_cache)
+    except Exception as e:
+        print(f"⚠️ Não foi possível gravar o cache da aba '{aba}': {e}")
+
+    return df
+
+# -----------------------------
+# Leitura em blocos (modo streaming)
+# -----------------------------
+# Para planilhas grandes demais para a memória: a aba é lida linha a linha
+# (openpyxl read_only, ou CSV em blocos), cada bloco passa por mapeamento,
+# conversão e classificação, e só o cubo de agregados, as últimas inspeções
+# e as linhas de máquinas paradas são mantidos entre os blocos.
+TAMANHO_BLOCO_PADRAO = 50_000
+
+def adicionar_colunas_derivadas(df):
+    """Cria Ano/Mes/Mes_Ano e classifica oxidação e criticidade (uma vez para todas as análises)."""
+    df["Ano"] = df["Data_inspecao"].dt.year
+    df["Mes"] = df["Data_inspecao"].dt.month
+    df["Mes_Ano"] = df["Data_inspecao"].dt.to_period('M')
+    
+    if all(col in df.columns for col in ['DOWNWIND', 'UPWIND']):
+        df = classificar_oxidacao_vetorizada(df)
+    return df
+
+def _nomes_colunas(cabecalho):
+    """Nomes de colunas como o pd.read_excel gera ('Unnamed: i', duplicadas com '.1')."""
+    nomes = []
+    for i, nome in enumerate(cabecalho):
+        nome = f"Unnamed: {i}" if nome is None else nome
+        base, n = nome, 0
+        while nome in nomes:
+            n += 1
+            nome = f"{base}.{n}"
+        nomes.append(nome)
+    return nomes
+
+def _bloco_excel(linhas, colunas, inicio):
+    """DataFrame de um bloco de linhas, com vazios como NaN (igual ao read_excel)."""
+    df = pd.DataFrame(linhas, columns=colunas, dtype=object, index=pd.RangeIndex(inicio, inicio + len(linhas)))
+    return df.where(df.notna(), np.nan)
+
+def ler_aba_em_blocos(caminho, aba, tamanho_bloco=TAMANHO_BLOCO_PADRAO):
+    """
+    Gera DataFrames de até `tamanho_bloco` linhas da aba, sem carregar a aba
+    inteira. Arquivos .csv são lidos diretamente em blocos (o nome da aba é
+    ignorado). As colunas vêm como object, então colunas de texto são sempre
+    texto, independente do conteúdo de cada bloco.
+    """
+    if caminho.lower().endswith(".csv"):
+        yield from pd.read_csv(caminho, chunksize=tamanho_bloco, dtype=object)
+        return
+    
+    import openpyxl
+    
+    livro = openpyxl.load_workbook(caminho, read_only=True, data_only=True)
+    try:
+        linhas = livro[aba].iter_rows(values_only=True)
+        colunas = _nomes_colunas(next(linhas, ()))
+        largura = len(colunas)
+        
+        bloco, vazias, inicio = [], [], 0
+        for linha in linhas:
+            linha = (tuple(linha) + (None,) * largura)[:largura]
+            # Linhas vazias só entram se vierem antes de uma linha com dados
+            # (o read_excel descarta as do final da aba)
+            if all(valor is None for valor in linha):
+                vazias.append(linha)
+                continue
+            bloco.extend(vazias)
+            vazias.clear()
+            bloco.append(linha)
+            if len(bloco) >= tamanho_bloco:
+                yield _bloco_excel(bloco, colunas, inicio)
+                inicio += len(bloco)
+                bloco = []
+        if bloco:
+            yield _bloco_excel(bloco, colunas, inicio)
+    finally:
+        livro.close()
+
+# -----------------------------
+# ETAPA: Carregar dados da aba Dados_Brutos
+# -----------------------------
+def carregar_df_clean(arquivo_excel, pasta_cache=None):
+    """Carrega a aba Dados_Brutos e cria as colunas derivadas e a classificação de oxidação."""
+    df_clean = carregar_aba(arquivo_excel, "Dados_Brutos", preparar_dados_brutos, pasta_cache)
+    
+    print("✅ Arquivo carregado com sucesso!")
+    print(f"📊 Dimensões: {df_clean.shape[0]} linhas x {df_clean.shape[1]} colunas")
+    
+    df_clean = adicionar_colunas_derivadas(df_clean)
+    if 'Oxidacao_Nivel' in df_clean.columns:
+        print(f"/n🔬 Oxidação classificada: {df_clean['Oxidacao_Nivel'].value_counts().to_dict()}")
+    
+    print(f"/n📅 Período dos dados: {df_clean['Data_inspecao'].min()} a {df_clean['Data_inspecao'].max()}")
+    print(f"🧲 Total de ímãs trocados: {df_clean['Qtd_Imas_trocados'].sum():.0f}")
+    print(f"🌀 Total de turbinas únicas: {df_clean['Turbina'].nunique()}")
+    
+    return df_clean
+
+# -----------------------------
+# ETAPA: Carregar a aba Carreiras_Vertical
+# -----------------------------
+def carregar_carreiras(arquivo_excel, pasta_cache=None):
+    """Carrega a aba Carreiras_Vertical (DataFrame vazio em caso de erro)."""
+    try:
+        df_carreiras = carregar_aba(arquivo_excel, "Carreiras_Vertical", preparar_carreiras, pasta_cache)
+        
+        print(f"✅ Aba 'Carreiras_Vertical' carregada: {df_carreiras.shape[0]} linhas x {df_carreiras.shape[1]} colunas")
+        print(f"📋 Colunas: {list(df_carreiras.columns)}")
+        
+    except Exception as e:
+        print(f"❌ Erro ao carregar aba Carreiras_Vertical: {e}")
+        df_carreiras = pd.DataFrame()
+    
+    return df_carreiras
+
+def carregar_planilha(arquivo_excel):
+    """Carrega as duas abas da planilha: retorna (df_clean, df_carreiras)."""
+    return carregar_df_clean(arquivo_excel), carregar_carreiras(arquivo_excel)
@@ -0,0 +1,255 @@
+"""Pontuação preditiva de degradação e lista priorizada de próximas inspeções."""
+
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+from .analises import registros_carreiras
+from .configuracao import CICLOS_ANALISE
+from .progressao import NIVEIS_PROGRESSAO, mesmo_trecho_anterior, ordenar_historico
+
+# -----------------------------
+# MODELO DE PIORA NA PRÓXIMA INSPEÇÃO
+# -----------------------------
+# Regressão logística da frota, ajustada por Newton-Raphson (IRLS) com
+# penalidade L2, só com NumPy. Cada par de inspeções consecutivas de uma
+# turbina é um exemplo (menos os separados por uma troca de spindle): as
+# variáveis da inspeção atual e os dias até a seguinte explicam se a seguinte
+# veio com nível pior. As variáveis de cada inspeção só usam o que já se sabia
+# na data dela. Na pontuação, os dias são os decorridos desde a última
+# inspeção até hoje, e o histórico de carreiras é o total.
+VARIAVEIS_PREVISAO = ["Gravidade", "Ciclo", "Log_Dias", "Log_Imas_Acumulados", "Log_Carreiras", "Log_Imas_Carreiras"]
+PENALIDADE_L2 = 1.0
+MINIMO_EXEMPLOS = 10
+# Probabilidade de piora a partir da qual a inspeção é sugerida
+LIMIAR_PROXIMA_INSPECAO = 0.3
+# (probabilidade mínima, prioridade), da maior para a menor
+FAIXAS_PRIORIDADE = [(0.5, "alta"), (0.2, "media"), (0.0, "baixa")]
+# Intervalo máximo sugerido entre inspeções, mesmo quando o limiar não é atingido
+HORIZONTE_MAXIMO_DIAS = 730
+
+def chave_turbina(turbinas):
+    """Nome da turbina só com letras e números, em maiúsculas ('AEG-05' e 'aeg05' → 'AEG05')."""
+    return pd.Series(turbinas, dtype=object).astype(str).str.upper().str.replace(r"[^0-9A-Z]", "", regex=True)
+
+def historico_carreiras(df_carreiras):
+    """
+    Carreiras com troca e ímãs trocados por turbina (aba Carreiras_Vertical):
+    (acumulados, totais). `acumulados` tem uma linha por turbina × data com os
+    valores até aquela data, inclusive; `totais` é o histórico inteiro, indexado
+    pela chave da turbina.
+    """
+    registros = registros_carreiras(df_carreiras)
+    registros = registros.assign(
+        Chave=chave_turbina(registros["Turbina"]).to_numpy(),
+        Data_inspecao=pd.to_datetime(registros["Data_inspecao"]).astype("datetime64[ns]"),
+        Imas_Trocados=registros["Imas_Trocados"].astype(float),
+    )
+    totais = registros.groupby("Chave").agg(Carreiras=("Carreira", "nunique"), Imas_Carreiras=("Imas_Trocados", "sum"))
+
+    # Linhas sem data não têm como entrar no histórico até uma inspeção, só nos totais
+    datados = registros.dropna(subset=["Data_inspecao"]).sort_values(["Chave", "Data_inspecao"], kind="mergesort")
+    por_turbina = datados.groupby("Chave", sort=False)
+    acumulados = pd.DataFrame({
+        "Chave": datados["Chave"].to_numpy(),
+        "Data_inspecao": datados["Data_inspecao"].to_numpy(),
+        # Uma carreira conta a partir da primeira troca registrada nela
+        "Carreiras": (~datados.duplicated(["Chave", "Carreira"])).groupby(datados["Chave"], sort=False).cumsum().to_numpy(dtype=float),
+        "Imas_Carreiras": por_turbina["Imas_Trocados"].cumsum().to_numpy(dtype=float),
+    }).drop_duplicates(["Chave", "Data_inspecao"], keep="last")
+    return acumulados.sort_values("Data_inspecao", kind="mergesort"), totais
+
+def carreiras_ate_inspecao(h, acumulados):
+    """Carreiras e ímãs trocados na aba de carreiras até a data de cada inspeção de `h` (zeros antes da primeira troca)."""
+    consulta = pd.DataFrame({
+        "Chave": chave_turbina(h["Turbina"]).to_numpy(),
+        "Data_inspecao": h["Data_inspecao"].to_numpy(dtype="datetime64[ns]"),
+        "Posicao": np.arange(len(h)),
+    }).dropna(subset=["Data_inspecao"]).sort_values("Data_inspecao", kind="mergesort")
+    # Sem nenhuma troca datada a chave vem como object; o merge_asof exige o mesmo tipo dos dois lados
+    acumulados = acumulados.astype({"Chave": consulta["Chave"].dtype})
+    ate_inspecao = pd.merge_asof(consulta, acumulados, on="Data_inspecao", by="Chave", direction="backward")
+    return ate_inspecao.set_index("Posicao").reindex(np.arange(len(h)))[["Carreiras", "Imas_Carreiras"]].fillna(0)
+
+def preparar_inspecoes(historico, acumulados):
+    """
+    Inspeções classificadas em ordem por turbina e data, com os ímãs trocados
+    acumulados até cada inspeção, o ciclo como posição e o histórico de
+    carreiras até a data da inspeção (nada posterior a ela entra no treino).
+    """
+    ordenado = historico.sort_values(["Turbina", "Data_inspecao", "Linha"], kind="mergesort")
+    imas = ordenado["Qtd_Imas_trocados"].astype(float).fillna(0)
+    ordenado = ordenado.assign(Imas_Acumulados=imas.groupby(ordenado["Turbina"].astype(object), sort=False).cumsum())
+
+    h = ordenar_historico(ordenado)
+    carreiras = carreiras_ate_inspecao(h, acumulados)
+    h["Ciclo"] = np.maximum(pd.Index(CICLOS_ANALISE).get_indexer(h["Ciclo_inspecao"]), 0)
+    h["Carreiras"] = carreiras["Carreiras"].to_numpy(dtype=float)
+    h["Imas_Carreiras"] = carreiras["Imas_Carreiras"].to_numpy(dtype=float)
+    return h
+
+def matriz_variaveis(h, dias):
+    """Matriz (linhas × VARIAVEIS_PREVISAO) das inspeções de `h` com `dias` decorridos."""
+    return np.column_stack([
+        h["Gravidade"].to_numpy(dtype=float),
+        h["Ciclo"].to_numpy(dtype=float),
+        np.log1p(np.maximum(np.asarray(dias, dtype=float), 0)),
+        np.log1p(h["Imas_Acumulados"].to_numpy(dtype=float)),
+        np.log1p(h["Carreiras"].to_numpy(dtype=float)),
+        np.log1p(h["Imas_Carreiras"].to_numpy(dtype=float)),
+    ])
+
+def exemplos_treino(h):
+    """Variáveis de cada inspeção que tem uma seguinte no mesmo trecho da turbina e se a seguinte piorou."""
+    seguinte = h.shift(-1)
+    tem_seguinte = np.append(mesmo_trecho_anterior(h)[1:], False)
+    atual = h[tem_seguinte]
+    dias = (seguinte["Data_inspecao"] - h["Data_inspecao"]).dt.days.to_numpy()[tem_seguinte]
+    piorou = (seguinte["Gravidade"].to_numpy()[tem_seguinte] > atual["Gravidade"].to_numpy()).astype(float)
+    return matriz_variaveis(atual, dias), piorou, dias
+
+def sigmoide(z):
+    return 1.0 / (1.0 + np.exp(-np.clip(z, -35, 35)))
+
+def ajustar_logistica(X, y, penalidade=PENALIDADE_L2, iteracoes=50, tolerancia=1e-8):
+    """
+    Coeficientes (intercepto primeiro) da regressão logística de y em X por
+    Newton-Raphson, com penalidade L2 fora do intercepto. X já padronizada.
+    """
+    X = np.column_stack([np.ones(len(X)), X])
+    regularizacao = penalidade * np.eye(X.shape[1])
+    regularizacao[0, 0] = 1e-9
+    pesos = np.zeros(X.shape[1])
+    for _ in range(iteracoes):
+        p = sigmoide(X @ pesos)
+        gradiente = X.T @ (p - y) + regularizacao @ pesos
+        hessiana = (X * (p * (1 - p))[:, None]).T @ X + regularizacao
+        passo = np.linalg.solve(hessiana, gradiente)
+        pesos -= passo
+        if np.abs(passo).max() < tolerancia:
+            break
+    return pesos
+
+def auc(y, p):
+    """Área sob a curva ROC pela soma de postos (None sem as duas classes)."""
+    positivos = int(y.sum())
+    negativos = len(y) - positivos
+    if not positivos or not negativos:
+        return None
+    postos = pd.Series(p).rank().to_numpy()
+    return float((postos[y == 1].sum() - positivos * (positivos + 1) / 2) / (positivos * negativos))
+
+def ajustar_modelo(h):
+    """Padronização, coeficientes e qualidade do modelo da frota."""
+    X, y, dias = exemplos_treino(h)
+    media = X.mean(axis=0) if len(X) else np.zeros(len(VARIAVEIS_PREVISAO))
+    desvio = X.std(axis=0) if len(X) else np.ones(len(VARIAVEIS_PREVISAO))
+    desvio = np.where(desvio > 0, desvio, 1.0)
+
+    if len(y) >= MINIMO_EXEMPLOS and 0 < y.sum() < len(y):
+        pesos = ajustar_logistica((X - media) / desvio, y)
+        ajustado = True
+    else:
+        # Sem as duas classes não há o que ajustar: só a taxa base (suavizada)
+        pesos = np.zeros(len(VARIAVEIS_PREVISAO) + 1)
+        pesos[0] = np.log((y.sum() + 0.5) / (len(y) - y.sum() + 0.5))
+        ajustado = False
+
+    return {
+        "ajustado": ajustado,
+        "media": media,
+        "desvio": desvio,
+        "pesos": pesos,
+        "exemplos": len(y),
+        "pioras": int(y.sum()),
+        "intervalo_mediano_dias": float(np.median(dias)) if len(dias) else 0.0,
+        "auc_treino": auc(y, sigmoide(np.column_stack([np.ones(len(X)), (X - media) / desvio]) @ pesos)) if len(y) else None,
+    }
+
+def dias_ate_limiar(modelo, X):
+    """
+    Dias desde a inspeção em que a probabilidade de piora atinge
+    LIMIAR_PROXIMA_INSPECAO. Sem efeito crescente do tempo, usa o intervalo mediano da frota.
+    """
+    pesos, media, desvio = modelo["pesos"], modelo["media"], modelo["desvio"]
+    posicao = VARIAVEIS_PREVISAO.index("Log_Dias")
+    efeito = pesos[1 + posicao] / desvio[posicao]
+    fixo = pesos[0] + ((X - media) / desvio) @ pesos[1:] - efeito * X[:, posicao]
+    if efeito <= 1e-9:
+        return np.full(len(X), modelo["intervalo_mediano_dias"])
+    limiar = np.log(LIMIAR_PROXIMA_INSPECAO / (1 - LIMIAR_PROXIMA_INSPECAO))
+    log_dias = np.clip((limiar - fixo) / efeito, 0, np.log1p(HORIZONTE_MAXIMO_DIAS))
+    return np.expm1(log_dias)
+
+def pontuar_turbinas(h, modelo, hoje, totais):
+    """
+    Probabilidade de piora de cada turbina se inspecionada hoje e a data
+    sugerida, em ordem de prioridade. Como a pontuação é para hoje, o histórico
+    de carreiras é o total da turbina (`totais`), e não o da última inspeção.
+    """
+    ultimas = h.drop_duplicates("Turbina", keep="last").reset_index(drop=True)
+    carreiras = totais.reindex(chave_turbina(ultimas["Turbina"]).to_numpy(), fill_value=0)
+    ultimas["Carreiras"] = carreiras["Carreiras"].to_numpy(dtype=float)
+    ultimas["Imas_Carreiras"] = carreiras["Imas_Carreiras"].to_numpy(dtype=float)
+    dias_desde = (hoje - ultimas["Data_inspecao"]).dt.days.to_numpy()
+    X = matriz_variaveis(ultimas, dias_desde)
+    probabilidade = sigmoide(modelo["pesos"][0] + ((X - modelo["media"]) / modelo["desvio"]) @ modelo["pesos"][1:])
+
+    proxima = ultimas["Data_inspecao"] + pd.to_timedelta(np.round(dias_ate_limiar(modelo, X)), unit="D")
+    proxima = proxima.where(proxima > hoje, hoje)
+
+    ranking = pd.DataFrame({
+        "Turbina": ultimas["Turbina"].to_numpy(),
+        "Probabilidade_Piora": probabilidade.round(4),
+        "Prioridade": np.select([probabilidade >= limite for limite, _ in FAIXAS_PRIORIDADE], [nome for _, nome in FAIXAS_PRIORIDADE], default=FAIXAS_PRIORIDADE[-1][1]),
+        "Nivel_Atual": np.array(NIVEIS_PROGRESSAO, dtype=object)[ultimas["Gravidade"].to_numpy()],
+        "Ciclo_Atual": ultimas["Ciclo_inspecao"].to_numpy(),
+        "Ultima_Inspecao": ultimas["Data_inspecao"].to_numpy(),
+        "Dias_Desde_Ultima": dias_desde,
+        "Imas_Trocados": ultimas["Imas_Acumulados"].to_numpy(),
+        "Carreiras_Afetadas": ultimas["Carreiras"].to_numpy(dtype=np.int64),
+        "Proxima_Inspecao": proxima.to_numpy(),
+        "Dias_Ate_Proxima": (proxima - hoje).dt.days.to_numpy(),
+    })
+    ranking = ranking.sort_values(
+        ["Probabilidade_Piora", "Proxima_Inspecao", "Dias_Desde_Ultima", "Turbina"],
+        ascending=[False, True, False, True], kind="mergesort",
+    ).reset_index(drop=True)
+    ranking.insert(0, "Posicao", np.arange(1, len(ranking) + 1))
+    return ranking
+
+# -----------------------------
+# ETAPA: PREVISÃO DE PIORA E PRÓXIMAS INSPEÇÕES
+# -----------------------------
+def analisar_previsao(agregacao, df_carreiras):
+    print("/n🔮 AJUSTANDO MODELO DE PIORA E PRIORIZANDO PRÓXIMAS INSPEÇÕES...")
+
+    hoje = pd.Timestamp(datetime.now()).normalize()
+    acumulados, totais = historico_carreiras(df_carreiras)
+    h = preparar_inspecoes(agregacao["historico_oxidacao"], acumulados)
+    modelo = ajustar_modelo(h)
+    ranking = pontuar_turbinas(h, modelo, hoje, totais)
+
+    if modelo["ajustado"]:
+        print(f"   📐 {modelo['exemplos']} pares de inspeções, {modelo['pioras']} com piora (AUC no treino: {modelo['auc_treino']:.3f})")
+    else:
+        print(f"⚠️ Poucos pares de inspeções com e sem piora ({modelo['exemplos']}); usando só a taxa base da frota")
+    for _, row in ranking.head(5).iterrows():
+        print(f"   🔎 {row['Posicao']}. {row['Turbina']}: {row['Probabilidade_Piora']:.1%} ({row['Prioridade']}), sugerida em {row['Proxima_Inspecao']:%Y-%m-%d}")
+    print(f"✅ {len(ranking)} turbinas pontuadas")
+
+    return {
+        "referencia": hoje,
+        "modelo": {
+            "ajustado": modelo["ajustado"],
+            "exemplos": modelo["exemplos"],
+            "pioras": modelo["pioras"],
+            "auc_treino": None if modelo["auc_treino"] is None else round(modelo["auc_treino"], 4),
+            "intercepto": round(float(modelo["pesos"][0]), 4),
+            # Coeficientes por desvio padrão de cada variável
+            "coeficientes": {variavel: round(float(peso), 4) for variavel, peso in zip(VARIAVEIS_PREVISAO, modelo["pesos"][1:])},
+            "limiar_proxima_inspecao": LIMIAR_PROXIMA_INSPECAO,
+        },
+        "turbinas": ranking,
+    }
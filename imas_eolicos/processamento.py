@@ -0,0 +1,220 @@
+"""Grafo de etapas e API de alto nível do pacote."""
+
+import io
+import os
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from contextlib import redirect_stdout
+from datetime import datetime
+
+from .agregacao import ARQUIVO_ESTADO, agregar, agregar_em_blocos, separar_linhas_paradas
+from .analises import (
+    analisar_carreiras,
+    analisar_clusters,
+    analisar_criticidade,
+    analisar_cubo_temporal,
+    analisar_estado_turbinas,
+    analisar_matriz_carreiras,
+    analisar_mensal,
+    analisar_oxidacao,
+    analisar_temporal,
+    analisar_turbinas,
+    analisar_ultima_inspecao,
+)
+from .exportacao import (
+    COMPRESSORES,
+    dashboard_embutido,
+    manter_data_atualizacao,
+    montar_dashboard_data,
+    salvar_fragmentos,
+    salvar_json,
+)
+from .instrumentacao import imprimir_medicoes, medir_etapa
+from .paradas import analisar_disponibilidade, analisar_maquinas_paradas
+from .previsao import analisar_previsao
+from .progressao import analisar_progressao
+from .planilhas import TAMANHO_BLOCO_PADRAO, carregar_carreiras, carregar_df_clean, pasta_cache_padrao
+
+# -----------------------------
+# GRAFO DE ETAPAS
+# -----------------------------
+# nome -> (função, dependências). As dependências são entradas da execução
+# ou resultados de outras etapas; a ordem de declaração é a ordem sequencial.
+ETAPAS = {
+    "df_clean": (carregar_df_clean, ["arquivo_excel"]),
+    "df_carreiras": (carregar_carreiras, ["arquivo_excel"]),
+    "agregacao": (agregar, ["df_clean", "caminho_estado", "incremental"]),
+    "oxidacao_df": (analisar_oxidacao, ["agregacao"]),
+    "temporal": (analisar_temporal, ["agregacao"]),
+    "maquinas_paradas_json": (analisar_maquinas_paradas, ["df_clean"]),
+    "carreira_metrics": (analisar_carreiras, ["df_carreiras"]),
+    "matriz_carreiras": (analisar_matriz_carreiras, ["df_carreiras"]),
+    "ciclos_data": (analisar_criticidade, ["agregacao"]),
+    "turbina_metrics": (analisar_turbinas, ["agregacao"]),
+    "mensal_data": (analisar_mensal, ["agregacao"]),
+    "oxidacao_ultima_inspecao": (analisar_ultima_inspecao, ["agregacao"]),
+    "estado_turbinas": (analisar_estado_turbinas, ["agregacao"]),
+    "clusters": (analisar_clusters, ["agregacao"]),
+    "progressao": (analisar_progressao, ["agregacao"]),
+    "previsao": (analisar_previsao, ["agregacao", "df_carreiras"]),
+    "disponibilidade": (analisar_disponibilidade, ["df_clean", "agregacao"]),
+    "cubo_temporal": (analisar_cubo_temporal, ["agregacao"]),
+}
+
+# Modo em blocos: a aba Dados_Brutos nunca é carregada inteira; a leitura já
+# produz a agregação e as linhas de máquinas paradas
+ETAPAS_BLOCOS = {
+    "agregacao": (agregar_em_blocos, ["arquivo_excel", "tamanho_bloco"]),
+    "df_carreiras": (carregar_carreiras, ["arquivo_excel"]),
+    "linhas_paradas": (separar_linhas_paradas, ["agregacao"]),
+    **{nome: etapa for nome, etapa in ETAPAS.items() if nome not in ("df_clean", "agregacao", "df_carreiras")},
+    "maquinas_paradas_json": (analisar_maquinas_paradas, ["linhas_paradas"]),
+    "disponibilidade": (analisar_disponibilidade, ["linhas_paradas", "agregacao"]),
+}
+
+def _executar_etapa(nome, funcao, memoria, *argumentos):
+    """Roda uma etapa num processo do pool, capturando o que ela imprime."""
+    saida = io.StringIO()
+    with redirect_stdout(saida):
+        resultado, medicao = medir_etapa(nome, funcao, *argumentos, memoria=memoria)
+    return resultado, saida.getvalue(), medicao
+
+def executar_etapas(etapas, entradas, workers=1, medicoes=None, memoria=False):
+    """
+    Executa o grafo de etapas e devolve {nome: resultado}.
+    
+    Com workers > 1 as etapas independentes rodam em paralelo num
+    ProcessPoolExecutor; os logs de cada etapa são impressos na ordem de
+    declaração e o resultado não depende da ordem de término. Se `medicoes`
+    for uma lista, recebe a medição de cada etapa, também na ordem de declaração
+    (com `memoria=True`, incluindo o pico de memória de cada uma).
+    Etapas cujo resultado já vem em `entradas` não são executadas de novo.
+    """
+    resultados = dict(entradas)
+    medicoes = [] if medicoes is None else medicoes
+    etapas = {nome: etapa for nome, etapa in etapas.items() if nome not in resultados}
+    
+    if workers <= 1:
+        for nome, (funcao, dependencias) in etapas.items():
+            resultados[nome], medicao = medir_etapa(nome, funcao, *[resultados[d] for d in dependencias], memoria=memoria)
+            medicoes.append(medicao)
+        return resultados
+    
+    pendentes = dict(etapas)
+    em_execucao = {}
+    logs = {}
+    medicoes_por_etapa = {}
+    ordem = list(etapas)
+    proximo_log = 0
+    
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        while pendentes or em_execucao:
+            # Submeter todas as etapas cujas dependências já foram resolvidas
+            for nome, (funcao, dependencias) in list(pendentes.items()):
+                if all(d in resultados for d in dependencias):
+                    futuro = pool.submit(_executar_etapa, nome, funcao, memoria, *[resultados[d] for d in dependencias])
+                    em_execucao[futuro] = nome
+                    del pendentes[nome]
+            
+            if not em_execucao:
+                faltando = {d for _, deps in pendentes.values() for d in deps if d not in resultados}
+                raise ValueError(f"Dependências não resolvidas no grafo de etapas: {sorted(faltando)}")
+            
+            concluidos, _ = wait(em_execucao, return_when=FIRST_COMPLETED)
+            for futuro in concluidos:
+                nome = em_execucao.pop(futuro)
+                resultados[nome], logs[nome], medicoes_por_etapa[nome] = futuro.result()
+            
+            # Imprimir os logs na ordem de declaração, assim que disponíveis
+            while proximo_log < len(ordem) and ordem[proximo_log] in logs:
+                print(logs.pop(ordem[proximo_log]), end="")
+                medicoes.append(medicoes_por_etapa.pop(ordem[proximo_log]))
+                proximo_log += 1
+    
+    return resultados
+
+# -----------------------------
+# API DE ALTO NÍVEL
+# -----------------------------
+def montar_dashboard(arquivo_excel, workers=1, incremental=False, streaming=False,
+                     tamanho_bloco=TAMANHO_BLOCO_PADRAO, medicoes=None, memoria=False):
+    """
+    Executa o grafo de etapas sobre a planilha e retorna
+    (dashboard_data, maquinas_paradas_json), sem gravar nada em assets.
+    """
+    entradas = {
+        "arquivo_excel": arquivo_excel,
+        "caminho_estado": os.path.join(pasta_cache_padrao(arquivo_excel), ARQUIVO_ESTADO),
+        "incremental": incremental,
+        "tamanho_bloco": max(tamanho_bloco, 1),
+    }
+    medicoes = [] if medicoes is None else medicoes
+    resultados = executar_etapas(ETAPAS_BLOCOS if streaming else ETAPAS, entradas, workers, medicoes, memoria)
+    
+    dashboard_data, medicao = medir_etapa("dashboard_data", montar_dashboard_data, resultados, memoria=memoria)
+    medicoes.append(medicao)
+    return dashboard_data, resultados["maquinas_paradas_json"]
+
+def exportar(dashboard_data, maquinas_paradas_json, pasta_saida, colunar=False, compressao=(), medicoes=None,
+             memoria=False):
+    """
+    Grava dashboard_data.json, maquinas_paradas.json e os fragmentos em
+    `pasta_saida`. dashboard_data.json leva só o resumo e os ciclos; as
+    seções pesadas ficam apenas nos fragmentos.
+    """
+    medicoes = [] if medicoes is None else medicoes
+    manter_data_atualizacao(dashboard_data, os.path.join(pasta_saida, "dashboard_data.json"))
+    
+    json_path, medicao = medir_etapa("gravacao_dashboard_data", salvar_json, dashboard_embutido(dashboard_data), "dashboard_data.json", pasta_saida, compressao, memoria=memoria)
+    medicoes.append(medicao)
+    
+    _, medicao = medir_etapa("gravacao_maquinas_paradas", salvar_json, maquinas_paradas_json, "maquinas_paradas.json", pasta_saida, compressao, memoria=memoria)
+    medicoes.append(medicao)
+    
+    _, medicao = medir_etapa("gravacao_fragmentos", salvar_fragmentos, dashboard_data, maquinas_paradas_json, os.path.dirname(json_path), colunar, compressao, memoria=memoria)
+    medicoes.append(medicao)
+    return os.path.dirname(json_path)
+
+def processar_planilha(arquivo_excel, pasta_saida, workers=1, incremental=False, streaming=False,
+                       tamanho_bloco=TAMANHO_BLOCO_PADRAO, colunar=False, compressao=(), memoria=False):
+    """
+    Processamento completo: monta o dashboard, exporta os JSONs e grava o
+    run_report.json. Retorna {dashboard_data, maquinas_paradas, relatorio}.
+    """
+    inicio = datetime.now()
+    workers = workers if workers > 0 else (os.cpu_count() or 1)
+    compressao = [formato for formato in dict.fromkeys(compressao) if COMPRESSORES[formato]]
+    
+    medicoes = []
+    dashboard_data, maquinas_paradas_json = montar_dashboard(
+        arquivo_excel, workers, incremental, streaming, tamanho_bloco, medicoes, memoria
+    )
+    pasta_saida = exportar(dashboard_data, maquinas_paradas_json, pasta_saida, colunar, compressao, medicoes, memoria)
+    
+    # -----------------------------
+    # RELATÓRIO DE EXECUÇÃO (run_report.json)
+    # -----------------------------
+    imprimir_medicoes(medicoes)
+    picos = [m["pico_processo_mb"] for m in medicoes if m["pico_processo_mb"] is not None]
+    relatorio = {
+        "inicio": inicio.strftime("%Y-%m-%d %H:%M:%S"),
+        "fim": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+        "planilha": os.path.abspath(arquivo_excel),
+        "opcoes": {
+            "workers": workers,
+            "incremental": incremental,
+            "streaming": streaming,
+            "tamanho_bloco": max(tamanho_bloco, 1) if streaming else None,
+            "memoria": memoria,
+        },
+        "tempo_total_s": round((datetime.now() - inicio).total_seconds(), 3),
+        "cpu_total_s": round(sum(m["cpu_s"] for m in medicoes), 3),
+        "pico_processo_mb": max(picos) if picos else None,
+        "etapas": medicoes,
+    }
+    salvar_json(relatorio, "run_report.json", pasta_saida)
+    
+    return {
+        "dashboard_data": dashboard_data,
+        "maquinas_paradas": maquinas_paradas_json,
+        "relatorio": relatorio,
+    }
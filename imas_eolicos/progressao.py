@@ -0,0 +1,209 @@
+"""Progressão da oxidação por turbina: transições entre ciclos, tempo até agravar e taxa de degradação."""
+
+import numpy as np
+import pandas as pd
+
+from .agregacao import GRAVIDADE_OXIDACAO, NIVEL_TROCA_SPINDLE
+from .configuracao import CICLOS_TEMPORAIS
+
+# -----------------------------
+# PROGRESSÃO DA OXIDAÇÃO
+# -----------------------------
+# O histórico é ordenado uma única vez por turbina × data (empates pela ordem
+# da planilha). A partir daí tudo sai de colunas deslocadas dentro de cada
+# turbina (groupby().shift / cummax / ffill), sem laços por turbina. Só entram
+# os níveis comparáveis: inspeções 'invalido' ou sem classificação são puladas.
+# Uma troca de spindle encerra o trecho da turbina: nenhuma transição,
+# agravamento ou par de treino liga inspeções de trechos diferentes.
+NIVEIS_PROGRESSAO = list(GRAVIDADE_OXIDACAO)  # em ordem de gravidade (0 a 3)
+
+# Faixas de dias até agravar: (limite superior inclusivo, rótulo)
+FAIXAS_DIAS = [(90, "até 90 dias"), (180, "91 a 180 dias"), (365, "181 a 365 dias"),
+               (730, "1 a 2 anos"), (np.inf, "mais de 2 anos")]
+
+def ordenar_historico(historico):
+    """
+    Inspeções com nível comparável, ordenadas por turbina, data e linha, com a
+    gravidade (0 a 3), o trecho (trocas de spindle anteriores da turbina) e o
+    total de trocas de spindle da turbina.
+    """
+    niveis = historico['Oxidacao_Nivel'].astype(object)
+    h = historico.assign(
+        Turbina=historico['Turbina'].astype(object),
+        Ciclo_inspecao=historico['Ciclo_inspecao'].astype(object),
+        Gravidade=niveis.map(GRAVIDADE_OXIDACAO),
+        Troca_Spindle=niveis.eq(NIVEL_TROCA_SPINDLE).astype(np.int64),
+    ).sort_values(['Turbina', 'Data_inspecao', 'Linha'], kind='mergesort')
+    por_turbina = h['Troca_Spindle'].groupby(h['Turbina'], sort=False)
+    h['Trecho'] = por_turbina.cumsum()
+    h['Trocas_Spindle'] = por_turbina.transform('sum')
+    h = h[h['Gravidade'].notna()].drop(columns='Troca_Spindle').reset_index(drop=True)
+    h['Gravidade'] = h['Gravidade'].astype(np.int64)
+    return h
+
+def mesmo_trecho_anterior(h):
+    """Se cada inspeção tem uma anterior no mesmo trecho da mesma turbina."""
+    return (h['Turbina'].eq(h['Turbina'].shift()) & h['Trecho'].eq(h['Trecho'].shift())).to_numpy()
+
+def matriz_transicoes(de, para):
+    """Contagens [de][para] entre os níveis de NIVEIS_PROGRESSAO (gravidades como posições)."""
+    n = len(NIVEIS_PROGRESSAO)
+    codigos = np.asarray(de, dtype=np.int64) * n + np.asarray(para, dtype=np.int64)
+    return np.bincount(codigos, minlength=n * n).reshape(n, n).tolist()
+
+def transicoes_entre_inspecoes(h):
+    """Matriz de transição entre inspeções consecutivas do mesmo trecho da turbina."""
+    mesmo_trecho = mesmo_trecho_anterior(h)
+    anterior = h['Gravidade'].shift(fill_value=0).to_numpy()
+    return matriz_transicoes(anterior[mesmo_trecho], h['Gravidade'].to_numpy()[mesmo_trecho])
+
+def niveis_por_ciclo(h):
+    """
+    Turbina × ciclo (CICLOS_TEMPORAIS) com a gravidade da última inspeção da
+    turbina em cada ciclo, e a mesma tabela com o trecho dessa inspeção.
+    """
+    ultimas = h[h['Ciclo_inspecao'].isin(CICLOS_TEMPORAIS)].drop_duplicates(['Turbina', 'Ciclo_inspecao'], keep='last')
+    tabelas = ultimas.pivot(index='Turbina', columns='Ciclo_inspecao', values=['Gravidade', 'Trecho'])
+    return tabelas['Gravidade'].reindex(columns=CICLOS_TEMPORAIS), tabelas['Trecho'].reindex(columns=CICLOS_TEMPORAIS)
+
+def transicoes_entre_ciclos(tabela, trechos):
+    """
+    Para cada par de ciclos consecutivos, a matriz de transição das turbinas
+    inspecionadas nos dois sem troca de spindle entre as duas inspeções.
+    """
+    transicoes = []
+    for de, para in zip(CICLOS_TEMPORAIS, CICLOS_TEMPORAIS[1:]):
+        ambos = tabela[[de, para]][trechos[de].eq(trechos[para])].dropna().astype(np.int64)
+        antes, depois = ambos[de].to_numpy(), ambos[para].to_numpy()
+        transicoes.append({
+            "De": de,
+            "Para": para,
+            "Turbinas": len(ambos),
+            "Pioraram": int((depois > antes).sum()),
+            "Estaveis": int((depois == antes).sum()),
+            "Melhoraram": int((depois < antes).sum()),
+            "matriz": matriz_transicoes(antes, depois),
+        })
+    return transicoes
+
+def agravamentos(h):
+    """
+    Inspeções em que a turbina atinge um nível pior que todos os anteriores do
+    mesmo trecho, com os dias desde a primeira inspeção no pior nível até então.
+    """
+    trechos = [h['Turbina'], h['Trecho']]
+    pior = h['Gravidade'].groupby(trechos, sort=False).cummax()
+    pior_anterior = pior.groupby(trechos, sort=False).shift()
+    novo_pior = pior_anterior.isna() | (h['Gravidade'] > pior_anterior)
+    # Data em que o pior nível corrente foi visto pela primeira vez
+    desde = h['Data_inspecao'].where(novo_pior).groupby(trechos, sort=False).ffill()
+    desde_anterior = desde.groupby(trechos, sort=False).shift()
+    evento = (novo_pior & pior_anterior.notna()).to_numpy()
+    return pd.DataFrame({
+        'Turbina': h['Turbina'][evento].to_numpy(),
+        'Trecho': h['Trecho'][evento].to_numpy(dtype=np.int64),
+        'Data_inspecao': h['Data_inspecao'][evento].to_numpy(),
+        'De': pior_anterior[evento].astype(np.int64).to_numpy(),
+        'Para': h['Gravidade'][evento].to_numpy(),
+        'Dias': (h['Data_inspecao'] - desde_anterior)[evento].dt.days.to_numpy(dtype=np.int64),
+    })
+
+def distribuicao_dias(dias):
+    """Resumo e faixas de uma série de dias (zeros quando vazia)."""
+    dias = pd.Series(dias, dtype=float)
+    limites = [-np.inf] + [limite for limite, _ in FAIXAS_DIAS]
+    faixas = pd.cut(dias, limites, labels=[rotulo for _, rotulo in FAIXAS_DIAS]).value_counts(sort=False)
+    vazio = dias.empty
+    return {
+        "Quantidade": len(dias),
+        "Media_Dias": 0.0 if vazio else round(float(dias.mean()), 2),
+        "Mediana_Dias": 0.0 if vazio else float(dias.median()),
+        "P25_Dias": 0.0 if vazio else float(dias.quantile(0.25)),
+        "P75_Dias": 0.0 if vazio else float(dias.quantile(0.75)),
+        "Min_Dias": 0.0 if vazio else float(dias.min()),
+        "Max_Dias": 0.0 if vazio else float(dias.max()),
+        "faixas": [{"Faixa": str(faixa), "Quantidade": int(quantidade)} for faixa, quantidade in faixas.items()],
+    }
+
+def tempo_ate_agravar(eventos):
+    """Distribuição geral dos dias até agravar e por transição (nível de → nível para)."""
+    por_transicao = eventos.groupby(['De', 'Para'], sort=True)['Dias']
+    return {
+        "geral": distribuicao_dias(eventos['Dias']),
+        "por_transicao": [
+            {
+                "De": NIVEIS_PROGRESSAO[de],
+                "Para": NIVEIS_PROGRESSAO[para],
+                "Quantidade": int(dias.size),
+                "Media_Dias": round(float(dias.mean()), 2),
+                "Mediana_Dias": float(dias.median()),
+            }
+            for (de, para), dias in por_transicao
+        ],
+    }
+
+def taxas_degradacao(h, eventos):
+    """
+    Uma linha por turbina: níveis inicial, atual e pior, agravamentos e a taxa de
+    degradação (inclinação dos mínimos quadrados da gravidade, em níveis por ano),
+    contados desde a última troca de spindle, e o total de trocas de spindle.
+    """
+    trecho_atual = h.groupby('Turbina', sort=False)['Trecho'].max()
+    h = h[h['Trecho'].to_numpy() == trecho_atual.reindex(h['Turbina']).to_numpy()]
+    eventos = eventos[eventos['Trecho'].to_numpy() == trecho_atual.reindex(eventos['Turbina']).to_numpy()]
+    turbinas = h['Turbina']
+    anos = (h['Data_inspecao'] - h['Data_inspecao'].groupby(turbinas, sort=False).transform('min')).dt.days / 365.25
+    gravidade = h['Gravidade'].astype(float)
+    somas = pd.DataFrame({
+        'Turbina': turbinas, 'x': anos, 'y': gravidade, 'xy': anos * gravidade, 'xx': anos * anos,
+    }).groupby('Turbina', sort=True).agg(['sum', 'size'])
+    n = somas[('x', 'size')]
+    denominador = n * somas[('xx', 'sum')] - somas[('x', 'sum')] ** 2
+    inclinacao = (n * somas[('xy', 'sum')] - somas[('x', 'sum')] * somas[('y', 'sum')]) / denominador.where(denominador > 1e-9)
+
+    por_turbina = h.groupby('Turbina', sort=True).agg(
+        Primeira_Inspecao=('Data_inspecao', 'first'),
+        Ultima_Inspecao=('Data_inspecao', 'last'),
+        Nivel_Inicial=('Gravidade', 'first'),
+        Nivel_Atual=('Gravidade', 'last'),
+        Pior_Nivel=('Gravidade', 'max'),
+        Trocas_Spindle=('Trocas_Spindle', 'first'),
+    )
+    niveis = np.array(NIVEIS_PROGRESSAO, dtype=object)
+    return pd.DataFrame({
+        "Turbina": por_turbina.index,
+        "Inspecoes": n.to_numpy(dtype=np.int64),
+        "Primeira_Inspecao": por_turbina["Primeira_Inspecao"].to_numpy(),
+        "Ultima_Inspecao": por_turbina["Ultima_Inspecao"].to_numpy(),
+        "Nivel_Inicial": niveis[por_turbina["Nivel_Inicial"].to_numpy(dtype=np.int64)],
+        "Nivel_Atual": niveis[por_turbina["Nivel_Atual"].to_numpy(dtype=np.int64)],
+        "Pior_Nivel": niveis[por_turbina["Pior_Nivel"].to_numpy(dtype=np.int64)],
+        "Variacao_Niveis": (por_turbina["Nivel_Atual"] - por_turbina["Nivel_Inicial"]).to_numpy(dtype=np.int64),
+        "Agravamentos": eventos['Turbina'].value_counts().reindex(por_turbina.index, fill_value=0).to_numpy(dtype=np.int64),
+        "Taxa_Degradacao_Ano": inclinacao.fillna(0).round(3).to_numpy(),
+        "Trocas_Spindle": por_turbina["Trocas_Spindle"].to_numpy(dtype=np.int64),
+    })
+
+# -----------------------------
+# ETAPA: PROGRESSÃO DA OXIDAÇÃO ENTRE CICLOS
+# -----------------------------
+def analisar_progressao(agregacao):
+    print("/n📈 ANALISANDO PROGRESSÃO DA OXIDAÇÃO POR TURBINA...")
+
+    h = ordenar_historico(agregacao["historico_oxidacao"])
+    eventos = agravamentos(h)
+    entre_ciclos = transicoes_entre_ciclos(*niveis_por_ciclo(h))
+
+    for transicao in entre_ciclos:
+        print(f"   🔀 {transicao['De']} → {transicao['Para']}: {transicao['Turbinas']} turbinas, "
+              f"{transicao['Pioraram']} pioraram, {transicao['Melhoraram']} melhoraram")
+    print(f"   ⏱️ {len(eventos)} agravamentos em {eventos['Turbina'].nunique()} turbinas")
+    print(f"✅ Progressão calculada a partir de {len(h)} inspeções classificadas")
+
+    return {
+        "niveis": NIVEIS_PROGRESSAO,
+        "entre_inspecoes": transicoes_entre_inspecoes(h),
+        "entre_ciclos": entre_ciclos,
+        "tempo_ate_agravar": tempo_ate_agravar(eventos),
+        "turbinas": taxas_degradacao(h, eventos),
+    }
@@ -0,0 +1,324 @@
+"""API HTTP local de consultas sobre os dados da planilha mantidos em memória."""
+
+import hashlib
+import json
+import math
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+import numpy as np
+import pandas as pd
+
+from .agregacao import somar_periodo
+from .exportacao import montar_dashboard_data
+from .observacao import assinatura_arquivo
+from .oxidacao import NIVEIS_OXIDACAO
+from .planilhas import hash_planilha
+from .processamento import ETAPAS, executar_etapas
+
+# -----------------------------
+# ÍNDICES DE CONSULTA
+# -----------------------------
+# A aba Dados_Brutos fica ordenada por data de inspeção: um período vira uma
+# fatia contígua (busca binária) e cada filtro por valor usa a lista, já
+# ordenada, das posições das linhas com aquele valor. Um filtro combinado é a
+# interseção dessas listas, sem varrer o DataFrame inteiro.
+FILTROS = {
+    "ciclo": "Ciclo_inspecao",
+    "cluster": "Cluster",
+    "turbina": "Turbina",
+    "oxidacao": "Oxidacao_Nivel",
+    "criticidade": "Criticidade",
+    "status": "Status",
+}
+COLUNAS_OCULTAS = ["Ano", "Mes"]
+POR_PAGINA_PADRAO = 100
+POR_PAGINA_MAXIMO = 1000
+
+class ConsultaInvalida(ValueError):
+    """Parâmetro de consulta inválido (responde 400)."""
+
+def _chave(valor):
+    return str(valor).strip().casefold()
+
+def indexar(df_clean):
+    """Ordena as linhas por data e monta, para cada filtro, {valor: posições}."""
+    df = df_clean.sort_values("Data_inspecao", kind="stable", na_position="last").reset_index(drop=True)
+    indices = {}
+    for filtro, coluna in FILTROS.items():
+        if coluna not in df.columns:
+            continue
+        posicoes = {}
+        for valor, linhas in df.groupby(coluna, observed=True, sort=False).indices.items():
+            chave = _chave(valor)
+            posicoes[chave] = np.union1d(posicoes[chave], linhas) if chave in posicoes else np.sort(linhas)
+        indices[filtro] = posicoes
+    # Linhas sem data ficam no fim e não entram em consultas por período
+    datas = df["Data_inspecao"].to_numpy()
+    return {"df": df, "datas": datas[:int(df["Data_inspecao"].notna().sum())], "total": len(df), "indices": indices}
+
+def _valores(parametros, nome):
+    """Valores de um parâmetro repetido (?a=1&a=2) ou separado por vírgulas (?a=1,2)."""
+    return [valor for bruto in parametros.get(nome, []) for valor in bruto.split(",") if valor.strip()]
+
+def _data(parametros, nome):
+    valores = parametros.get(nome)
+    if not valores:
+        return None
+    try:
+        return pd.Timestamp(valores[-1]).to_datetime64()
+    except ValueError:
+        raise ConsultaInvalida(f"Data inválida em '{nome}': {valores[-1]}")
+
+def _periodo(parametros):
+    """(inicio, fim) da consulta; um período invertido é erro, não um resultado vazio."""
+    inicio, fim = _data(parametros, "inicio"), _data(parametros, "fim")
+    if inicio is not None and fim is not None and inicio > fim:
+        raise ConsultaInvalida(f"'inicio' ({parametros['inicio'][-1]}) é posterior a 'fim' ({parametros['fim'][-1]})")
+    return inicio, fim
+
+def filtrar(indice, parametros):
+    """Posições (ordenadas por data) das linhas que atendem a todos os filtros."""
+    datas = indice["datas"]
+    inicio, fim = _periodo(parametros)
+    if inicio is None and fim is None:
+        posicoes = np.arange(indice["total"])
+    else:
+        primeira = 0 if inicio is None else np.searchsorted(datas, inicio, side="left")
+        ultima = len(datas) if fim is None else np.searchsorted(datas, fim, side="right")
+        posicoes = np.arange(primeira, max(primeira, ultima))
+
+    for filtro in FILTROS:
+        valores = _valores(parametros, filtro)
+        if not valores:
+            continue
+        por_valor = indice["indices"].get(filtro, {})
+        selecionadas = [por_valor[_chave(valor)] for valor in valores if _chave(valor) in por_valor]
+        if not selecionadas:
+            return np.array([], dtype=np.intp)
+        uniao = selecionadas[0] if len(selecionadas) == 1 else np.unique(np.concatenate(selecionadas))
+        posicoes = np.intersect1d(posicoes, uniao, assume_unique=True)
+    return posicoes
+
+# -----------------------------
+# RESPOSTAS
+# -----------------------------
+def _inteiro(parametros, nome, padrao, minimo, maximo):
+    valores = parametros.get(nome)
+    if not valores:
+        return padrao
+    try:
+        return min(max(int(valores[-1]), minimo), maximo)
+    except ValueError:
+        raise ConsultaInvalida(f"Valor inteiro inválido em '{nome}': {valores[-1]}")
+
+def _paginar(total, parametros):
+    """(inicio, fim, metadados) da página pedida."""
+    por_pagina = _inteiro(parametros, "por_pagina", POR_PAGINA_PADRAO, 1, POR_PAGINA_MAXIMO)
+    paginas = max(math.ceil(total / por_pagina), 1)
+    pagina = _inteiro(parametros, "pagina", 1, 1, paginas)
+    inicio = (pagina - 1) * por_pagina
+    return inicio, min(inicio + por_pagina, total), {
+        "total": int(total),
+        "pagina": pagina,
+        "por_pagina": por_pagina,
+        "paginas": paginas,
+    }
+
+def _para_json(df):
+    """Registros com datas em texto e vazios como null."""
+    df = df.copy()
+    for coluna in df.columns:
+        if pd.api.types.is_datetime64_any_dtype(df[coluna]):
+            df[coluna] = df[coluna].dt.strftime("%Y-%m-%d")
+        elif isinstance(df[coluna].dtype, pd.PeriodDtype):
+            df[coluna] = df[coluna].astype(str)
+    df = df.astype(object)
+    return df.where(df.notna(), None).to_dict("records")
+
+def consultar_registros(indice, parametros):
+    posicoes = filtrar(indice, parametros)
+    inicio, fim, pagina = _paginar(len(posicoes), parametros)
+    df = indice["df"].drop(columns=COLUNAS_OCULTAS, errors="ignore")
+    return {**pagina, "registros": _para_json(df.iloc[posicoes[inicio:fim]])}
+
+def _contagem(serie):
+    return {str(valor): int(total) for valor, total in serie.value_counts(sort=False).items() if total}
+
+def consultar_resumo(indice, parametros):
+    linhas = indice["df"].iloc[filtrar(indice, parametros)]
+    datas = linhas["Data_inspecao"].dropna()
+    return {
+        "total_registros": len(linhas),
+        "total_turbinas": int(linhas["Turbina"].nunique()),
+        "total_imas_trocados": float(linhas["Qtd_Imas_trocados"].sum()),
+        "periodo": {
+            "inicio": datas.min().strftime("%Y-%m-%d") if len(datas) else None,
+            "fim": datas.max().strftime("%Y-%m-%d") if len(datas) else None,
+        },
+        "por_ciclo": _contagem(linhas["Ciclo_inspecao"]) if "Ciclo_inspecao" in linhas.columns else {},
+        "por_oxidacao": _contagem(linhas["Oxidacao_Nivel"]) if "Oxidacao_Nivel" in linhas.columns else {},
+        "por_mes": _contagem(linhas["Mes_Ano"]) if "Mes_Ano" in linhas.columns else {},
+    }
+
+def consultar_turbinas(indice, parametros):
+    linhas = indice["df"].iloc[filtrar(indice, parametros)]
+    turbinas = linhas.groupby("Turbina", observed=True).agg(
+        Registros=("Turbina", "size"),
+        Imas_Trocados=("Qtd_Imas_trocados", "sum"),
+        Primeira_Inspecao=("Data_inspecao", "min"),
+        Ultima_Inspecao=("Data_inspecao", "max"),
+    )
+    if "Oxidacao_Nivel" in linhas.columns:
+        niveis = pd.crosstab(linhas["Turbina"], linhas["Oxidacao_Nivel"]).reindex(columns=NIVEIS_OXIDACAO, fill_value=0)
+        turbinas = turbinas.join(niveis.add_prefix("Oxidacao_"), how="left")
+    turbinas = turbinas.sort_values(["Imas_Trocados", "Registros"], ascending=False).reset_index()
+    inicio, fim, pagina = _paginar(len(turbinas), parametros)
+    return {**pagina, "turbinas": _para_json(turbinas.iloc[inicio:fim])}
+
+def consultar_filtros(indice, parametros):
+    """Valores disponíveis de cada filtro e o período coberto."""
+    df = indice["df"]
+    datas = df["Data_inspecao"].dropna()
+    return {
+        "filtros": {
+            filtro: sorted(str(valor) for valor in df[coluna].dropna().unique())
+            for filtro, coluna in FILTROS.items() if coluna in df.columns
+        },
+        "periodo": {
+            "inicio": datas.min().strftime("%Y-%m-%d") if len(datas) else None,
+            "fim": datas.max().strftime("%Y-%m-%d") if len(datas) else None,
+        },
+    }
+
+def consultar_periodo(indice, parametros):
+    """Totais do período pelo cubo temporal (somas prefixadas), sem tocar nas linhas."""
+    cubo = indice["cubo_temporal"]
+    filtros = {}
+    for nome, valores in cubo["dimensoes"].items():
+        pedidos = {_chave(valor) for valor in _valores(parametros, nome)}
+        if pedidos:
+            filtros[nome] = [valor for valor in valores if _chave(valor) in pedidos]
+    agrupar = parametros.get("agrupar", [None])[-1]
+    if agrupar is not None and agrupar not in cubo["dimensoes"]:
+        raise ConsultaInvalida(f"'agrupar' deve ser um de: {', '.join(cubo['dimensoes'])}")
+    inicio, fim = _periodo(parametros)
+    return {
+        "inicio": None if inicio is None else pd.Timestamp(inicio).strftime("%Y-%m-%d"),
+        "fim": None if fim is None else pd.Timestamp(fim).strftime("%Y-%m-%d"),
+        "agrupar": agrupar,
+        "totais": somar_periodo(cubo, inicio, fim, agrupar, **filtros),
+    }
+
+ROTAS = {
+    "/api/filtros": consultar_filtros,
+    "/api/periodo": consultar_periodo,
+    "/api/registros": consultar_registros,
+    "/api/resumo": consultar_resumo,
+    "/api/turbinas": consultar_turbinas,
+}
+
+# -----------------------------
+# ESTADO EM MEMÓRIA
+# -----------------------------
+def carregar_dados(arquivo_excel):
+    """Roda o grafo de etapas e devolve o estado servido pela API."""
+    entradas = {"arquivo_excel": arquivo_excel, "caminho_estado": None, "incremental": False}
+    resultados = executar_etapas(ETAPAS, entradas)
+    return {
+        "assinatura": assinatura_arquivo(arquivo_excel),
+        "versao": hash_planilha(arquivo_excel)[:16],
+        "indice": {**indexar(resultados["df_clean"]), "cubo_temporal": resultados["cubo_temporal"]},
+        "dashboard_data": montar_dashboard_data(resultados),
+    }
+
+def responder(dados, caminho, parametros):
+    """(status, corpo) de uma requisição GET."""
+    if caminho in ROTAS:
+        return 200, ROTAS[caminho](dados["indice"], parametros)
+    if caminho == "/api/dashboard":
+        return 200, {"secoes": list(dados["dashboard_data"])}
+    if caminho.startswith("/api/dashboard/"):
+        secao = caminho[len("/api/dashboard/"):]
+        if secao in dados["dashboard_data"]:
+            return 200, dados["dashboard_data"][secao]
+    return 404, {"erro": f"Rota não encontrada: {caminho}", "rotas": [*ROTAS, "/api/dashboard"]}
+
+class ManipuladorConsultas(BaseHTTPRequestHandler):
+    """GET /api/...: respostas JSON com ETag (versão da planilha + consulta)."""
+
+    def do_GET(self):
+        url = urlsplit(self.path)
+        caminho = url.path.rstrip("/") or "/"
+        parametros = parse_qs(url.query)
+        dados = self.server.dados_atuais()
+
+        consulta = "&".join(f"{nome}={','.join(valores)}" for nome, valores in sorted(parametros.items()))
+        etag = '"' + hashlib.sha256(f"{dados['versao']}|{caminho}|{consulta}".encode("utf-8")).hexdigest()[:32] + '"'
+        if etag in self.headers.get("If-None-Match", ""):
+            self.send_response(304)
+            self._cabecalhos(etag)
+            self.end_headers()
+            return
+
+        try:
+            status, corpo = responder(dados, caminho, parametros)
+        except ConsultaInvalida as e:
+            status, corpo = 400, {"erro": str(e)}
+        except Exception as e:
+            # Uma falha inesperada vira uma resposta JSON, não uma conexão fechada
+            print(f"❌ Erro ao responder {self.path}: {e!r}")
+            status, corpo = 500, {"erro": f"Erro interno ao responder a consulta: {type(e).__name__}"}
+        conteudo = json.dumps(corpo, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+        self.send_response(status)
+        self._cabecalhos(etag if status == 200 else None)
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Content-Length", str(len(conteudo)))
+        self.end_headers()
+        self.wfile.write(conteudo)
+
+    def _cabecalhos(self, etag):
+        # O dashboard roda em outra porta (Vite), então a API libera CORS
+        self.send_header("Access-Control-Allow-Origin", "*")
+        self.send_header("Access-Control-Expose-Headers", "ETag")
+        if etag:
+            self.send_header("ETag", etag)
+            self.send_header("Cache-Control", "no-cache")
+
+    def log_message(self, formato, *argumentos):
+        pass
+
+class ServidorConsultas(ThreadingHTTPServer):
+    """Servidor HTTP que recarrega os dados quando a planilha é salva."""
+
+    def __init__(self, endereco, arquivo_excel):
+        super().__init__(endereco, ManipuladorConsultas)
+        self.arquivo_excel = arquivo_excel
+        self.trava = threading.Lock()
+        self.dados = carregar_dados(arquivo_excel)
+
+    def dados_atuais(self):
+        with self.trava:
+            assinatura = assinatura_arquivo(self.arquivo_excel)
+            if assinatura is not None and assinatura != self.dados["assinatura"]:
+                try:
+                    self.dados = carregar_dados(self.arquivo_excel)
+                    print("🔄 Planilha alterada: dados da API recarregados")
+                except Exception as e:
+                    # Mantém a versão anterior até a próxima gravação válida
+                    print(f"❌ Erro ao recarregar a planilha: {e}")
+                    self.dados["assinatura"] = assinatura
+            return self.dados
+
+def servir(arquivo_excel, porta=8765, host="127.0.0.1"):
+    """Carrega a planilha e atende a API até Ctrl+C."""
+    servidor = ServidorConsultas((host, porta), arquivo_excel)
+    print(f"🌐 API de consultas em http://{host}:{servidor.server_address[1]}/api (Ctrl+C para encerrar)")
+    try:
+        servidor.serve_forever()
+    except KeyboardInterrupt:
+        print("/n👋 Servidor encerrado")
+    finally:
+        servidor.server_close()
@@ -1,4 +1,4 @@
-import { useState, useEffect } from 'react';
+import { useState, useEffect, useRef, useMemo } from 'react';
 import { Card, CardContent, CardDescription, CardHeader, CardTitle } from '@/components/ui/card.jsx';
 import { Badge } from '@/components/ui/badge.jsx';
 import {
@@ -11,10 +11,56 @@ import {
 } from 'lucide-react';
 import { motion } from 'framer-motion';
 import './App.css';
-import dashboardData from './assets/dashboard_data.json';
-import maquinasParadasData from './assets/maquinas_paradas.json'; // ← ADICIONE ESTA LINHA
+import dashboardData from './assets/dashboard_data.json'; // só resumo e ciclos
+import { expandirColunar } from './lib/colunar.js';
+import { montarCuboTemporal, somarPeriodo } from './lib/cuboTemporal.js';
+
+// --- Fragmentos sob demanda (src/assets/dados, gerados por create_visualizations.py) ---
+// O Vite só fornece as URLs; cada fragmento é baixado na primeira vez que uma
+// aba que o usa é aberta. As seções pesadas não existem em dashboard_data.json.
+const URLS_DADOS = import.meta.glob('./assets/dados/*.json', { query: '?url', import: 'default', eager: true });
+const URL_MANIFESTO = URLS_DADOS['./assets/dados/manifest.json'];
+// Sem os fragmentos (checkout em que create_visualizations.py não rodou), vale o
+// que houver no dashboard_data.json do bundle e no maquinas_paradas.json versionado.
+const PARADAS_EMBUTIDAS = import.meta.glob('./assets/maquinas_paradas.json', { import: 'default' });
+
+// Fragmentos do manifest.json usados por cada aba (o "resumo" já vem no bundle)
+const FRAGMENTOS_POR_ABA = {
+  macro: [],
+  mesio: ['turbinas'],
+  micro: ['carreiras'],
+  temporal: ['temporal', 'cubo_temporal'],
+  paradas: ['paradas'],
+  resumo: ['turbinas', 'carreiras'],
+};
+
+async function buscarJson(url) {
+  if (!url) throw new Error('fragmento não encontrado em src/assets/dados (rode create_visualizations.py)');
+  const resposta = await fetch(url);
+  if (!resposta.ok) throw new Error(`HTTP ${resposta.status} ao buscar ${url}`);
+  return resposta.json();
+}
+
+// Seções de um fragmento, prontas para juntar aos dados do dashboard
+async function carregarFragmento(manifesto, nome) {
+  const secao = manifesto.secoes[nome];
+  if (!secao) return {};
+  const bruto = await buscarJson(URLS_DADOS[`./assets/dados/${secao.arquivo}`]);
+  const dados = manifesto.formato === 'colunar' ? expandirColunar(bruto) : bruto;
+  // Fragmentos de maquinas_paradas.json ficam agrupados em data.maquinas_paradas
+  return secao.origem === 'maquinas_paradas.json' ? { maquinas_paradas: dados } : dados;
+}
 
 // --- Constantes e Configurações ---
+// Níveis do cubo temporal exibidos no filtro de período
+const NIVEIS_PERIODO = [
+  { nivel: 'baixa', label: 'Baixa', cor: '#10b981' },
+  { nivel: 'media', label: 'Média', cor: '#f59e0b' },
+  { nivel: 'alta', label: 'Alta', cor: '#ef4444' },
+  { nivel: 'troca_spindle', label: 'Troca de Spindle', cor: '#6366f1' },
+  { nivel: 'sem_oxidacao', label: 'Sem Oxidação', cor: '#94a3b8' },
+];
+
 const COLORS = {
   baixa: '#10b981',
   media: '#f59e0b',
@@ -272,30 +318,40 @@ function App() {
   const [error, setError] = useState(null);
   const [showFiltros, setShowFiltros] = useState(false);
   const [ultimaAtualizacao, setUltimaAtualizacao] = useState(new Date());
+  const [manifesto, setManifesto] = useState(null);
+  const fragmentosCarregados = useRef(new Set(['resumo']));
+  const [periodo, setPeriodo] = useState({ inicio: '', fim: '' });
+
+  // Acumulados do cubo temporal montados uma vez; cada filtro de datas é só uma subtração
+  const cuboTemporal = useMemo(
+    () => (data?.cubo_temporal ? montarCuboTemporal(data.cubo_temporal) : null),
+    [data?.cubo_temporal]
+  );
 
   useEffect(() => {
-    const loadData = () => {
+    const loadData = async () => {
       try {
-        setTimeout(() => {
-          // UNIFICAR OS DADOS DOS DOIS JSONs
-          const dadosCompletos = {
-            ...dashboardData,
-            maquinas_paradas: maquinasParadasData // Adiciona os dados das máquinas paradas
-          };
-
-          console.log("🔍 DADOS UNIFICADOS:", dadosCompletos);
-          console.log("📊 MAQUINAS_PARADAS:", dadosCompletos.maquinas_paradas);
-
-          if (dadosCompletos && dadosCompletos.resumo) {
-            setData(dadosCompletos);
-            setError(null);
-          } else {
-            setError('Estrutura de dados inválida');
-          }
-          setIsLoading(false);
-        }, 1000);
+        // resumo e ciclos vêm no bundle; o manifesto diz onde está cada seção pesada
+        if (!dashboardData || !dashboardData.resumo) {
+          setError('Estrutura de dados inválida');
+          return;
+        }
+        if (!URL_MANIFESTO) {
+          console.warn("⚠️ src/assets/dados/manifest.json não encontrado; usando dashboard_data.json e maquinas_paradas.json");
+          const carregarParadas = PARADAS_EMBUTIDAS['./assets/maquinas_paradas.json'];
+          setData({ ...dashboardData, maquinas_paradas: carregarParadas ? await carregarParadas() : {} });
+          setError(null);
+          return;
+        }
+        const manifestoDados = await buscarJson(URL_MANIFESTO);
+        console.log("🔍 MANIFESTO DOS FRAGMENTOS:", manifestoDados);
+
+        setManifesto(manifestoDados);
+        setData({ ...dashboardData });
+        setError(null);
       } catch (err) {
         setError('Erro crítico ao carregar dados: ' + err.message);
+      } finally {
         setIsLoading(false);
       }
     };
@@ -303,6 +359,21 @@ function App() {
     loadData();
   }, []);
 
+  // Busca os fragmentos da aba na primeira vez que ela é aberta
+  useEffect(() => {
+    if (!manifesto) return;
+    const pendentes = (FRAGMENTOS_POR_ABA[activeTab] || []).filter((nome) => !fragmentosCarregados.current.has(nome));
+    if (pendentes.length === 0) return;
+    pendentes.forEach((nome) => fragmentosCarregados.current.add(nome));
+
+    Promise.all(pendentes.map((nome) => carregarFragmento(manifesto, nome)))
+      .then((fragmentos) => setData((atual) => Object.assign({}, atual, ...fragmentos)))
+      .catch((err) => {
+        pendentes.forEach((nome) => fragmentosCarregados.current.delete(nome));
+        setError('Erro ao carregar dados da aba: ' + err.message);
+      });
+  }, [manifesto, activeTab]);
+
   // ACESSAR OS NOVOS DADOS
   const maquinasParadas = data?.maquinas_paradas || {};
   const maquinasLista = maquinasParadas.maquinas_paradas || [];
@@ -412,6 +483,20 @@ function App() {
     dias_parada: mes.Dias_Parada_Total || 0
   }));
 
+  // Totais do período escolhido (datas vazias = sem limite)
+  const totaisPeriodo = cuboTemporal
+    ? somarPeriodo(cuboTemporal, periodo.inicio || null, periodo.fim || null, {}, 'oxidacao')
+    : {};
+  const periodoData = NIVEIS_PERIODO.map(({ nivel, label, cor }) => ({
+    nivel: label,
+    cor,
+    registros: totaisPeriodo[nivel]?.Registros || 0,
+    imas: totaisPeriodo[nivel]?.Imas_Trocados || 0,
+  }));
+  const totalPeriodo = cuboTemporal
+    ? somarPeriodo(cuboTemporal, periodo.inicio || null, periodo.fim || null)
+    : { Registros: 0, Imas_Trocados: 0 };
+
   // Dados de Oxidação
   const oxidacaoData = (data?.oxidacao || []).map(oxi => ({
     ciclo: oxi.Ciclo_Inspecao || 'N/A',
@@ -878,6 +963,63 @@ function App() {
                   </CardContent>
                 </Card>
               </div>
+
+              {/* FILTRO DE PERÍODO (CUBO TEMPORAL) */}
+              <Card className="bg-white/80 backdrop-blur-sm border-0 shadow-xl rounded-3xl overflow-hidden">
+                <CardHeader className="pb-4">
+                  <CardTitle className="flex items-center gap-2 text-xl">
+                    <Calendar className="h-5 w-5 text-indigo-600" />
+                    Inspeções por Período
+                  </CardTitle>
+                  <CardDescription>
+                    Inspeções e ímãs trocados entre as datas escolhidas, por nível de oxidação
+                  </CardDescription>
+                </CardHeader>
+                <CardContent>
+                  <div className="flex flex-wrap items-end gap-4 mb-6">
+                    {[
+                      { campo: 'inicio', label: 'De' },
+                      { campo: 'fim', label: 'Até' }
+                    ].map(({ campo, label }) => (
+                      <label key={campo} className="flex flex-col text-sm font-medium text-gray-600">
+                        {label}
+                        <input
+                          type="date"
+                          value={periodo[campo]}
+                          onChange={(e) => setPeriodo((atual) => ({ ...atual, [campo]: e.target.value }))}
+                          className="mt-1 px-3 py-2 border border-gray-200 rounded-lg text-gray-800"
+                        />
+                      </label>
+                    ))}
+                    <button
+                      onClick={() => setPeriodo({ inicio: '', fim: '' })}
+                      className="px-4 py-2 bg-gray-100 text-gray-700 rounded-lg hover:bg-gray-200 transition-colors"
+                    >
+                      Todo o período
+                    </button>
+                    <p className="text-sm text-gray-600">
+                      <span className="font-bold text-gray-800">{totalPeriodo.Registros}</span> inspeções ·{' '}
+                      <span className="font-bold text-gray-800">{totalPeriodo.Imas_Trocados}</span> ímãs trocados
+                    </p>
+                  </div>
+                  <ResponsiveContainer width="100%" height={320}>
+                    <BarChart data={periodoData}>
+                      <CartesianGrid strokeDasharray="3 3" stroke="#f0f0f0" />
+                      <XAxis dataKey="nivel" tick={{ fill: '#6b7280' }} axisLine={false} />
+                      <YAxis tick={{ fill: '#6b7280' }} axisLine={false} />
+                      <Tooltip
+                        formatter={(value, name) => [value, name === 'registros' ? 'Inspeções' : 'Ímãs trocados']}
+                      />
+                      <Bar dataKey="registros" name="registros" radius={[6, 6, 0, 0]}>
+                        {periodoData.map((item) => (
+                          <Cell key={item.nivel} fill={item.cor} />
+                        ))}
+                        <LabelList dataKey="registros" position="top" fill="#374151" fontSize={12} fontWeight="bold" formatter={(value) => value > 0 ? `${value}` : ''} />
+                      </Bar>
+                    </BarChart>
+                  </ResponsiveContainer>
+                </CardContent>
+              </Card>
             </motion.div>
           )}
 
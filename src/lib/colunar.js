@@ -0,0 +1,21 @@
+// Decodifica os fragmentos gravados com `create_visualizations.py --colunar`
+// (inverso de codificar_colunar): {"$colunar": n, "colunas": {...}} volta a ser
+// uma lista de registros; colunas {dicionario, codigos} voltam a ser textos.
+
+function expandirColuna(coluna) {
+  if (Array.isArray(coluna)) return coluna.map(expandirColunar);
+  return coluna.codigos.map((codigo) => (codigo === null ? null : coluna.dicionario[codigo]));
+}
+
+export function expandirColunar(valor) {
+  if (Array.isArray(valor)) return valor.map(expandirColunar);
+  if (valor === null || typeof valor !== "object") return valor;
+  if (!("$colunar" in valor)) {
+    return Object.fromEntries(Object.entries(valor).map(([chave, item]) => [chave, expandirColunar(item)]));
+  }
+
+  const colunas = Object.entries(valor.colunas).map(([campo, coluna]) => [campo, expandirColuna(coluna)]);
+  return Array.from({ length: valor.$colunar }, (_, i) =>
+    Object.fromEntries(colunas.map(([campo, coluna]) => [campo, coluna[i]]))
+  );
+}
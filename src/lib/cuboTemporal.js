@@ -0,0 +1,67 @@
+// Consulta o cubo temporal do dashboard (chave "cubo_temporal", gerada por
+// cubo_temporal_json): totais de registros e ímãs trocados em qualquer período,
+// filtrando por ciclo, oxidação e cluster. O JSON traz só os eventos de cada
+// célula; os acumulados são montados uma vez e cada consulta custa O(células).
+
+const MS_DIA = 24 * 60 * 60 * 1000;
+
+function diaDoCubo(cubo, data) {
+  const texto = data instanceof Date ? data.toISOString().slice(0, 10) : String(data).slice(0, 10);
+  return Math.floor((Date.parse(texto) - Date.parse(cubo.inicio)) / MS_DIA);
+}
+
+export function montarCuboTemporal(json) {
+  // posicaoDia[d] = quantos dias com inspeção existem até o dia d (inclusive)
+  const posicaoDia = new Int32Array(json.dias);
+  let evento = 0;
+  for (let dia = 0; dia < json.dias; dia += 1) {
+    while (evento < json.eventos.length && json.eventos[evento] <= dia) evento += 1;
+    posicaoDia[dia] = evento;
+  }
+
+  const totalEventos = json.eventos.length;
+  const celulas = json.series.map((serie) => {
+    const acumulados = {};
+    for (const metrica of json.metricas) {
+      const acumulado = new Float64Array(totalEventos + 1);
+      serie.eventos.forEach((posicao, i) => {
+        acumulado[posicao + 1] = serie[metrica][i];
+      });
+      for (let i = 1; i <= totalEventos; i += 1) acumulado[i] += acumulado[i - 1];
+      acumulados[metrica] = acumulado;
+    }
+    return { celula: serie.celula, acumulados };
+  });
+
+  return { ...json, posicaoDia, celulas };
+}
+
+// Totais entre `inicio` e `fim` (datas inclusivas, "AAAA-MM-DD" ou Date; null =
+// sem limite). `filtros` = { cluster: ["Garrote"], ... }; com `agrupar` (nome de
+// dimensão) devolve { valor: { métrica: total } }.
+export function somarPeriodo(cubo, inicio = null, fim = null, filtros = {}, agrupar = null) {
+  const nomes = Object.keys(cubo.dimensoes);
+  const aceitos = Object.entries(filtros)
+    .filter(([, valores]) => valores != null)
+    .map(([nome, valores]) => {
+      const permitidos = new Set(valores.map(String));
+      return [nomes.indexOf(nome), new Set(cubo.dimensoes[nome].flatMap((valor, i) => (permitidos.has(valor) ? [i] : [])))];
+    });
+
+  const primeiro = Math.max(inicio == null || cubo.inicio == null ? 0 : diaDoCubo(cubo, inicio), 0);
+  const ultimo = Math.min(fim == null || cubo.inicio == null ? cubo.dias - 1 : diaDoCubo(cubo, fim), cubo.dias - 1);
+  const antes = primeiro > 0 ? cubo.posicaoDia[primeiro - 1] : 0;
+  const depois = ultimo >= 0 ? cubo.posicaoDia[ultimo] : 0;
+
+  const zerado = () => Object.fromEntries(cubo.metricas.map((metrica) => [metrica, 0]));
+  const eixo = agrupar == null ? -1 : nomes.indexOf(agrupar);
+  const totais = {};
+  for (const { celula, acumulados } of cubo.celulas) {
+    if (!aceitos.every(([dimensao, codigos]) => codigos.has(celula[dimensao]))) continue;
+    const chave = eixo < 0 ? "" : cubo.dimensoes[agrupar][celula[eixo]];
+    const total = (totais[chave] ??= zerado());
+    if (primeiro > ultimo) continue;
+    for (const metrica of cubo.metricas) total[metrica] += acumulados[metrica][depois] - acumulados[metrica][antes];
+  }
+  return eixo < 0 ? totais[""] ?? zerado() : totais;
+}
@@ -0,0 +1,29 @@
+"""Planilhas sintéticas pequenas, no formato da planilha real, para os testes."""
+import os
+import sys
+
+import pandas as pd
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmark import gerar_frota  # noqa: E402
+from imas_eolicos.planilhas import adicionar_colunas_derivadas, preparar_dados_brutos  # noqa: E402
+
+@pytest.fixture(scope="session")
+def planilha(tmp_path_factory):
+    """Planilha com 60 inspeções de 8 turbinas (Dados_Brutos e Carreiras_Vertical)."""
+    return gerar_frota(str(tmp_path_factory.mktemp("frota") / "frota.xlsx"), 60, turbinas=8)
+
+@pytest.fixture(scope="session")
+def dados_brutos(planilha):
+    """Aba Dados_Brutos como o pd.read_excel a entrega, antes da preparação."""
+    return pd.read_excel(planilha, sheet_name="Dados_Brutos")
+
+@pytest.fixture
+def preparar(tmp_path):
+    """Prepara uma aba bruta como uma nova leitura da planilha (posições 0..n-1)."""
+    def preparar(bruto):
+        df = preparar_dados_brutos(bruto.reset_index(drop=True), pasta_cache=str(tmp_path))
+        return adicionar_colunas_derivadas(df)
+    return preparar
@@ -0,0 +1,77 @@
+"""O reprocessamento incremental tem de reproduzir a reconstrução completa."""
+import pandas as pd
+import pytest
+
+from imas_eolicos.agregacao import agregar, atualizar_agregados
+
+def inserir(bruto, posicao, linhas):
+    return pd.concat([bruto.iloc[:posicao], linhas, bruto.iloc[posicao:]], ignore_index=True)
+
+def inserida_no_topo(bruto):
+    # Nova inspeção (mais recente) de uma turbina existente acima de todas as linhas
+    nova = bruto.iloc[[5]].copy()
+    nova['DATA INSPECAO'] = bruto['DATA INSPECAO'].max() + pd.Timedelta(days=3)
+    nova['DOWNWIND'] = 'Alto'
+    return inserir(bruto, 0, nova)
+
+def turbina_nova_no_meio(bruto):
+    nova = bruto.iloc[[7]].copy()
+    nova['TURBINA'] = 'AEG-9999'
+    return inserir(bruto, 20, nova)
+
+def removidas(bruto):
+    return bruto.drop(index=[3, 10, 11])
+
+def editada(bruto):
+    bruto = bruto.copy()
+    bruto.loc[20, 'DOWNWIND'] = 'Médio' if bruto.loc[20, 'DOWNWIND'] != 'Médio' else 'Baixo'
+    bruto.loc[30, 'DATA INSPECAO'] = bruto['DATA INSPECAO'].min() - pd.Timedelta(days=1)
+    return bruto
+
+def duplicada(bruto):
+    return inserir(bruto, 0, bruto.iloc[[30]])
+
+def reordenada(bruto):
+    return bruto.iloc[[1, 0] + list(range(2, len(bruto)))]
+
+def todas_juntas(bruto):
+    return duplicada(editada(removidas(turbina_nova_no_meio(inserida_no_topo(bruto)))).reset_index(drop=True))
+
+ALTERACOES = [inserida_no_topo, turbina_nova_no_meio, removidas, editada, duplicada, reordenada, todas_juntas]
+
+def ordenar_ultimas(ultimas):
+    ultimas = ultimas.astype({'Turbina': str, 'Oxidacao_Nivel': object, 'Oxidacao_Anterior': object})
+    return ultimas.sort_values('Turbina').reset_index(drop=True)
+
+def comparar(atual, esperado):
+    assert atual.keys() == esperado.keys()
+    for chave, valor in esperado.items():
+        if chave == 'ultimas_inspecoes':
+            pd.testing.assert_frame_equal(ordenar_ultimas(atual[chave]), ordenar_ultimas(valor), check_dtype=False)
+        else:
+            pd.testing.assert_frame_equal(atual[chave], valor)
+
+@pytest.mark.parametrize("alterar", ALTERACOES, ids=lambda alterar: alterar.__name__)
+def test_incremental_igual_a_reconstrucao(dados_brutos, preparar, tmp_path, alterar):
+    caminho_estado = str(tmp_path / "estado.pkl")
+    agregar(preparar(dados_brutos), caminho_estado, incremental=True)
+
+    df = preparar(alterar(dados_brutos))
+    comparar(agregar(df, caminho_estado, incremental=True), agregar(df, None, incremental=False))
+
+def test_posicoes_das_ultimas_acompanham_a_planilha(dados_brutos, preparar):
+    _, _, estado = atualizar_agregados(preparar(dados_brutos))
+    df = preparar(inserida_no_topo(dados_brutos))
+    _, ultimas, _ = atualizar_agregados(df, estado)
+
+    assert (df.loc[ultimas['Linha'], 'Data_inspecao'].to_numpy() == ultimas['Data_inspecao'].to_numpy()).all()
+    anteriores = ultimas.dropna(subset=['Linha_Anterior'])
+    linhas = anteriores['Linha_Anterior'].astype(int)
+    assert (df.loc[linhas, 'Data_inspecao'].to_numpy() == anteriores['Data_Anterior'].to_numpy()).all()
+
+def test_sem_alteracoes_reaproveita_tudo(dados_brutos, preparar):
+    df = preparar(dados_brutos)
+    agregados, ultimas, estado = atualizar_agregados(df)
+    agregados_novos, ultimas_novas, _ = atualizar_agregados(df, estado)
+    assert agregados_novos is agregados
+    pd.testing.assert_frame_equal(ultimas_novas, ultimas)
@@ -0,0 +1,53 @@
+"""A leitura em blocos tem de chegar aos mesmos agregados da leitura inteira."""
+import pandas as pd
+import pytest
+
+from imas_eolicos.agregacao import agregar, agregar_em_blocos, mascara_maquinas_paradas
+from imas_eolicos.planilhas import carregar_df_clean
+
+@pytest.fixture(scope="module")
+def planilha_ordenada(dados_brutos, tmp_path_factory):
+    """
+    Linhas agrupadas por turbina; as duas últimas inspeções da primeira turbina
+    têm a mesma data e níveis diferentes, então o desempate pela ordem da
+    planilha decide qual é a última. Devolve (caminho, tamanho de bloco que
+    separa essas duas linhas).
+    """
+    bruto = dados_brutos.sort_values(['TURBINA', 'DATA INSPECAO'], kind='mergesort').reset_index(drop=True)
+    fronteira = int((bruto['TURBINA'] == bruto.loc[0, 'TURBINA']).sum()) - 1
+    assert fronteira >= 2
+    bruto.loc[fronteira - 1, 'DATA INSPECAO'] = bruto.loc[fronteira, 'DATA INSPECAO']
+    bruto.loc[[fronteira - 1, fronteira], ['DOWNWIND', 'UPWIND']] = [['Alto', 'Alto'], ['Baixo', 'Baixo']]
+    caminho = tmp_path_factory.mktemp("ordenada") / "ordenada.xlsx"
+    bruto.to_excel(caminho, sheet_name="Dados_Brutos", index=False)
+    return str(caminho), fronteira
+
+def normalizar(df):
+    """Categorias viram valores (cada bloco tem as suas) e a ordem das linhas deixa de importar."""
+    df = df.astype({col: object for col in df.columns if isinstance(df[col].dtype, pd.CategoricalDtype)})
+    if isinstance(df.index, pd.MultiIndex):
+        return df
+    return df.sort_values(list(df.columns[:2])).reset_index(drop=True)
+
+def comparar(blocos, inteira, df_clean):
+    for chave, valor in inteira.items():
+        if chave in ('ultimas_inspecoes', 'datas_inspecao'):
+            pd.testing.assert_frame_equal(normalizar(blocos[chave]), normalizar(valor), check_dtype=False)
+        else:
+            pd.testing.assert_frame_equal(blocos[chave], valor, check_dtype=False, check_categorical=False,
+                                          check_index_type=False)
+    paradas = df_clean[mascara_maquinas_paradas(df_clean['Status'])]
+    pd.testing.assert_index_equal(blocos['linhas_paradas'].index, paradas.index)
+
+def verificar(caminho, tamanho_bloco, pasta_cache):
+    df_clean = carregar_df_clean(caminho, pasta_cache=pasta_cache)
+    comparar(agregar_em_blocos(caminho, tamanho_bloco), agregar(df_clean, None, incremental=False), df_clean)
+
+@pytest.mark.parametrize("tamanho_bloco", [1, 2, 7, 13, 59, 60, 1000])
+def test_blocos_igual_a_leitura_inteira(planilha, tmp_path, tamanho_bloco):
+    verificar(planilha, tamanho_bloco, str(tmp_path))
+
+@pytest.mark.parametrize("deslocamento", [-1, 0, 1])
+def test_fronteira_dentro_das_linhas_de_uma_turbina(planilha_ordenada, tmp_path, deslocamento):
+    caminho, fronteira = planilha_ordenada
+    verificar(caminho, fronteira + deslocamento, str(tmp_path))
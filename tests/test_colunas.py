@@ -0,0 +1,80 @@
+"""Resolução de colunas quando vários padrões atendem ao mesmo cabeçalho."""
+import json
+
+import pytest
+
+from imas_eolicos import colunas
+from imas_eolicos.colunas import ESQUEMA_CARREIRAS, ESQUEMA_DADOS_BRUTOS, mapear_colunas, resolver_colunas
+
+@pytest.mark.parametrize("cabecalhos, esperado", [
+    # Igual vence "começa com", mesmo com a coluna parecida vindo antes
+    (['DOWNWIND_ANTERIOR', 'DOWNWIND', 'UPWIND ANTERIOR', 'UPWIND'], {'downwind': 'DOWNWIND', 'upwind': 'UPWIND'}),
+    (['Downwind (antes)', 'Upwind'], {'downwind': 'Downwind (antes)', 'upwind': 'Upwind'}),
+    # Padrão mais longo (mais específico) vence na mesma nota
+    (['DATA SUBSTITUICAO', 'DATA INSPECAO'], {'data_inspecao': 'DATA INSPECAO'}),
+    (['Data Substituição', 'Data inspeção'], {'data_inspecao': 'Data inspeção'}),
+    (['Data', 'Data Substituição'], {'data_inspecao': 'Data'}),
+    # Cada coluna atende a um só campo
+    (['Qtd imas trocados', 'Dias parada', 'K1DIAS PARADA'],
+     {'qtd_imas_trocados': 'Qtd imas trocados', 'dias_parada': 'K1DIAS PARADA'}),
+    (['TURBINA', 'AEG'], {'turbina': 'TURBINA'}),
+    (['OS', 'Observações', 'Status'], {'os': 'OS', 'observacao': 'Observações', 'status': 'Status'}),
+    # Sem nenhum padrão no cabeçalho, o campo fica sem coluna
+    (['TURBINA'], {'downwind': None, 'cluster': None}),
+])
+def test_varios_padroes_no_mesmo_cabecalho(cabecalhos, esperado):
+    resolvido = resolver_colunas(cabecalhos, ESQUEMA_DADOS_BRUTOS)
+    assert {campo: resolvido[campo] for campo in esperado} == esperado
+
+def test_cabecalhos_da_planilha_real():
+    dados_brutos = ['DATA INSPECAO', 'OS', 'CLUSTER', 'TURBINA', 'QTD IMAS TROCADOS', 'DESCRICAO', 'CICLO INSPECAO',
+                    'STATUS', 'DATA SUBSTITUICAO', 'K1DIAS PARADA', 'DOWNWIND', 'UPWIND', 'OBSERVACOES', 'PRIORIDADE']
+    assert resolver_colunas(dados_brutos, ESQUEMA_DADOS_BRUTOS) == {
+        'data_inspecao': 'DATA INSPECAO', 'turbina': 'TURBINA', 'qtd_imas_trocados': 'QTD IMAS TROCADOS',
+        'ciclo_inspecao': 'CICLO INSPECAO', 'status': 'STATUS', 'os': 'OS', 'cluster': 'CLUSTER',
+        'observacao': 'OBSERVACOES', 'dias_parada': 'K1DIAS PARADA', 'downwind': 'DOWNWIND', 'upwind': 'UPWIND',
+    }
+    carreiras = ['Data inspeção', 'OS', 'Cluster', 'AEG', 'Qtd. Imas trocados', 'Carreira', 'Descrição',
+                 'Ciclo de Inspeção', 'Status', 'substituição']
+    assert resolver_colunas(carreiras, ESQUEMA_CARREIRAS) == {
+        'turbina': 'AEG', 'carreira': 'Carreira', 'qtd_imas': 'Qtd. Imas trocados', 'data_inspecao': 'Data inspeção',
+        'os': 'OS', 'ciclo': 'Ciclo de Inspeção', 'status': 'Status',
+    }
+
+@pytest.fixture
+def resolucoes(monkeypatch):
+    """Conta as chamadas a resolver_colunas feitas por mapear_colunas (cache não usado)."""
+    chamadas = []
+    original = colunas.resolver_colunas
+    def contar(*argumentos):
+        chamadas.append(argumentos)
+        return original(*argumentos)
+    monkeypatch.setattr(colunas, "resolver_colunas", contar)
+    return chamadas
+
+CABECALHOS = ['Downwind anterior', 'Downwind atual', 'Turbina']
+
+def test_cache_reaproveitado_com_mesmos_cabecalhos_e_padroes(tmp_path, resolucoes):
+    esquema = {'downwind': ['downwind'], 'turbina': ['turbina']}
+    primeiro = mapear_colunas(CABECALHOS, esquema, str(tmp_path))
+    assert mapear_colunas(CABECALHOS, esquema, str(tmp_path)) == primeiro
+    assert len(resolucoes) == 1
+
+def test_cache_invalidado_quando_os_padroes_mudam(tmp_path, resolucoes):
+    antes = mapear_colunas(CABECALHOS, {'downwind': ['downwind'], 'turbina': ['turbina']}, str(tmp_path))
+    depois = mapear_colunas(CABECALHOS, {'downwind': ['downwind atual', 'downwind'], 'turbina': ['turbina']}, str(tmp_path))
+    assert (antes['downwind'], depois['downwind']) == ('Downwind anterior', 'Downwind atual')
+    assert len(resolucoes) == 2
+
+    # A ordem dos campos também desempata, então faz parte da assinatura
+    mapear_colunas(CABECALHOS, {'turbina': ['turbina'], 'downwind': ['downwind']}, str(tmp_path))
+    assert len(resolucoes) == 3
+
+def test_cache_invalidado_quando_as_regras_mudam(tmp_path, resolucoes, monkeypatch):
+    esquema = {'downwind': ['downwind'], 'turbina': ['turbina']}
+    mapear_colunas(CABECALHOS, esquema, str(tmp_path))
+    monkeypatch.setattr(colunas, "VERSAO_RESOLUCAO", colunas.VERSAO_RESOLUCAO + 1)
+    mapear_colunas(CABECALHOS, esquema, str(tmp_path))
+    assert len(resolucoes) == 2
+    with open(tmp_path / colunas.ARQUIVO_MAPEAMENTOS, encoding='utf-8') as f:
+        assert len(json.load(f)) == 2
@@ -0,0 +1,66 @@
+"""Totais do cubo temporal contra a soma direta das inspeções do período."""
+import numpy as np
+import pandas as pd
+import pytest
+
+from imas_eolicos.agregacao import construir_cubo_temporal, somar_periodo, somas_diarias
+from imas_eolicos.planilhas import carregar_df_clean
+
+@pytest.fixture(scope="module")
+def df_clean(planilha, tmp_path_factory):
+    return carregar_df_clean(planilha, pasta_cache=str(tmp_path_factory.mktemp("cache")))
+
+@pytest.fixture(scope="module")
+def cubo(df_clean):
+    return construir_cubo_temporal(somas_diarias(df_clean))
+
+def soma_direta(df, inicio, fim, agrupar=None, **filtros):
+    """Mesma consulta por máscara booleana sobre as linhas."""
+    datas = df['Data_inspecao'].dt.normalize()
+    mascara = datas.notna()
+    if inicio is not None:
+        mascara &= datas >= pd.Timestamp(inicio)
+    if fim is not None:
+        mascara &= datas <= pd.Timestamp(fim)
+    for coluna, valores in filtros.items():
+        mascara &= df[coluna].astype(str).isin(valores)
+    selecao = df[mascara]
+    if agrupar is None:
+        return {'Registros': len(selecao), 'Imas_Trocados': selecao['Qtd_Imas_trocados'].sum()}
+    grupos = selecao.groupby(selecao[agrupar].astype(str))
+    return {valor: {'Registros': len(grupo), 'Imas_Trocados': grupo['Qtd_Imas_trocados'].sum()}
+            for valor, grupo in grupos}
+
+def periodos(df, quantidade, semente=0):
+    """Intervalos aleatórios em volta dos dados, inclusive invertidos e fora deles."""
+    rng = np.random.default_rng(semente)
+    menor, maior = df['Data_inspecao'].min(), df['Data_inspecao'].max()
+    dias = (maior - menor).days
+    for _ in range(quantidade):
+        inicio, fim = (menor + pd.Timedelta(days=int(d)) for d in rng.integers(-60, dias + 60, 2))
+        yield inicio, fim
+    yield None, None
+    yield menor, maior
+    yield maior, menor
+    yield menor - pd.Timedelta(days=90), menor - pd.Timedelta(days=1)
+    yield maior + pd.Timedelta(days=1), maior + pd.Timedelta(days=90)
+    yield None, menor - pd.Timedelta(days=1)
+    yield maior + pd.Timedelta(days=1), None
+    yield menor, menor
+
+def test_totais_iguais_a_mascara(df_clean, cubo):
+    for inicio, fim in periodos(df_clean, 200):
+        assert somar_periodo(cubo, inicio, fim) == soma_direta(df_clean, inicio, fim), (inicio, fim)
+
+def test_totais_por_grupo_com_filtro(df_clean, cubo):
+    cluster = str(df_clean['Cluster'].iloc[0])
+    for inicio, fim in periodos(df_clean, 50, semente=1):
+        atual = somar_periodo(cubo, inicio, fim, agrupar='oxidacao', cluster=[cluster])
+        esperado = soma_direta(df_clean, inicio, fim, agrupar='Oxidacao_Nivel', Cluster=[cluster])
+        # O cubo mantém as células do filtro mesmo quando o período as zera
+        assert {valor: totais for valor, totais in atual.items() if totais['Registros']} == esperado, (inicio, fim)
+
+def test_cubo_vazio(df_clean):
+    cubo = construir_cubo_temporal(somas_diarias(df_clean.iloc[:0]))
+    assert somar_periodo(cubo) == {'Registros': 0, 'Imas_Trocados': 0}
+    assert somar_periodo(cubo, '2024-01-01', '2024-12-31', agrupar='ciclo') == {}
@@ -0,0 +1,52 @@
+"""Gravação dos JSONs do dashboard."""
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+from imas_eolicos.exportacao import gravar_atomico, manter_data_atualizacao, salvar_fragmentos, salvar_json
+
+def gravar_varias_vezes(caminho, marca, vezes=200):
+    for i in range(vezes):
+        gravar_atomico(caminho, f'{{"escritor": {marca}, "vez": {i}}}'.encode())
+    return marca
+
+def test_gravacoes_concorrentes_no_mesmo_arquivo(tmp_path):
+    caminho = str(tmp_path / "dados.json")
+    with ProcessPoolExecutor(max_workers=4) as executor:
+        assert sorted(executor.map(gravar_varias_vezes, [caminho] * 4, range(4))) == [0, 1, 2, 3]
+    assert open(caminho, "rb").read().startswith(b'{"escritor": ')
+    assert os.listdir(tmp_path) == ["dados.json"]
+
+def test_conteudo_igual_nao_regrava(tmp_path):
+    caminho = str(tmp_path / "dados.json")
+    assert gravar_atomico(caminho, b"{}")
+    assert not gravar_atomico(caminho, b"{}")
+    assert gravar_atomico(caminho, b"[]")
+
+def dashboard(data_atualizacao, imas=10):
+    return {
+        "resumo": {"total_imas_trocados": imas, "data_ultima_atualizacao": data_atualizacao},
+        "ciclos": [{"Ciclo": "Primeiro Ciclo", "Imas_Trocados": imas}],
+        "turbinas": [{"Turbina": "AEG-01", "Total_Imas_Trocados": imas}],
+    }
+
+MAQUINAS_PARADAS = {"resumo_por_ciclo": {}, "maquinas_paradas": [], "detalhes_por_ciclo": {}}
+
+def test_reprocessar_os_mesmos_dados_nao_regrava(tmp_path):
+    pasta = str(tmp_path)
+    primeiro = dashboard("2025-01-01 10:00:00")
+    salvar_json({"resumo": primeiro["resumo"], "ciclos": primeiro["ciclos"]}, "dashboard_data.json", pasta)
+    manifesto = salvar_fragmentos(primeiro, MAQUINAS_PARADAS, pasta)
+    gravados = {nome: os.stat(os.path.join(raiz, nome)).st_mtime_ns
+                for raiz, _, nomes in os.walk(pasta) for nome in nomes}
+
+    segundo = manter_data_atualizacao(dashboard("2025-01-02 08:00:00"), os.path.join(pasta, "dashboard_data.json"))
+    assert segundo["resumo"]["data_ultima_atualizacao"] == "2025-01-01 10:00:00"
+    assert salvar_fragmentos(segundo, MAQUINAS_PARADAS, pasta) == manifesto
+    assert {nome: os.stat(os.path.join(raiz, nome)).st_mtime_ns
+            for raiz, _, nomes in os.walk(pasta) for nome in nomes} == gravados
+
+def test_dados_alterados_atualizam_a_data(tmp_path):
+    pasta = str(tmp_path)
+    salvar_json({"resumo": dashboard("2025-01-01 10:00:00")["resumo"]}, "dashboard_data.json", pasta)
+    novo = manter_data_atualizacao(dashboard("2025-01-02 08:00:00", imas=11), os.path.join(pasta, "dashboard_data.json"))
+    assert novo["resumo"]["data_ultima_atualizacao"] == "2025-01-02 08:00:00"
@@ -0,0 +1,61 @@
+"""Tabela de classificação de oxidação e criticidade por par DOWNWIND/UPWIND."""
+import numpy as np
+import pandas as pd
+import pytest
+
+from imas_eolicos.oxidacao import REGRAS_OXIDACAO, classificar_oxidacao_vetorizada, nivel_oxidacao
+
+# (DOWNWIND, UPWIND) como vêm da planilha → (Oxidacao_Nivel, Criticidade)
+CASOS = [
+    # Termos oficiais: vale o pior lado
+    (('Alto', 'Alto'), ('alta', 'alta')),
+    (('Alto', 'Baixo'), ('alta', 'media')),
+    (('Baixo', 'Alto'), ('alta', 'media')),
+    (('Baixo', 'Médio'), ('media', 'baixa')),
+    (('Medio', 'Baixo'), ('media', 'baixa')),
+    ((' médio ', None), ('media', 'media')),
+    (('Baixo', 'Baixo'), ('baixa', 'baixa')),
+    # Um lado vazio
+    (('Alto', None), ('alta', 'media')),
+    ((None, 'Baixo'), ('baixa', 'baixa')),
+    (('', 'Médio'), ('media', 'media')),
+    # Sinônimos só entram depois de todos os termos oficiais
+    (('Baixo', 'Alta'), ('baixa', 'baixa')),
+    (('Média', 'Baixa'), ('media', 'media')),
+    (('Alta', 'Low'), ('alta', 'media')),
+    (('High', None), ('alta', 'media')),
+    (('Medium', ''), ('media', 'media')),
+    (('Low', None), ('baixa', 'media')),
+    # Troca de spindle tem precedência sobre qualquer nível
+    (('Troca de Spindle', 'Alto'), ('troca_spindle', 'media')),
+    (('Baixo', 'troca de spindle'), ('troca_spindle', 'baixa')),
+    (('Troca-de-Spindle', None), ('troca_spindle', 'media')),
+    # Vazios e não reconhecidos
+    ((None, None), ('sem_oxidacao', None)),
+    (('', '  '), ('sem_oxidacao', None)),
+    (('-', '-'), ('sem_oxidacao', 'media')),
+    (('OK', None), ('invalido', 'media')),
+    ((123, None), ('invalido', 'media')),
+]
+
+def test_tabela_de_classificacao():
+    df = pd.DataFrame([par for par, _ in CASOS], columns=['DOWNWIND', 'UPWIND'])
+    df = classificar_oxidacao_vetorizada(df)
+
+    esperado_nivel = [nivel for _, (nivel, _) in CASOS]
+    esperado_criticidade = [criticidade for _, (_, criticidade) in CASOS]
+    assert df['Oxidacao_Nivel'].tolist() == esperado_nivel
+    assert df['Criticidade'].astype(object).where(df['Criticidade'].notna(), None).tolist() == esperado_criticidade
+
+def test_categoricas_repetidas_propagam_a_classificacao():
+    # Cada par distinto é classificado uma vez; as repetições herdam pelos códigos
+    pares = [par for par, _ in CASOS]
+    ordem = np.random.default_rng(0).integers(0, len(pares), 500)
+    df = pd.DataFrame([pares[i] for i in ordem], columns=['DOWNWIND', 'UPWIND']).astype('category')
+    df = classificar_oxidacao_vetorizada(df)
+    assert df['Oxidacao_Nivel'].tolist() == [CASOS[i][1][0] for i in ordem]
+
+@pytest.mark.parametrize("palavra, nivel", [(palavra, nivel) for palavras, nivel in REGRAS_OXIDACAO for palavra in palavras])
+def test_cada_regra_de_oxidacao(palavra, nivel):
+    assert nivel_oxidacao(palavra, '') == nivel
+    assert nivel_oxidacao('', palavra) == nivel
@@ -0,0 +1,47 @@
+"""Duração das paradas e disponibilidade da frota."""
+import pandas as pd
+
+from imas_eolicos.paradas import (DIAS_PARADA_ESTIMADOS, analisar_disponibilidade, analisar_maquinas_paradas,
+                                  intervalos_parada)
+
+def paradas(linhas):
+    """df_clean mínimo: (turbina, data da parada, dias da planilha, data de substituição)."""
+    return pd.DataFrame({
+        "Ciclo_inspecao": "Primeiro Ciclo",
+        "Status": "Fora de Operação",
+        "Turbina": [turbina for turbina, _, _, _ in linhas],
+        "Data_inspecao": pd.to_datetime([data for _, data, _, _ in linhas]),
+        "Dias_parada": [dias for _, _, dias, _ in linhas],
+        "data_retorno": pd.to_datetime([retorno for _, _, _, retorno in linhas]),
+    })
+
+LINHAS = [
+    ("AEG-01", "2024-01-01", 10, None),          # dias da planilha
+    ("AEG-02", "2024-01-01", 5, "2024-03-01"),   # dias da planilha valem mais que a substituição
+    ("AEG-03", "2024-01-01", 0, "2024-01-21"),   # sem dias: data de substituição
+    ("AEG-04", "2024-01-01", 0, None),           # sem dias nem substituição: estimado pelo ciclo
+    ("AEG-05", None, 7, None),                   # sem data de parada
+]
+
+def test_origem_dos_dias_de_parada():
+    intervalos = intervalos_parada(paradas(LINHAS), "data_retorno", "Dias_parada")
+    estimados = DIAS_PARADA_ESTIMADOS["Primeiro Ciclo"]
+    assert intervalos["Dias_parada"].tolist() == [10, 5, 20, estimados, 0]
+    assert intervalos["Fonte_dias"].tolist() == ["planilha", "planilha", "data_substituicao", "estimado", "sem_data"]
+    assert intervalos["Data_retorno"].iloc[0] == pd.Timestamp("2024-01-11")
+
+def test_sem_coluna_de_dias_mantem_a_estimativa():
+    intervalos = intervalos_parada(paradas(LINHAS), "data_retorno")
+    assert intervalos["Fonte_dias"].tolist() == ["estimado", "data_substituicao", "data_substituicao", "estimado", "sem_data"]
+
+def test_disponibilidade_usa_os_dias_da_planilha():
+    # AEG-01 e AEG-02 sem sobreposição: 10 + 5 dias de parada
+    df = paradas([("AEG-01", "2024-01-01", 10, None), ("AEG-02", "2024-02-01", 5, None), ("AEG-03", "2024-03-01", 0, None)])
+    resumo = analisar_disponibilidade(df, {"turbina": [None] * 4})["resumo"]
+    assert resumo["Dias_Parada_Registrados"] == 10 + 5 + DIAS_PARADA_ESTIMADOS["Primeiro Ciclo"]
+    assert resumo["Paradas_Por_Fonte_Dias"] == {"planilha": 2, "data_substituicao": 0, "estimado": 1, "sem_data": 0}
+
+def test_tabela_de_paradas_com_os_mesmos_dias():
+    tabela = analisar_maquinas_paradas(paradas(LINHAS))["maquinas_paradas"]
+    assert [registro["Dias Parada"] for registro in tabela] == [10, 5, 20, DIAS_PARADA_ESTIMADOS["Primeiro Ciclo"], 0]
+    assert tabela[0]["Data de Retorno"] == "11/01/2024"
@@ -0,0 +1,82 @@
+"""Troca de spindle como evento que recomeça o histórico da turbina."""
+import numpy as np
+import pandas as pd
+
+from imas_eolicos.agregacao import estado_turbinas, indice_ultimas_inspecoes
+from imas_eolicos.previsao import exemplos_treino, preparar_inspecoes
+from imas_eolicos.progressao import (NIVEIS_PROGRESSAO, agravamentos, niveis_por_ciclo, ordenar_historico,
+                                     taxas_degradacao, transicoes_entre_ciclos, transicoes_entre_inspecoes)
+
+def historico(inspecoes):
+    """(turbina, data, ciclo, nível) na ordem da planilha."""
+    return pd.DataFrame({
+        "Turbina": [turbina for turbina, _, _, _ in inspecoes],
+        "Linha": np.arange(len(inspecoes)),
+        "Data_inspecao": pd.to_datetime([data for _, data, _, _ in inspecoes]),
+        "Ciclo_inspecao": [ciclo for _, _, ciclo, _ in inspecoes],
+        "Oxidacao_Nivel": [nivel for _, _, _, nivel in inspecoes],
+        "Qtd_Imas_trocados": 0,
+    })
+
+INSPECOES = [
+    # AEG-01: alta no spindle antigo, troca, e o novo começa em baixa e agrava para media
+    ("AEG-01", "2024-01-10", "Primeiro Ciclo", "alta"),
+    ("AEG-01", "2024-02-10", "Troca de Spindle", "troca_spindle"),
+    ("AEG-01", "2024-03-10", "Segundo Ciclo", "baixa"),
+    ("AEG-01", "2024-05-10", "Terceiro Ciclo", "media"),
+    # AEG-02: sem troca, baixa → media → alta
+    ("AEG-02", "2024-01-15", "Primeiro Ciclo", "baixa"),
+    ("AEG-02", "2024-03-15", "Segundo Ciclo", "media"),
+    ("AEG-02", "2024-05-15", "Terceiro Ciclo", "alta"),
+]
+
+def posicao(nivel):
+    return NIVEIS_PROGRESSAO.index(nivel)
+
+def test_troca_de_spindle_nao_e_nivel():
+    assert "troca_spindle" not in NIVEIS_PROGRESSAO
+    h = ordenar_historico(historico(INSPECOES))
+    assert len(h) == 6
+    assert h.loc[h["Turbina"] == "AEG-01", "Trecho"].tolist() == [0, 1, 1]
+    assert set(h.loc[h["Turbina"] == "AEG-02", "Trecho"]) == {0}
+
+def test_transicoes_nao_atravessam_a_troca():
+    h = ordenar_historico(historico(INSPECOES))
+    matriz = np.array(transicoes_entre_inspecoes(h))
+    # alta → baixa (AEG-01, através da troca) não é uma melhora
+    assert matriz[posicao("alta"), posicao("baixa")] == 0
+    assert matriz.sum() == 3
+    assert matriz[posicao("baixa"), posicao("media")] == 2
+
+    primeiro_segundo, segundo_terceiro, _ = transicoes_entre_ciclos(*niveis_por_ciclo(h))
+    assert (primeiro_segundo["Turbinas"], primeiro_segundo["Melhoraram"], primeiro_segundo["Pioraram"]) == (1, 0, 1)
+    assert (segundo_terceiro["Turbinas"], segundo_terceiro["Pioraram"]) == (2, 2)
+
+def test_agravamentos_e_taxas_desde_a_ultima_troca():
+    h = ordenar_historico(historico(INSPECOES))
+    eventos = agravamentos(h)
+    assert eventos[["Turbina", "De", "Para", "Dias"]].values.tolist() == [
+        ["AEG-01", posicao("baixa"), posicao("media"), 61],
+        ["AEG-02", posicao("baixa"), posicao("media"), 60],
+        ["AEG-02", posicao("media"), posicao("alta"), 61],
+    ]
+    taxas = taxas_degradacao(h, eventos).set_index("Turbina")
+    assert taxas.loc["AEG-01", ["Inspecoes", "Nivel_Inicial", "Pior_Nivel", "Agravamentos", "Trocas_Spindle"]].tolist() == [
+        2, "baixa", "media", 1, 1]
+    assert taxas.loc["AEG-02", ["Inspecoes", "Variacao_Niveis", "Trocas_Spindle"]].tolist() == [3, 2, 0]
+
+def test_estado_com_troca_de_spindle():
+    df = historico(INSPECOES[:2] + INSPECOES[4:6] + [
+        ("AEG-03", "2024-01-01", "Primeiro Ciclo", "troca_spindle"),
+        ("AEG-03", "2024-02-01", "Segundo Ciclo", "media"),
+    ])
+    estado = estado_turbinas(indice_ultimas_inspecoes(df)).set_index("Turbina")["Mudanca"]
+    assert estado.to_dict() == {"AEG-01": "troca_spindle", "AEG-02": "piorou", "AEG-03": "troca_spindle"}
+
+def test_treino_sem_pares_atraves_da_troca():
+    acumulados = pd.DataFrame({"Chave": pd.Series(dtype=object), "Data_inspecao": pd.Series(dtype="datetime64[ns]"),
+                               "Carreiras": pd.Series(dtype=float), "Imas_Carreiras": pd.Series(dtype=float)})
+    h = preparar_inspecoes(historico(INSPECOES), acumulados)
+    X, piorou, dias = exemplos_treino(h)
+    # alta → baixa do AEG-01 ficou de fora; sobram os três pares de mesmo trecho, todos com piora
+    assert (len(X), piorou.tolist(), dias.tolist()) == (3, [1.0, 1.0, 1.0], [61, 60, 61])
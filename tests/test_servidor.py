@@ -0,0 +1,142 @@
+"""API de consultas servida de verdade (porta 0) sobre uma planilha pequena."""
+import json
+import math
+import threading
+import urllib.error
+import urllib.request
+from urllib.parse import urlencode
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from imas_eolicos import servidor as api
+
+@pytest.fixture(scope="module")
+def servidor(planilha):
+    servidor = api.ServidorConsultas(("127.0.0.1", 0), planilha)
+    thread = threading.Thread(target=servidor.serve_forever, daemon=True)
+    thread.start()
+    yield servidor
+    servidor.shutdown()
+    servidor.server_close()
+
+def get(servidor, caminho, parametros=None, cabecalhos=None):
+    """(status, cabeçalhos, corpo JSON ou None) de um GET."""
+    url = f"http://127.0.0.1:{servidor.server_address[1]}{caminho}"
+    if parametros:
+        url += "?" + urlencode(parametros, doseq=True)
+    requisicao = urllib.request.Request(url, headers=cabecalhos or {})
+    try:
+        with urllib.request.urlopen(requisicao) as resposta:
+            return resposta.status, resposta.headers, json.loads(resposta.read())
+    except urllib.error.HTTPError as e:
+        corpo = e.read()
+        return e.code, e.headers, json.loads(corpo) if corpo else None
+
+def mascara(df, parametros):
+    """Mesma seleção de filtrar() por máscara booleana sobre todas as linhas."""
+    selecao = pd.Series(True, index=df.index)
+    if "inicio" in parametros:
+        selecao &= df["Data_inspecao"] >= pd.Timestamp(parametros["inicio"][-1])
+    if "fim" in parametros:
+        selecao &= df["Data_inspecao"] <= pd.Timestamp(parametros["fim"][-1])
+    for filtro, coluna in api.FILTROS.items():
+        if filtro in parametros:
+            pedidos = {valor.strip().casefold() for valor in parametros[filtro]}
+            selecao &= df[coluna].astype(str).str.strip().str.casefold().isin(pedidos)
+    return np.flatnonzero(selecao.to_numpy())
+
+def consultas_aleatorias(df, quantidade, semente=0):
+    rng = np.random.default_rng(semente)
+    datas = df["Data_inspecao"].dropna()
+    valores = {filtro: df[coluna].dropna().astype(str).unique() for filtro, coluna in api.FILTROS.items()}
+    for _ in range(quantidade):
+        parametros = {}
+        a, b = sorted(datas.sample(2, random_state=int(rng.integers(1 << 31))) + pd.Timedelta(days=int(rng.integers(-3, 4))))
+        if rng.random() < 0.7:
+            parametros["inicio"] = [a.strftime("%Y-%m-%d")]
+        if rng.random() < 0.7:
+            parametros["fim"] = [b.strftime("%Y-%m-%d")]
+        for filtro in rng.choice(list(valores), int(rng.integers(0, 3)), replace=False):
+            escolhidos = rng.choice(valores[filtro], int(rng.integers(1, 3)))
+            parametros[filtro] = [str(valor).upper() for valor in escolhidos]
+        yield parametros
+
+def test_filtro_igual_a_mascara(servidor):
+    indice = servidor.dados["indice"]
+    for parametros in consultas_aleatorias(indice["df"], 300):
+        np.testing.assert_array_equal(api.filtrar(indice, parametros), mascara(indice["df"], parametros), err_msg=str(parametros))
+
+def test_registros_pela_api_iguais_a_mascara(servidor):
+    df = servidor.dados["indice"]["df"]
+    for parametros in consultas_aleatorias(df, 20, semente=1):
+        status, _, corpo = get(servidor, "/api/registros", {**parametros, "por_pagina": 1000})
+        assert status == 200
+        assert corpo["total"] == len(mascara(df, parametros))
+        assert [r["OS"] for r in corpo["registros"]] == df["OS"].iloc[mascara(df, parametros)].tolist()
+
+def test_paginacao(servidor):
+    total = servidor.dados["indice"]["total"]
+    paginas = math.ceil(total / 7)
+    vistos = []
+    for pagina in range(1, paginas + 1):
+        _, _, corpo = get(servidor, "/api/registros", {"por_pagina": 7, "pagina": pagina})
+        assert (corpo["pagina"], corpo["paginas"], corpo["total"]) == (pagina, paginas, total)
+        vistos += [registro["OS"] for registro in corpo["registros"]]
+    assert len(corpo["registros"]) == total - 7 * (paginas - 1)
+    assert vistos == servidor.dados["indice"]["df"]["OS"].tolist()
+
+    # Fora dos limites: a página e o tamanho são ajustados, não recusados
+    assert get(servidor, "/api/registros", {"por_pagina": 7, "pagina": 0})[2]["pagina"] == 1
+    assert get(servidor, "/api/registros", {"por_pagina": 7, "pagina": 999})[2]["pagina"] == paginas
+    assert get(servidor, "/api/registros", {"por_pagina": 0})[2]["por_pagina"] == 1
+    assert get(servidor, "/api/registros", {"por_pagina": 10 ** 6})[2]["por_pagina"] == api.POR_PAGINA_MAXIMO
+    assert get(servidor, "/api/registros", {"por_pagina": total})[2]["paginas"] == 1
+
+    _, _, vazio = get(servidor, "/api/registros", {"turbina": "nao-existe", "pagina": 3})
+    assert (vazio["total"], vazio["pagina"], vazio["paginas"], vazio["registros"]) == (0, 1, 1, [])
+
+def test_etag_e_304(servidor):
+    status, cabecalhos, corpo = get(servidor, "/api/resumo", {"ciclo": "Primeiro Ciclo"})
+    etag = cabecalhos["ETag"]
+    assert status == 200 and etag and corpo["total_registros"] > 0
+
+    status, cabecalhos, corpo = get(servidor, "/api/resumo", {"ciclo": "Primeiro Ciclo"}, {"If-None-Match": etag})
+    assert (status, corpo, cabecalhos["ETag"]) == (304, None, etag)
+
+    # Outra consulta tem outra ETag, e a ETag antiga não vale para ela
+    status, cabecalhos, _ = get(servidor, "/api/resumo", {"ciclo": "Segundo Ciclo"}, {"If-None-Match": etag})
+    assert status == 200 and cabecalhos["ETag"] != etag
+
+def test_consulta_invalida_responde_400(servidor):
+    for caminho, parametros in [
+        ("/api/registros", {"inicio": "ontem"}),
+        ("/api/registros", {"pagina": "primeira"}),
+        ("/api/periodo", {"agrupar": "turbina"}),
+    ]:
+        status, cabecalhos, corpo = get(servidor, caminho, parametros)
+        assert status == 400 and "erro" in corpo
+        assert "ETag" not in cabecalhos
+
+def test_periodo_invertido_e_rejeitado(servidor):
+    for caminho in ["/api/registros", "/api/resumo", "/api/turbinas", "/api/periodo"]:
+        status, _, corpo = get(servidor, caminho, {"inicio": "2025-01-01", "fim": "2024-01-01"})
+        assert status == 400 and "posterior" in corpo["erro"]
+    assert get(servidor, "/api/periodo", {"inicio": "2024-06-01", "fim": "2024-06-01"})[0] == 200
+
+def test_periodo_pelo_cubo_igual_aos_registros(servidor):
+    df = servidor.dados["indice"]["df"]
+    for parametros in consultas_aleatorias(df, 20, semente=2):
+        parametros = {chave: valor for chave, valor in parametros.items() if chave in ("inicio", "fim", "cluster")}
+        _, _, corpo = get(servidor, "/api/periodo", parametros)
+        assert corpo["totais"]["Registros"] == len(mascara(df, parametros))
+
+def test_erro_inesperado_responde_500(servidor, monkeypatch):
+    monkeypatch.setitem(api.ROTAS, "/api/resumo", lambda indice, parametros: 1 / 0)
+    status, _, corpo = get(servidor, "/api/resumo")
+    assert status == 500 and "ZeroDivisionError" in corpo["erro"]
+
+def test_rota_desconhecida_responde_404(servidor):
+    status, _, corpo = get(servidor, "/api/nada")
+    assert status == 404 and "/api/registros" in corpo["rotas"]